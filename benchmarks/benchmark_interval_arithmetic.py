@@ -473,6 +473,57 @@ def cot_eval():
     return {'I_inf': I.inf, 'I_sup': I.sup, 'res_inf': res.inf, 'res_sup': res.sup}
 
 
+# throughput of every operation over sizes from 10 to 10^7 intervals, the operands are generated over the same
+# domains as above, the number of runs shrinks with the size so every size takes about the same time
+
+THROUGHPUT_SIZES = [10, 10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+THROUGHPUT_CASES = {
+    'addition': (lambda x: x + x, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'subtraction': (lambda x: x - x, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'multiplication': (lambda x: x * x, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'division': (lambda x: x / x, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'power': (lambda x: x ** 3, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'absolute': (abs, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'exponential': (Interval.exp, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'log': (Interval.log, 0, 10 ** 2, 0, 10 ** 2),
+    'sqrt': (Interval.sqrt, 0, 10 ** 2, 0, 10 ** 2),
+    'sin': (Interval.sin, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'cos': (Interval.cos, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'tan': (Interval.tan, -0.5 * np.pi + 10 ** -2, 0, 0, 0.5 * np.pi - 10 ** -2),
+    'cot': (Interval.cot, 10 ** -2, 0.5 * np.pi, 0, 0.5 * np.pi - 10 ** -2),
+    'arcsin': (Interval.arcsin, -1, 0, 0, 1),
+    'arccos': (Interval.arccos, -1, 0, 0, 1),
+    'arctan': (Interval.arctan, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'sinh': (Interval.sinh, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'cosh': (Interval.cosh, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'tanh': (Interval.tanh, -1, 1, 0, 1),
+    'arcsinh': (Interval.arcsinh, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+    'arccosh': (Interval.arccosh, 1, 10 ** 1, 0, 10 ** 1),
+    'arctanh': (Interval.arctanh, -1, 0, 0, 1),
+    'sigmoid': (Interval.sigmoid, -10 ** 2, 10 ** 2, 0, 10 ** 2),
+}
+
+
+def throughput_eval(sizes=None):
+    sizes = THROUGHPUT_SIZES if sizes is None else sizes
+    print('throughput in million intervals per second, sizes ' + str(sizes))
+    for name, (fn, I_inf, I_sup, delta_I_inf, delta_I_sup) in THROUGHPUT_CASES.items():
+        rates = []
+        for sz in sizes:
+            I = generate_data(sz, I_inf, I_sup, delta_I_inf, delta_I_sup)
+            runs = max(3, 10 ** 6 // sz)
+            fn(I)  # warm up
+
+            time_cur = performance_counter_start()
+            for _ in range(runs):
+                fn(I)
+            elapsed = (performance_counter_start() - time_cur) * 1e-9
+
+            rates.append(sz * runs / elapsed * 1e-6)
+        print('{:>16}: '.format(name) + ' '.join('{:10.2f}'.format(rate) for rate in rates))
+
+
 if __name__ == "__main__":
     data_dict = {'addition_data': addition_eval(),
                  'subtraction_data': subtraction_eval(),
@@ -500,3 +551,5 @@ if __name__ == "__main__":
                  'arctanh_data': arctanh_eval()}
 
     savemat('data.mat', data_dict)
+
+    throughput_eval()
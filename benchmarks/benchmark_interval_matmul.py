@@ -0,0 +1,39 @@
+import numpy as np
+from pybdr.geometry import Interval
+from pybdr.util.functional import performance_counter, performance_counter_start
+
+# products of two n x n interval matrices by the exact bounds, all at once as the broadcasting implementation did
+# and blocked under the default memory ceiling, and by the midpoint radius form, which also reports how much wider
+# its bounds are than the exact ones
+
+SIZES = [10, 20, 50, 100, 200, 500]
+RUNS = 3
+
+
+def generate_data(n: int):
+    inf = np.random.rand(n, n) * 2 - 1
+    return Interval(inf, inf + np.random.rand(n, n) * 0.1)
+
+
+def run(a: Interval, b: Interval, method, max_bytes, event: str):
+    max_bytes_, Interval.MATMUL_MAX_BYTES = Interval.MATMUL_MAX_BYTES, max_bytes
+    try:
+        time_cur = performance_counter_start()
+        for _ in range(RUNS):
+            c = a.matmul(b, method)
+        performance_counter(time_cur, event, RUNS)
+    finally:
+        Interval.MATMUL_MAX_BYTES = max_bytes_
+    return c
+
+
+if __name__ == "__main__":
+    for n in SIZES:
+        a, b = generate_data(n), generate_data(n)
+        print("n = {}".format(n))
+        # the unblocked product needs 6 temporaries of n^3 floats, skipped once they exceed 1GB
+        if 48 * n ** 3 <= 1024 ** 3:
+            run(a, b, Interval.METHOD.MATMUL.EXACT, None, "  exact, unblocked")
+        exact = run(a, b, Interval.METHOD.MATMUL.EXACT, Interval.MATMUL_MAX_BYTES, "  exact, blocked")
+        midrad = run(a, b, Interval.METHOD.MATMUL.MIDRAD, None, "  midpoint radius")
+        print("  midpoint radius / exact width: {}".format(np.max(midrad.rad / exact.rad)))
@@ -0,0 +1,56 @@
+import numpy as np
+from pybdr.algorithm import ASB2008CDC
+from pybdr.geometry import Zonotope, Interval, Geometry
+from pybdr.geometry.operation import cvt2
+from pybdr.model import *
+from pybdr.util.functional import performance_counter, performance_counter_start
+
+# natural interval extension vs. mean value form for the enclosures of the tensors in the linearization error,
+# reporting the iterations of the fixed-point loop of linear_reach and the total time of the reach computation
+
+CASES = {
+    "vanderpol": (vanderpol, Interval([1.23, 2.34], [1.57, 2.46]), 3.5, 0.01),
+    "jet_engine": (jet_engine, Interval.identity(2) * 0.2 + 1, 10, 0.01),
+    "brusselator": (brusselator, Interval([-0.1, 0.1], [0.1, 0.3]), 5.0, 0.01),
+}
+
+
+def run(f, z: Interval, t_end: float, step: float, tensor_order: int, range_bound: str):
+    options = ASB2008CDC.Options()
+    options.t_end = t_end
+    options.step = step
+    options.tensor_order = tensor_order
+    options.taylor_terms = 4
+    options.range_bound = range_bound
+    options.u = Zonotope([0], np.diag([0]))
+    options.u_trans = options.u.c
+
+    Zonotope.REDUCE_METHOD = Zonotope.REDUCE_METHOD.GIRARD
+    Zonotope.ORDER = 50
+
+    # count the evaluations of the linearization error, one per iteration of the fixed-point loop
+    iterations = [0]
+    abstract_err = ASB2008CDC.abstract_err
+
+    def _counted(*args):
+        iterations[0] += 1
+        return abstract_err(*args)
+
+    ASB2008CDC.abstract_err = staticmethod(_counted)
+    try:
+        x0 = cvt2(z, Geometry.TYPE.ZONOTOPE)
+        time_cur = performance_counter_start()
+        ri, rp = ASB2008CDC.reach(f, [2, 1], options, x0)
+        performance_counter(time_cur, "  " + range_bound + " reach")
+    finally:
+        ASB2008CDC.abstract_err = staticmethod(abstract_err)
+    width = np.sum(cvt2(rp[-1], Geometry.TYPE.INTERVAL).rad)
+    print("  " + range_bound + " iterations: {}, final width: {}".format(iterations[0], width))
+
+
+if __name__ == "__main__":
+    for name, (f, z, t_end, step) in CASES.items():
+        for tensor_order in [2, 3]:
+            print(name + ", tensor order {}".format(tensor_order))
+            for range_bound in ["interval", "interval_mv"]:
+                run(f, z, t_end, step, tensor_order, range_bound)
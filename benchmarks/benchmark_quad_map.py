@@ -0,0 +1,44 @@
+import numpy as np
+from pybdr.geometry import Zonotope
+from pybdr.util.functional import performance_counter_start
+
+# scaling of Zonotope.quad_map over the dimension and the number of generators, for dense hessians and for sparse
+# ones with structurally zero slices as the hessians of most dynamics are, both for the quadratic map x.T Q x and
+# the mixed one x1.T Q x2
+
+DIMS = [2, 5, 10, 20]
+GEN_NUMS = [10, 50, 100, 200]
+DENSITIES = [1.0, 0.1]
+
+
+def random_hessians(dim: int, density: float):
+    q = np.random.randn(dim, dim, dim) * (np.random.rand(dim, dim, dim) < density)
+    # the dynamics of some dimensions are linear, so their hessians are zero
+    q[np.random.rand(dim) < 0.3] = 0
+    return [q]
+
+
+def measure(fn, runs: int):
+    fn()  # warm up
+    time_cur = performance_counter_start()
+    for _ in range(runs):
+        fn()
+    return (performance_counter_start() - time_cur) * 1e-6 / runs
+
+
+def quad_map_eval(runs: int = 20):
+    for density in DENSITIES:
+        print("density {}".format(density))
+        print("{:>5} {:>5} {:>12} {:>12}".format("dim", "gens", "xTQx ms", "x1TQx2 ms"))
+        for dim in DIMS:
+            q = random_hessians(dim, density)
+            for gen_num in GEN_NUMS:
+                z = Zonotope(np.random.rand(dim), np.random.randn(dim, gen_num))
+                rz = Zonotope(np.random.rand(dim), np.random.randn(dim, gen_num))
+                t0 = measure(lambda: z.quad_map(q), runs)
+                t1 = measure(lambda: z.quad_map(q, rz), runs)
+                print("{:>5} {:>5} {:12.3f} {:12.3f}".format(dim, gen_num, t0, t1))
+
+
+if __name__ == "__main__":
+    quad_map_eval()
@@ -0,0 +1,88 @@
+from itertools import combinations
+
+import numpy as np
+from pybdr.algorithm import ASB2008CDC
+from pybdr.geometry import Zonotope, Interval, Geometry
+from pybdr.geometry.operation import cvt2
+from pybdr.model import vanderpol, laubloomis, lotka_volterra_5d
+from pybdr.util.functional import performance_counter_start
+
+# order reduction methods of zonotopes compared by the time of one reduction, the growth of the interval hull and of
+# the volume of the reduced zonotopes, and by the time and the width of the final set of a whole reach computation,
+# so the speed/precision point can be chosen per model
+
+METHODS = list(Zonotope.METHOD.REDUCE)
+
+# dimension, number of generators, ratio of the longest and the shortest axis of the random zonotopes
+SHAPES = [(2, 40, 1), (2, 40, 100), (3, 60, 100), (5, 100, 100), (10, 200, 100)]
+
+CASES = {
+    "vanderpol": (vanderpol, [2, 1], Interval([1.23, 2.34], [1.57, 2.46]), 3.5, 0.01),
+    "laubloomis": (laubloomis, [7, 1], Interval([1.19, 1.04, 1.49, 2.39, 0.99, 0.09, 0.44],
+                                               [1.21, 1.06, 1.51, 2.41, 1.01, 0.11, 0.46]), 5, 0.04),
+    "lotka_volterra_5d": (lotka_volterra_5d, [5, 1], Interval.identity(5) * 0.05 + 1, 1, 0.01),
+}
+
+
+def random_zonotope(dim: int, gen_num: int, ratio: float):
+    # generators spread along the axes of a random rotation, scaled from 1 down to 1 / ratio
+    q, _ = np.linalg.qr(np.random.randn(dim, dim))
+    gen = q @ (np.logspace(0, -np.log10(ratio), dim)[:, None] * np.random.randn(dim, gen_num))
+    return Zonotope(np.zeros(dim), gen)
+
+
+def volume(z: Zonotope):
+    # 2^n times the sum of the absolute determinants of all the n by n sub-matrices of the generators
+    ind = np.asarray(list(combinations(np.arange(z.gen_num), z.shape)))
+    return 2 ** z.shape * abs(np.linalg.det(z.gen.T[ind].transpose(0, 2, 1))).sum()
+
+
+def reduction_eval(order: int = 2, runs: int = 100):
+    for dim, gen_num, ratio in SHAPES:
+        z = random_zonotope(dim, gen_num, ratio)
+        hull = np.sum(abs(z.gen).sum(axis=1))
+        vol = volume(z) if dim <= 3 else None
+        print("dim {}, {} generators, axis ratio {}, order {}".format(dim, gen_num, ratio, order))
+        for method in METHODS:
+            time_cur = performance_counter_start()
+            for _ in range(runs):
+                r = Zonotope(z.c, z.gen).reduce(method, order)
+            elapsed = (performance_counter_start() - time_cur) * 1e-9 / runs
+            growth = np.sum(abs(r.gen).sum(axis=1)) / hull
+            line = "  {:>10}: {:8.1f}us, hull growth {:6.3f}".format(method.name, elapsed * 1e6, growth)
+            if vol is not None:
+                line += ", volume growth {:8.3f}".format(volume(r) / vol)
+            print(line)
+
+
+def reach_eval(order: int = 5):
+    # the algorithms reduce to the order and by the method set on the class, they are restored at the end
+    method_prev, order_prev = Zonotope.REDUCE_METHOD, Zonotope.ORDER
+    try:
+        for name, (f, dims, z, t_end, step) in CASES.items():
+            print(name + ", order {}".format(order))
+            for method in METHODS:
+                options = ASB2008CDC.Options()
+                options.t_end = t_end
+                options.step = step
+                options.tensor_order = 2
+                options.taylor_terms = 4
+                options.u = Zonotope([0], np.diag([0]))
+                options.u_trans = options.u.c
+
+                Zonotope.REDUCE_METHOD = method
+                Zonotope.ORDER = order
+
+                time_cur = performance_counter_start()
+                _, rp = ASB2008CDC.reach(f, dims, options, cvt2(z, Geometry.TYPE.ZONOTOPE))
+                elapsed = (performance_counter_start() - time_cur) * 1e-9
+
+                width = np.sum(cvt2(rp[-1], Geometry.TYPE.INTERVAL).rad) * 2
+                print("  {:>10}: reach {:8.2f}s, final hull width {:.6f}".format(method.name, elapsed, width))
+    finally:
+        Zonotope.REDUCE_METHOD, Zonotope.ORDER = method_prev, order_prev
+
+
+if __name__ == "__main__":
+    reduction_eval()
+    reach_eval()
@@ -6,6 +6,21 @@ from pybdr.geometry import Geometry
 
 
 class Algorithm:
+    @staticmethod
+    def iter_sets(xs):
+        """
+        iterate the initial sets given to reach_parallel one by one, they are given either as an iterable of sets, or
+        as an iterable of chunks of sets, e.g. generated by boundary_chunks or partition_chunks, the chunks are consumed
+        lazily, so the first sets are submitted before the next chunks are generated
+        :param xs: iterable of sets or of chunks of sets
+        :return: generator of sets
+        """
+        for x in xs:
+            if isinstance(x, Geometry.Base):
+                yield x
+            else:
+                yield from x
+
     class Options(ABC):
         t_start: float = 0
         t_end: float = 0
@@ -237,7 +237,7 @@ class ALK2011HSCC:
         with ProcessPoolExecutor() as executor:
             partial_reach = partial(cls.reach, sys, opts)
 
-            futures = [executor.submit(partial_reach, x) for x in xs]
+            futures = [executor.submit(partial_reach, x) for x in Algorithm.iter_sets(xs)]
 
             rc = []
 
@@ -18,7 +18,7 @@ from typing import Callable
 from functools import partial
 
 from scipy.special import factorial
-from pybdr.model import Model
+from pybdr.model import get_model
 from pybdr.dynamic_system import NonLinSys
 from pybdr.geometry import Geometry, Zonotope, Interval
 from pybdr.geometry.operation import cvt2
@@ -31,14 +31,17 @@ class ALTH2013HSCC:
     class Options(Algorithm.Options):
         taylor_terms: int = 4
         tensor_order: int = 3
+        range_bound: str = "interval"  # range enclosure of the tensors, "interval" or "interval_mv" (mean value form)
         u_trans: np.ndarray = None
         max_err: np.ndarray = None
         lin_err_x = None
         lin_err_u = None
         lin_err_f0 = None
+        lin_err_hessian = None
 
         def _validate_misc(self, dim: int):
             assert self.tensor_order == 2 or self.tensor_order == 3
+            assert self.range_bound in {"interval", "interval_mv"}
             self.max_err = (
                 np.full(dim, np.inf) if self.max_err is None else self.max_err
             )
@@ -55,15 +58,14 @@ class ALTH2013HSCC:
 
     @classmethod
     def pre_stat_err(cls, dyn: Callable, dims, r_delta: Zonotope, opt: Options):
-        sys = Model(dyn, dims)
+        sys = get_model(dyn, dims)
         r_red = cvt2(r_delta, Geometry.TYPE.ZONOTOPE).reduce(Zonotope.REDUCE_METHOD, Zonotope.ERROR_ORDER)
         # extend the sets by the input sets
         u_stat = Zonotope.zero(opt.u.shape)
         z = r_red.card_prod(u_stat)
         z_delta = r_delta.card_prod(u_stat)
-        # compute hessian
-        hx = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 2, 0)
-        hu = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 2, 1)
+        # hessian at the linearization point, evaluated by linearize
+        hx, hu = opt.lin_err_hessian
 
         t, ind3, zd3 = None, None, None
 
@@ -110,7 +112,7 @@ class ALTH2013HSCC:
 
     @classmethod
     def abst_err(cls, dyn: Callable, dims, opt, r_all, r_diff, h, zd, verr_stat):
-        sys = Model(dyn, dims)
+        sys = get_model(dyn, dims)
         # compute interval of the reachable set
         dx = cvt2(r_all, Geometry.TYPE.INTERVAL)
         total_int_x = dx + opt.lin_err_x
@@ -130,11 +132,10 @@ class ALTH2013HSCC:
         )
 
         if opt.tensor_order == 3:
-            tx = sys.evaluate((total_int_x, total_int_u), "interval", 3, 0)
-            tu = sys.evaluate((total_int_x, total_int_u), "interval", 3, 1)
+            tx, tu = sys.evaluate_many((total_int_x, total_int_u), opt.range_bound, [(3, 0), (3, 1)], sparse=True)
 
-            xx = Interval.sum((dx @ tx @ dx) * dx, axis=1)
-            uu = Interval.sum((du @ tu @ du) * du, axis=1)
+            xx = tx.dot(dx, 2).dot(dx, 2).dot(dx, 1).todense()
+            uu = tu.dot(du, 2).dot(du, 2).dot(du, 1).todense()
             err_dyn_third = (xx + uu) / 6
             err_dyn_third = cvt2(err_dyn_third, Geometry.TYPE.ZONOTOPE)
 
@@ -319,7 +320,7 @@ class ALTH2013HSCC:
 
     @classmethod
     def reach(cls, dyn: Callable, dims, opts: Options, x: Zonotope):
-        m = Model(dyn, dims)
+        m = get_model(dyn, dims)
         assert opts.validation(m.dim)
 
         ri_set, rp_set = [x], []
@@ -341,10 +342,11 @@ class ALTH2013HSCC:
         # init container for storing the results
         rc = []
 
-        partial_reach = partial(cls.reach, dyn, dims, opts)
+        # the same evaluators as for ASB2008CDC with third order tensors
+        partial_reach = partial(cls.reach, ASB2008CDC.warm_model(dyn, dims, opts), dims, opts)
 
         with ProcessPoolExecutor() as executor:
-            futures = [executor.submit(partial_reach, x) for x in xs]
+            futures = [executor.submit(partial_reach, x) for x in Algorithm.iter_sets(xs)]
 
             for future in as_completed(futures):
                 try:
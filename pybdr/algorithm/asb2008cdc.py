@@ -11,7 +11,7 @@ from pybdr.dynamic_system import LinSys, NonLinSys
 from pybdr.geometry import Geometry, Zonotope, Interval
 from pybdr.geometry.operation import cvt2
 from typing import Callable
-from pybdr.model import Model
+from pybdr.model import get_model, Model
 from functools import partial
 from .algorithm import Algorithm
 from .alk2011hscc import ALK2011HSCC
@@ -22,15 +22,18 @@ class ASB2008CDC:
     class Options(Algorithm.Options):
         taylor_terms: int = 4  # for linearization
         tensor_order: int = 2  # for error approximation
+        range_bound: str = "interval"  # range enclosure of the tensors, "interval" or "interval_mv" (mean value form)
         u_trans: np.ndarray = None
         factors: np.ndarray = None
         max_err: np.ndarray = None
         lin_err_x = None
         lin_err_u = None
         lin_err_f0 = None
+        lin_err_hessian = None  # hessians w.r.t. x and u at the linearization point, for the third order error
 
         def _validate_misc(self, dim: int):
             assert self.tensor_order == 2 or self.tensor_order == 3
+            assert self.range_bound in {"interval", "interval_mv"}
             self.max_err = (
                 np.full(dim, np.inf) if self.max_err is None else self.max_err
             )
@@ -46,12 +49,13 @@ class ASB2008CDC:
     @staticmethod
     def linearize(dyn: Callable, dims, r: Geometry.Base, opt: Options):
         opt.lin_err_u = opt.u_trans if opt.u_trans is not None else opt.u.c
-        sys = Model(dyn, dims)
+        sys = get_model(dyn, dims)
         f0 = sys.evaluate((r.c, opt.lin_err_u), "numpy", 0, 0)
         opt.lin_err_x = r.c + f0 * 0.5 * opt.step
-        opt.lin_err_f0 = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 0, 0)
-        a = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 1, 0)
-        b = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 1, 1)
+        # f, the jacobians and the hessians needed later on at the linearization point, all by one call
+        ts = sys.taylor_at((opt.lin_err_x, opt.lin_err_u), 2 if opt.tensor_order >= 3 else 1, sparse=True)
+        opt.lin_err_f0, (a, b) = ts[0][0], ts[1]
+        opt.lin_err_hessian = ts[2] if len(ts) > 2 else None
         assert not (np.any(np.isnan(a))) or np.any(np.isnan(b))
         lin_sys = LinSys(xa=a, ub=None)
         lin_opt = ALK2011HSCC.Options()
@@ -67,7 +71,7 @@ class ASB2008CDC:
 
     @staticmethod
     def abstract_err(dyn, dims, r: Geometry.Base, opt: Options):
-        sys = Model(dyn, dims)
+        sys = get_model(dyn, dims)
         ihx = cvt2(r, Geometry.TYPE.INTERVAL)
         total_int_x = ihx + opt.lin_err_x
 
@@ -79,8 +83,7 @@ class ASB2008CDC:
             du = np.maximum(abs(ihu.inf), abs(ihu.sup))
 
             # evaluate the hessian matrix with the selected range-bounding technique
-            hx = sys.evaluate((total_int_x, total_int_u), "interval", 2, 0)
-            hu = sys.evaluate((total_int_x, total_int_u), "interval", 2, 1)
+            hx, hu = sys.evaluate_many((total_int_x, total_int_u), opt.range_bound, [(2, 0), (2, 1)])
             xx = np.maximum(abs(hx.inf), abs(hx.sup))
             uu = np.maximum(abs(hu.inf), abs(hu.sup))
 
@@ -91,17 +94,15 @@ class ASB2008CDC:
         elif opt.tensor_order == 3:
             r_red = r.reduce(Zonotope.REDUCE_METHOD, Zonotope.ERROR_ORDER)
             z = r_red.card_prod(opt.u)
-            # evaluate hessian
-            hx = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 2, 0)
-            hu = sys.evaluate((opt.lin_err_x, opt.lin_err_u), "numpy", 2, 1)
+            # hessian at the linearization point
+            hx, hu = opt.lin_err_hessian
             # evaluate third order
-            tx = sys.evaluate((total_int_x, total_int_u), "interval", 3, 0)
-            tu = sys.evaluate((total_int_x, total_int_u), "interval", 3, 1)
+            tx, tu = sys.evaluate_many((total_int_x, total_int_u), opt.range_bound, [(3, 0), (3, 1)], sparse=True)
 
             # second order error
             err_sec = 0.5 * z.quad_map([hx, hu])
-            xx = Interval.sum((ihx @ tx @ ihx) * ihx, axis=1)
-            uu = Interval.sum((ihu @ tu @ ihu) * ihu, axis=1)
+            xx = tx.dot(ihx, 2).dot(ihx, 2).dot(ihx, 1).todense()
+            uu = tu.dot(ihu, 2).dot(ihu, 2).dot(ihu, 1).todense()
             err_lagr = (xx + uu) / 6
             err_lagr = cvt2(err_lagr, Geometry.TYPE.ZONOTOPE)
 
@@ -173,7 +174,7 @@ class ASB2008CDC:
 
     @classmethod
     def reach(cls, dyn: Callable, dims, opts: Options, x: Zonotope):
-        m = Model(dyn, dims)
+        m = get_model(dyn, dims)
         assert opts.validation(m.dim)
 
         # ri: reachable set time interval
@@ -189,6 +190,24 @@ class ASB2008CDC:
 
         return ri_set, rp_set
 
+    @staticmethod
+    def warm_model(dyn: Callable, dims, opts: Options):
+        """
+        get the model of given dynamics with the evaluators used by the reachability analysis already built, it is
+        passed to the workers of reach_parallel instead of the dynamics, so they receive the generated code and do
+        not repeat the symbolic work
+        :param dyn: dynamics callable or model
+        :param dims: dimensions of the variables of the dynamics
+        :param opts: options of the analysis
+        :return: the model
+        """
+        m = get_model(dyn, dims)
+        if isinstance(m, Model):
+            taylor = [(0, 0), (1, 0), (1, 1)] + ([(2, 0), (2, 1)] if opts.tensor_order == 3 else [])
+            m.warmup(groups=[[(0, 0)], taylor], mods=["numpy"])
+            m.warmup(groups=[[(opts.tensor_order, 0), (opts.tensor_order, 1)]], mods=[opts.range_bound])
+        return m
+
     @classmethod
     def reach_parallel(cls, dyn: Callable, dims, opts: Options, xs: [Zonotope]):
 
@@ -198,10 +217,10 @@ class ASB2008CDC:
         # init containers for storing the results
         ri = []
 
-        partial_reach = partial(cls.reach, dyn, dims, opts)
+        partial_reach = partial(cls.reach, cls.warm_model(dyn, dims, opts), dims, opts)
 
         with ProcessPoolExecutor() as executor:
-            futures = [executor.submit(partial_reach, x) for x in xs]
+            futures = [executor.submit(partial_reach, x) for x in Algorithm.iter_sets(xs)]
 
             for future in as_completed(futures):
                 try:
@@ -9,6 +9,8 @@ from scipy.special import factorial
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from functools import partial
 
+from .algorithm import Algorithm
+
 """
 Girard, A. (2005, March). Reachability of uncertain linear systems using zonotopes. In International Workshop on Hybrid 
 Systems: Computation and Control (pp. 291-305). Berlin, Heidelberg: Springer Berlin Heidelberg.
@@ -168,7 +170,7 @@ class GIRA2005HSCC:
         with ProcessPoolExecutor() as executor:
             partial_reach = partial(cls.reach, lin_sys, opts)
 
-            futures = [executor.submit(partial_reach, x) for x in xs]
+            futures = [executor.submit(partial_reach, x) for x in Algorithm.iter_sets(xs)]
 
             rc = []
 
@@ -11,20 +11,15 @@ from dataclasses import dataclass
 import cvxpy as cp
 import numpy as np
 from typing import Callable
-from functools import partial
-from pybdr.geometry import Geometry, Polytope, Zonotope
-from pybdr.geometry.operation import cvt2, boundary
-from pybdr.model import Model
+from pybdr.geometry import Geometry, IntervalSet, Polytope, Zonotope
+from pybdr.geometry.operation import cvt2, boundary_chunks
+from pybdr.model import get_model
 from .algorithm import Algorithm
 from .asb2008cdc import ASB2008CDC
 
 np.seterr(divide="ignore", invalid="ignore")
 
 
-def _rev_dyn(dyn, x, u):
-    return -1 * dyn(x, u)
-
-
 class XSE2016CAV:
     @dataclass
     class Options(Algorithm.Options):
@@ -40,24 +35,23 @@ class XSE2016CAV:
 
     @classmethod
     def boundary_back(cls, dyn: Callable, dims, u, epsilon, opt: ASB2008CDC.Options):
+        # the backward model is a reversed view of the forward one, it shares the tensors and evaluators derived in
+        # the previous backward steps and in the verification
+        rev_sys = get_model(dyn, dims, reversed=True)
 
-        rev_dyn = partial(_rev_dyn, dyn)
-
-        m = Model(rev_dyn, dims)
-        m.reverse()
-        bounds = boundary(u, epsilon, Geometry.TYPE.ZONOTOPE)
-        _, rp = ASB2008CDC.reach_parallel(m.f, dims, opt, bounds)
-        return [cvt2(zono, Geometry.TYPE.INTERVAL) for zono in rp[-1]]
+        bounds = boundary_chunks(u, epsilon, Geometry.TYPE.ZONOTOPE)
+        _, rp = ASB2008CDC.reach_parallel(rev_sys, dims, opt, bounds)
+        return IntervalSet.from_zonotopes(rp[-1], dims[0])
 
     @classmethod
-    def polytope(cls, omega):
+    def polytope(cls, omega: IntervalSet):
         # get vertices of these input geometry objects
-        pts = np.concatenate([interval.vertices for interval in omega], axis=0)
+        pts = omega.vertices.reshape((-1, omega.dim))
         # get polytope from these points
         return cvt2(pts, Geometry.TYPE.POLYTOPE)
 
     @classmethod
-    def contraction(cls, omega, o):
+    def contraction(cls, omega: IntervalSet, o):
         num_box = len(omega)
         bj = []
         for i in range(num_box):
@@ -70,11 +64,11 @@ class XSE2016CAV:
             a[:, :-1] = o.a
             a[:, -1] = -1
             constraints.append(a @ x - o.b <= 0)
-            lb = np.zeros(omega[i].inf.shape[0] + 1)
-            lb[:-1] = omega[i].inf
+            lb = np.zeros(omega.dim + 1)
+            lb[:-1] = omega.inf[i]
             lb[-1] = -1e15
-            ub = np.zeros(omega[i].sup.shape[0] + 1)
-            ub[:-1] = omega[i].sup
+            ub = np.zeros(omega.dim + 1)
+            ub[:-1] = omega.sup[i]
             ub[-1] = 0
             constraints.append(lb <= x)
             constraints.append(x <= ub)
@@ -110,9 +104,11 @@ class XSE2016CAV:
         r0 = Zonotope(u_back.c, np.eye(u_back.c.shape[0]) * 0.1)
         _, rp = ASB2008CDC.reach(dyn, dims, opt, r0)
         sx = rp[-1]
-        is_inside = sx in o
+        # the containment takes one product for all the half-spaces, so it is checked before solving for d
+        if sx not in o:
+            return False
         d = cls.get_d(o)
-        if abs(bu / d) > epsilon or not is_inside:
+        if abs(bu / d) > epsilon:
             return False
         return True
 
@@ -128,7 +124,7 @@ class XSE2016CAV:
 
     @classmethod
     def reach(cls, dyn: Callable, dims, opt: Options, opt_back: ASB2008CDC.Options):
-        sys = Model(dyn, dims)
+        sys = get_model(dyn, dims)
         assert opt.validation(sys.dim)
         assert opt_back.validation(sys.dim)
         tp_set, tp_time = [], []
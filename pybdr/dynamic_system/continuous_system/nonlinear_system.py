@@ -17,5 +17,5 @@ class NonLinSys:
     def reverse(self):
         self.model.reverse()
 
-    def evaluate(self, xs: tuple, mod: str, order: int, v: int):
-        return self.model.evaluate(xs, mod, order, v)
+    def evaluate(self, xs: tuple, mod: str, order: int, v: int, sparse: bool = False):
+        return self.model.evaluate(xs, mod, order, v, sparse)
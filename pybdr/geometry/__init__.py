@@ -2,10 +2,16 @@ from .geometry import Geometry
 from .interval import Interval
 from .polytope import Polytope
 from .zonotope import Zonotope
+from .interval_set import IntervalSet
+from .zonotope_accumulator import ZonotopeAccumulator
+from .zonotope_batch import ZonotopeBatch
 
 __all__ = [
     "Geometry",
     "Polytope",
     "Interval",
     "Zonotope",
+    "IntervalSet",
+    "ZonotopeAccumulator",
+    "ZonotopeBatch",
 ]
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
 import itertools
+import math
+from enum import IntEnum
 from numbers import Real
 
 import numpy as np
 from numpy.typing import ArrayLike
 
 from .geometry import Geometry
+from . import interval_kernels as ik
 
 
 class Interval(Geometry.Base):
+    class METHOD:
+        class MATMUL(IntEnum):
+            EXACT = 0  # exact bounds, blocked to stay below MATMUL_MAX_BYTES of temporaries
+            MIDRAD = 1  # midpoint radius form, a few BLAS products, radius overestimated by at most a factor 1.5
+
+    MATMUL_METHOD = METHOD.MATMUL.EXACT
+    MATMUL_MAX_BYTES = 256 * 1024 ** 2  # 256MB
+    GRID_CHUNK_SIZE = 1 << 14  # cells per chunk of grid_chunks
+
     def __init__(self, inf: ArrayLike, sup: ArrayLike):
         inf = inf if isinstance(inf, np.ndarray) else np.atleast_1d(inf).astype(float)
         sup = sup if isinstance(sup, np.ndarray) else np.atleast_1d(sup).astype(float)
@@ -21,6 +33,21 @@ class Interval(Geometry.Base):
         self._type = Geometry.TYPE.INTERVAL
         self._vertices = None
 
+    @classmethod
+    def unchecked(cls, inf: np.ndarray, sup: np.ndarray) -> Interval:
+        """
+        construct an interval from bounds known to be valid, e.g. computed by the interval kernels, skipping the
+        conversion and the checks of the constructor
+        :param inf: lower bounds as float array
+        :param sup: upper bounds as float array of the same shape, not less than inf where not NAN
+        :return: interval holding given arrays, not copies of them
+        """
+        x = object.__new__(cls)
+        x._inf, x._sup = inf, sup
+        x._type = Geometry.TYPE.INTERVAL
+        x._vertices = None
+        return x
+
     # =============================================== property
     @property
     def c(self) -> np.ndarray:
@@ -107,6 +134,8 @@ class Interval(Geometry.Base):
             self._inf[key] = x.inf
             self._sup[key] = x.sup
 
+        self._vertices = None
+
         def _setitem_by_number(x: (Real, np.ndarray)):
             self._inf[key] = x
             self._sup[key] = x
@@ -118,15 +147,25 @@ class Interval(Geometry.Base):
         else:
             raise NotImplementedError
 
-    def __add__(self, other):
-        def _add_interval(x: Interval):
-            return Interval(self.inf + x.inf, self.sup + x.sup)
+    def __inplace(self, other) -> bool:
+        # if the result fits into the bounds of self, the in-place operators return new intervals otherwise
+        if not isinstance(other, (Real, np.ndarray, Interval)):
+            return False
+        shape = () if isinstance(other, Real) else other.shape
+        return (
+            np.broadcast_shapes(self.shape, shape) == self.shape
+            and self._inf.dtype.kind == self._sup.dtype.kind == "f"
+            and self._inf.flags.writeable
+            and self._sup.flags.writeable
+            and not np.may_share_memory(self._inf, self._sup)
+        )
 
+    def __add__(self, other):
         if isinstance(other, (Real, np.ndarray)):
-            return Interval(self.inf + other, self.sup + other)
+            return Interval.add(self, other)
         elif isinstance(other, Geometry.Base):
             if other.type == Geometry.TYPE.INTERVAL:
-                return _add_interval(other)
+                return Interval.add(self, other)
             elif other.type == Geometry.TYPE.ZONOTOPE:
                 return other + self
             else:
@@ -136,18 +175,15 @@ class Interval(Geometry.Base):
         return self + other
 
     def __iadd__(self, other):
-        return self + other
+        return Interval.add(self, other, out=self) if self.__inplace(other) else self + other
 
     def __sub__(self, other):
-        def _sub_interval(x: Interval):
-            assert np.allclose(self.shape, x.shape)
-            return Interval(self.inf - x.sup, self.sup - x.inf)
-
         if isinstance(other, (Real, np.ndarray)):
-            return Interval(self.inf - other, self.sup - other)
+            return Interval.sub(self, other)
         elif isinstance(other, Geometry.Base):
             if other.type == Geometry.TYPE.INTERVAL:
-                return _sub_interval(other)
+                assert np.allclose(self.shape, other.shape)
+                return Interval.sub(self, other)
             else:
                 raise NotImplementedError
 
@@ -155,32 +191,25 @@ class Interval(Geometry.Base):
         return other + (-self)
 
     def __isub__(self, other):
-        return self - other
+        return Interval.sub(self, other, out=self) if self.__inplace(other) else self - other
 
     def __pos__(self):
         return self
 
     def __neg__(self):
-        return Interval(-self.sup, -self.inf)
+        return Interval.unchecked(*ik.neg(self.inf, self.sup))
 
     def __mul__(self, other):
-        def _mul_interval(x: Interval):
-            bd = np.stack(
-                [self.inf * x.inf, self.inf * x.sup, self.sup * x.inf, self.sup * x.sup]
-            )
-            inf, sup = np.min(bd, axis=0), np.max(bd, axis=0)
-            return Interval(inf, sup)
-
         def _mul_real(x: (Real, np.ndarray)):
             inff, supp = self.inf * x, self.sup * x
             inf, sup = np.minimum(inff, supp), np.maximum(inff, supp)
-            return Interval(inf, sup)
+            return Interval.unchecked(inf, sup)
 
         if isinstance(other, (Real, np.ndarray)):
             return _mul_real(other)
         elif isinstance(other, Geometry.Base):
             if other.type == Geometry.TYPE.INTERVAL:
-                return _mul_interval(other)
+                return Interval.mul(self, other)
             elif other.type == Geometry.TYPE.ZONOTOPE:
                 return NotImplemented
             else:
@@ -193,7 +222,7 @@ class Interval(Geometry.Base):
             raise NotImplementedError
 
     def __imul__(self, other):
-        return self * other
+        return Interval.mul(self, other, out=self) if self.__inplace(other) else self * other
 
     def __truediv__(self, other):
         return self * (1 / other)
@@ -236,49 +265,33 @@ class Interval(Geometry.Base):
             raise NotImplementedError
 
     def __itruediv__(self, other):
-        return self / other
+        return Interval.mul(self, 1 / other, out=self) if self.__inplace(other) else self / other
 
     # =============================================== non-periodic functions
 
-    def __matmul__(self, other):
+    def matmul(self, other, method: METHOD.MATMUL = None):
+        """
+        matrix product with a point matrix or an interval matrix, following the broadcasting rules of np.matmul
+        :param other: numpy array or interval
+        :param method: how the product of two interval matrices is bounded, MATMUL_METHOD if not given
+        :return: interval enclosing the product
+        """
+
         def _matmul_matrix(x: np.ndarray):
-            posx, negx = x, np.zeros_like(x, dtype=float)
-            posx[x < 0] = 0
-            negx[x < 0] = x[x < 0]
+            # exact, the bounds of self are weighted by the positive and the negative part of x
+            posx, negx = np.maximum(x, 0), np.minimum(x, 0)
             inf = self.inf @ posx + self.sup @ negx
             sup = self.sup @ posx + self.inf @ negx
             return Interval(inf, sup)
 
         def _matmul_interval(x: Interval):
-            def _mm(l, r):
-                if l.ndim == 1 and r.ndim == 1:
-                    return l * r, 0
-                elif l.ndim == 1 and r.ndim == 2:
-                    return l[..., None] * r, 0
-                elif l.ndim == 1 and r.ndim > 2:
-                    return l[..., None] * r, -2
-                elif l.ndim >= 2 and r.ndim == 1:
-                    return l * r[None, ...], -1
-                else:
-                    return l[..., np.newaxis] * r[..., np.newaxis, :, :], -2
-
-            def _mmm(la, lb, ra, rb):
-                ll, lr = _mm(la, lb)
-                rl, rr = _mm(ra, rb)
-                assert lr == rr
-                return np.sum(np.maximum(ll, rl), axis=lr)
-
-            def posneg(m):
-                pos, neg = m, -m
-                pos[pos < 0] = 0
-                neg[neg < 0] = 0
-                return pos, neg
-
-            (linfp, linfn), (lsupp, lsupn) = posneg(self.inf), posneg(self.sup)
-            (rinfp, rinfn), (rsupp, rsupn) = posneg(x.inf), posneg(x.sup)
-            inf = _mmm(linfp, rinfp, lsupn, rsupn) - _mmm(lsupp, rinfn, linfn, rsupp)
-            sup = _mmm(lsupp, rsupp, linfn, rinfn) - _mmm(linfp, rsupn, lsupn, rinfp)
-            return Interval(inf, sup)
+            m = self.MATMUL_METHOD if method is None else method
+            if m == Interval.METHOD.MATMUL.EXACT:
+                return Interval(*ik.matmul_exact(self.inf, self.sup, x.inf, x.sup, self.MATMUL_MAX_BYTES))
+            elif m == Interval.METHOD.MATMUL.MIDRAD:
+                return Interval(*ik.matmul_midrad(self.inf, self.sup, x.inf, x.sup))
+            else:
+                raise NotImplementedError
 
         if isinstance(other, np.ndarray):
             return _matmul_matrix(other)
@@ -287,11 +300,12 @@ class Interval(Geometry.Base):
         else:
             return NotImplemented
 
+    def __matmul__(self, other):
+        return self.matmul(other)
+
     def __rmatmul__(self, other):
         def _rmm_matrix(x: np.ndarray):
-            posx, negx = x, np.zeros_like(x, dtype=float)
-            posx[x < 0] = 0
-            negx[x < 0] = x[x < 0]
+            posx, negx = np.maximum(x, 0), np.minimum(x, 0)
             inf = posx @ self.inf + negx @ self.sup
             sup = posx @ self.sup + negx @ self.inf
             return Interval(inf, sup)
@@ -302,41 +316,23 @@ class Interval(Geometry.Base):
             raise NotImplementedError
 
     def __imatmul__(self, other):
-        return self @ other
+        # the product can not be computed in the bounds of its operand, it is copied into them if it fits
+        r = self @ other
+        if r.shape == self.shape and self.__inplace(r):
+            self._inf[...], self._sup[...] = r.inf, r.sup
+            self._vertices = None
+            return self
+        return r
 
     def __abs__(self):
-        inf, sup = self.inf, self.sup
-
-        ind = self._sup < 0
-        inf[ind], sup[ind] = abs(self._sup[ind]), abs(self._inf[ind])
-
-        ind = (self._inf <= 0) & (self._sup >= 0)
-        inf[ind] = 0
-        sup[ind] = np.maximum(abs(self._inf[ind]), abs(self._sup[ind]))
-
-        return Interval(inf, sup)
+        return Interval(*ik.absolute(self.inf, self.sup))
 
     def __pow__(self, power, modulo=None):
         def _pow_int(x: int):
-            if x >= 0:
-                inff, supp = self.inf ** x, self.sup ** x
-                inf, sup = np.minimum(inff, supp), np.maximum(inff, supp)
-                if x % 2 == 0 and x != 0:
-                    ind = (self._inf <= 0) & (self._sup >= 0)
-                    inf[ind] = 0
-                return Interval(inf, sup)
-            else:
-                return (1 / self) ** (-x)
+            return Interval(*ik.pow_int(self.inf, self.sup, x))
 
         def _pow_real(x):
-            if x >= 0:
-                inf, sup = self.inf ** x, self.sup ** x
-                ind = self._inf < 0
-                inf[ind] = np.nan
-                sup[ind] = np.nan
-                return Interval(inf, sup)
-            else:
-                return (1 / self) ** (-x)
+            return Interval(*ik.pow_real(self.inf, self.sup, x))
 
         def _pow_num(x):
             if abs(round(x) - x) <= np.finfo(float).eps:
@@ -356,129 +352,56 @@ class Interval(Geometry.Base):
         return self ** other
 
     @staticmethod
-    def exp(x: Interval):
-        return Interval(np.exp(x.inf), np.exp(x.sup))
+    def exp(x: Interval, out: Interval = None):
+        return _result(ik.exp(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def log(x: Interval):
-        inf, sup = np.log(x.inf), np.log(x.sup)
-
-        ind = (x.inf < 0) & (x.sup >= 0)
-        inf[ind] = np.nan
-
-        ind = x.sup < 0
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def log(x: Interval, out: Interval = None):
+        return _result(ik.log(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def sqrt(x: Interval):
-        inf, sup = np.sqrt(x.inf), np.sqrt(x.sup)
-
-        ind = (x.inf < 0) & (x.sup >= 0)
-        inf[ind] = np.nan
-
-        ind = x.sup < 0
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def sqrt(x: Interval, out: Interval = None):
+        return _result(ik.sqrt(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arcsin(x: Interval):
-        inf, sup = np.arcsin(x.inf), np.arcsin(x.sup)
-
-        ind = (x.inf >= -1) & (x.inf <= 1) & (x.sup > 1)
-        sup[ind] = np.nan
-
-        ind = (x.inf < -1) & (x.sup >= -1) & (x.sup <= 1)
-        inf[ind] = np.nan
-
-        ind = (x.inf < -1) & (x.sup > 1)
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def arcsin(x: Interval, out: Interval = None):
+        return _result(ik.arcsin(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arccos(x: Interval):
-        inf, sup = np.arccos(x.sup), np.arccos(x.inf)
-
-        ind = (x.inf >= -1) & (x.inf <= 1) & (x.sup > 1)
-        sup[ind] = np.nan
-
-        ind = (x.inf < -1) & (x.sup >= -1) & (x.sup <= 1)
-        inf[ind] = np.nan
-
-        ind = (x.inf < -1) & (x.sup > 1)
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def arccos(x: Interval, out: Interval = None):
+        return _result(ik.arccos(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arctan(x: Interval):
-        return Interval(np.arctan(x.inf), np.arctan(x.sup))
+    def arctan(x: Interval, out: Interval = None):
+        return _result(ik.arctan(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def sinh(x: Interval):
-        return Interval(np.sinh(x.inf), np.sinh(x.sup))
+    def sinh(x: Interval, out: Interval = None):
+        return _result(ik.sinh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def cosh(x: Interval):
-        inf, sup = np.cosh(x.sup), np.cosh(x.inf)
-
-        ind = (x.inf <= 0) & (x.sup >= 0)
-        inf[ind] = 1
-        sup[ind] = np.cosh(np.maximum(abs(x.inf[ind]), abs(x.sup[ind])))
-
-        ind = x.inf > 0
-        inf[ind] = np.cosh(x.inf[ind])
-        sup[ind] = np.cosh(x.sup[ind])
-
-        return Interval(inf, sup)
+    def cosh(x: Interval, out: Interval = None):
+        return _result(ik.cosh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def tanh(x: Interval):
-        return Interval(np.tanh(x.inf), np.tanh(x.sup))
+    def tanh(x: Interval, out: Interval = None):
+        return _result(ik.tanh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arcsinh(x: Interval):
-        return Interval(np.arcsinh(x.inf), np.arcsinh(x.sup))
+    def arcsinh(x: Interval, out: Interval = None):
+        return _result(ik.arcsinh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arccosh(x: Interval):
-        inf, sup = np.arccosh(x.inf), np.arccosh(x.sup)
-
-        ind = (x.inf < 1) & (x.sup >= 1)
-        inf[ind] = np.nan
-
-        ind = x.sup < 1
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def arccosh(x: Interval, out: Interval = None):
+        return _result(ik.arccosh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def arctanh(x: Interval):
-        inf, sup = np.arctanh(x.inf), np.arctanh(x.sup)
-
-        ind = (x.inf > -1) & (x.inf < 1) & (x.sup >= 1)
-        sup[ind] = np.nan
-
-        ind = (x.inf <= -1) & (x.sup > -1) & (x.sup < 1)
-        inf[ind] = np.nan
-
-        ind = (x.inf <= -1) & (x.sup >= 1)
-        inf[ind] = np.nan
-        sup[ind] = np.nan
-
-        return Interval(inf, sup)
+    def arctanh(x: Interval, out: Interval = None):
+        return _result(ik.arctanh(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def sigmoid(x: Interval):
-        return 1 / (1 + Interval.exp(-x))
+    def sigmoid(x: Interval, out: Interval = None):
+        return _result(ik.sigmoid(x.inf, x.sup, out=_out(out)), out)
 
     # =============================================== periodic functions
 
@@ -489,48 +412,8 @@ class Interval(Geometry.Base):
     #     return Interval.cos(x - np.pi * 0.5)
 
     @staticmethod
-    def sin(x: Interval):
-        ind0 = (x.sup - x.inf) >= 2 * np.pi  # xsup -xinf >= 2*pi
-        yinf, ysup = np.mod(x.inf, np.pi * 2), np.mod(x.sup, np.pi * 2)
-
-        ind1 = yinf < np.pi * 0.5  # yinf in R1
-        ind2 = ysup < np.pi * 0.5  # ysup in R1
-        ind3 = np.logical_not(ind1) & (yinf < np.pi * 1.5)  # yinf in R2
-        ind4 = np.logical_not(ind2) & (ysup < np.pi * 1.5)  # ysup in R2
-        ind5 = yinf >= np.pi * 1.5  # yinf in R3
-        ind6 = ysup >= np.pi * 1.5  # ysup in R3
-        ind7 = yinf > ysup  # yinf > ysup
-        ind8 = np.logical_not(ind7)  # yinf <=ysup
-
-        inf, sup = x.inf, x.sup
-
-        ind = (ind1 & ind2 & ind8) | (ind5 & ind2) | (ind5 & ind6 & ind8)
-        inf[ind] = np.sin(yinf[ind])
-        sup[ind] = np.sin(ysup[ind])
-
-        ind = (ind1 & ind4) | (ind5 & ind4)
-        inf[ind] = np.minimum(np.sin(yinf[ind]), np.sin(ysup[ind]))
-        sup[ind] = 1
-
-        ind = (ind3 & ind2) | (ind3 & ind6)
-        inf[ind] = -1
-        sup[ind] = np.maximum(np.sin(yinf[ind]), np.sin(ysup[ind]))
-
-        ind = ind3 & ind4 & ind8
-        inf[ind] = np.sin(ysup[ind])
-        sup[ind] = np.sin(yinf[ind])
-
-        ind = (
-                ind0
-                | (ind1 & ind2 & ind7)
-                | (ind1 & ind6)
-                | (ind3 & ind4 & ind7)
-                | (ind5 & ind6 & ind7)
-        )
-        inf[ind] = -1
-        sup[ind] = 1
-
-        return Interval(inf, sup)
+    def sin(x: Interval, out: Interval = None):
+        return _result(ik.sin(x.inf, x.sup, out=_out(out)), out)
 
     # @staticmethod
     # def cos(x: Interval):
@@ -549,72 +432,16 @@ class Interval(Geometry.Base):
     #     return Interval(inf, sup)
 
     @staticmethod
-    def cos(x: Interval):
-        ind0 = (x.sup - x.inf) >= 2 * np.pi  # xsup -xinf >= 2*pi
-        yinf, ysup = np.mod(x.inf, np.pi * 2), np.mod(x.sup, np.pi * 2)
-
-        ind1 = yinf < np.pi  # yinf in R1
-        ind2 = ysup < np.pi  # ysup in R1
-        ind3 = np.logical_not(ind1)  # yinf in R2
-        ind4 = np.logical_not(ind2)  # ysup in R2
-        ind5 = yinf > ysup  # yinf > ysup
-        ind6 = np.logical_not(ind5)  # yinf <= ysup
-
-        inf, sup = x.inf, x.sup
-
-        ind = ind3 & ind4 & ind6
-        inf[ind] = np.cos(yinf[ind])
-        sup[ind] = np.cos(ysup[ind])
-
-        ind = ind3 & ind2
-        inf[ind] = np.minimum(np.cos(yinf[ind]), np.cos(ysup[ind]))
-        sup[ind] = 1
-
-        ind = ind1 & ind4
-        inf[ind] = -1
-        sup[ind] = np.maximum(np.cos(yinf[ind]), np.cos(ysup[ind]))
-
-        ind = ind1 & ind2 & ind6
-        inf[ind] = np.cos(ysup[ind])
-        sup[ind] = np.cos(yinf[ind])
-
-        ind = ind0 | (ind1 & ind2 & ind5) | (ind3 & ind4 & ind5)
-        inf[ind] = -1
-        sup[ind] = 1
-
-        return Interval(inf, sup)
+    def cos(x: Interval, out: Interval = None):
+        return _result(ik.cos(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def tan(x: Interval):
-        inf = np.full_like(x.inf, -np.inf)
-        sup = np.full_like(x.sup, np.inf)
-
-        tan_inf = np.tan(x.inf)
-        tan_sup = np.tan(x.sup)
-
-        ind = ((x.sup - x.inf) < np.pi) & (tan_inf <= tan_sup)
-        inf[ind] = tan_inf[ind]
-        sup[ind] = tan_sup[ind]
-
-        return Interval(inf, sup)
+    def tan(x: Interval, out: Interval = None):
+        return _result(ik.tan(x.inf, x.sup, out=_out(out)), out)
 
     @staticmethod
-    def cot(x: Interval):
-        # TODO need check
-        ind0 = (x.sup - x.inf) >= np.pi  # xsup -xinf >= pi
-        zinf, zsup = np.mod(x.inf, np.pi), np.mod(x.sup, np.pi)
-
-        inf, sup = x.inf, x.sup
-
-        ind = zinf <= zsup
-        inf[ind] = 1 / np.tan(zsup[ind])
-        sup[ind] = 1 / np.tan(zinf[ind])
-
-        ind = ind0 | (zinf > zsup)
-        inf[ind] = -np.inf
-        sup[ind] = np.inf
-
-        return Interval(inf, sup)
+    def cot(x: Interval, out: Interval = None):
+        return _result(ik.cot(x.inf, x.sup, out=_out(out)), out)
 
     # =============================================== class method
     @classmethod
@@ -639,6 +466,42 @@ class Interval(Geometry.Base):
         }
 
     # =============================================== static method
+    @staticmethod
+    def add(x: Interval, y, out: Interval = None) -> Interval:
+        """
+        x + y, written into the bounds of out if given
+        :param x: interval
+        :param y: interval, number or numpy array
+        :param out: interval of the shape of the result, may be x or y
+        :return: the sum, out if given
+        """
+        yinf, ysup = (y.inf, y.sup) if isinstance(y, Interval) else (y, y)
+        return _result(ik.add(x.inf, x.sup, yinf, ysup, out=_out(out)), out)
+
+    @staticmethod
+    def sub(x: Interval, y, out: Interval = None) -> Interval:
+        """
+        x - y, written into the bounds of out if given
+        :param x: interval
+        :param y: interval, number or numpy array
+        :param out: interval of the shape of the result, may be x or y
+        :return: the difference, out if given
+        """
+        yinf, ysup = (y.inf, y.sup) if isinstance(y, Interval) else (y, y)
+        return _result(ik.sub(x.inf, x.sup, yinf, ysup, out=_out(out)), out)
+
+    @staticmethod
+    def mul(x: Interval, y, out: Interval = None) -> Interval:
+        """
+        element-wise x * y, written into the bounds of out if given
+        :param x: interval
+        :param y: interval, number or numpy array
+        :param out: interval of the shape of the result, may be x or y
+        :return: the product, out if given
+        """
+        yinf, ysup = (y.inf, y.sup) if isinstance(y, Interval) else (y, y)
+        return _result(ik.mul(x.inf, x.sup, yinf, ysup, out=_out(out)), out)
+
     @staticmethod
     def empty(s):
         inf, sup = np.full(s, np.nan, dtype=float), np.full(s, np.nan, dtype=float)
@@ -768,37 +631,34 @@ class Interval(Geometry.Base):
         return Interval(self.inf, sup), Interval(inf, self.sup)
 
     def grid(self, max_dist: float) -> np.ndarray:
-        def __ll2arr(ll, fill_value: float):
-            lens = [lst.shape[0] for lst in ll]
-            max_len = max(lens)
-            mask = np.arange(max_len) < np.array(lens)[:, None]
-            arr = np.ones((len(lens), max_len, 2), dtype=float) * fill_value
-            arr[mask] = np.concatenate(ll)
-            return arr, mask
-
-        def __get_seg(dim_idx: int, seg_num: int):
-            if seg_num <= 1:
-                return np.array(
-                    [self.inf[dim_idx], self.sup[dim_idx]], dtype=float
-                ).reshape((1, -1))
-            else:
-                samples = np.linspace(
-                    self.inf[dim_idx], self.sup[dim_idx], num=seg_num + 1
-                )
-                this_segs = np.zeros((seg_num, 2), dtype=float)
-                this_segs[:, 0] = samples[:-1]
-                this_segs[:, 1] = samples[1:]
-                return this_segs
+        """
+        split this interval into cells of width at most max_dist along every dimension
+        :param max_dist: max width of the cells
+        :return: array of shape (N, dim, 2) of the bounds of all the cells
+        """
+        return np.concatenate(list(self.grid_chunks(max_dist)))
 
+    def grid_chunks(self, max_dist: float, chunk_size: int = None):
+        """
+        lazily generate the cells of the grid, so grids too large to be held at once can be consumed chunk by chunk,
+        only the cells of the current chunk are in memory
+        :param max_dist: max width of the cells
+        :param chunk_size: max number of cells per chunk, GRID_CHUNK_SIZE if not given
+        :return: generator of arrays of shape (k, dim, 2) of the bounds of the cells, in the same order as grid
+        """
         assert len(self.shape) == 1
+        chunk_size = self.GRID_CHUNK_SIZE if chunk_size is None else int(chunk_size)
+        assert chunk_size > 0
         nums = np.floor((self.sup - self.inf) / max_dist).astype(dtype=int) + 1
-        segs, _ = __ll2arr(
-            [__get_seg(i, nums[i]) for i in range(self.shape[0])], np.nan
-        )
-        idx_list = [np.arange(nums[i]) for i in range(self.shape[0])]
-        ext_idx = np.array(np.meshgrid(*idx_list)).T.reshape((-1, len(idx_list)))
-        aux_idx = np.tile(np.arange(self.shape[0]), ext_idx.shape[0])
-        return segs[aux_idx, ext_idx.reshape(-1)].reshape((-1, self.shape[0], 2))
+        edges = [np.linspace(self.inf[i], self.sup[i], num=nums[i] + 1) for i in range(self.shape[0])]
+        total = math.prod(nums.tolist())
+        for start in range(0, total, chunk_size):
+            idx = _grid_index(nums, start, min(start + chunk_size, total))
+            cells = np.empty(idx.shape + (2,), dtype=float)
+            for i in range(self.shape[0]):
+                cells[:, i, 0] = edges[i][idx[:, i]]
+                cells[:, i, 1] = edges[i][idx[:, i] + 1]
+            yield cells
 
     def rectangle(self):
         assert len(self.shape) == 1 and self.shape[0] == 2  # enforce 2d
@@ -840,3 +700,27 @@ class Interval(Geometry.Base):
             return np.all(x_arr >= self.inf) and np.all(x_arr <= self.sup)
         else:
             raise NotImplementedError
+
+
+def _out(out: Interval):
+    return None if out is None else (out.inf, out.sup)
+
+
+def _result(bds, out: Interval = None) -> Interval:
+    # bounds computed by a kernel, already written into out if given
+    if out is None:
+        return Interval.unchecked(*bds)
+    out._vertices = None
+    return out
+
+
+def _grid_index(nums: np.ndarray, start: int, stop: int) -> np.ndarray:
+    # indices of the cells start, ..., stop - 1 of the grid along every dimension, in the order of
+    # np.meshgrid(*ranges).T.reshape((-1, dim)), i.e. the second dimension varies fastest, then the first one, then the
+    # third one up to the last one, without building the whole index array
+    dim = nums.shape[0]
+    order = list(range(dim - 1, 1, -1)) + [0, 1] if dim >= 2 else list(range(dim))
+    idx = np.empty((stop - start, dim), dtype=int)
+    if dim > 0:
+        idx[:, order] = np.stack(np.unravel_index(np.arange(start, stop), [nums[i] for i in order]), axis=1)
+    return idx
@@ -0,0 +1,302 @@
+"""
+Interval arithmetic on plain bound arrays. Every kernel takes the lower and upper bounds of its operands as float
+arrays of the same shape and returns the bounds of the result as a new pair of arrays, or writes them into the pair of
+arrays given as out and returns it, out may be the bounds of an operand. NAN bounds indicate an empty result, same as
+Interval does. The kernels are branch free: the candidate bounds are computed for all the entries at once and the
+special cases are selected by masks written in place, so arrays of any shape are evaluated in a single pass.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def _store(out, inf, sup):
+    # kernels computing their bounds in several steps write them into out only at the end, so out may alias operands
+    if out is None:
+        return inf, sup
+    out[0][...] = inf
+    out[1][...] = sup
+    return out
+
+
+def _unary(fn, inf, sup, out):
+    # monotone increasing function, element-wise, so writing into bounds aliased by out is safe
+    if out is None:
+        return fn(inf), fn(sup)
+    fn(inf, out=out[0])
+    fn(sup, out=out[1])
+    return out
+
+
+def _empty(x):
+    return np.empty(np.shape(x), dtype=float)
+
+
+def _fill(inf, sup, value: float, where):
+    np.copyto(inf, value, where=where)
+    np.copyto(sup, value, where=where)
+
+
+def _hull_fill(a, b, lower, upper, out):
+    # hull of a and b, with the lower bound -1 where given, the upper bound 1 where given, written into out if given
+    rinf, rsup = (_empty(a), _empty(b)) if out is None else out
+    np.minimum(a, b, out=rinf)
+    np.maximum(a, b, out=rsup)
+    np.copyto(rinf, -1.0, where=lower)
+    np.copyto(rsup, 1.0, where=upper)
+    return (rinf, rsup) if out is None else out
+
+
+def neg(inf, sup, out=None):
+    return _store(out, -sup, -inf)
+
+
+def add(ainf, asup, binf, bsup, out=None):
+    if out is None:
+        return ainf + binf, asup + bsup
+    np.add(ainf, binf, out=out[0])
+    np.add(asup, bsup, out=out[1])
+    return out
+
+
+def sub(ainf, asup, binf, bsup, out=None):
+    if out is None:
+        return ainf - bsup, asup - binf
+    elif np.may_share_memory(out[0], binf):
+        # e.g. x - x into the bounds of x
+        return _store(out, ainf - bsup, asup - binf)
+    np.subtract(ainf, bsup, out=out[0])
+    np.subtract(asup, binf, out=out[1])
+    return out
+
+
+def scale(inf, sup, c: float, out=None):
+    if c < 0:
+        return _store(out, sup * c, inf * c)
+    elif out is None:
+        return inf * c, sup * c
+    np.multiply(inf, c, out=out[0])
+    np.multiply(sup, c, out=out[1])
+    return out
+
+
+def mul(ainf, asup, binf, bsup, out=None):
+    p0, p1, p2, p3 = ainf * binf, ainf * bsup, asup * binf, asup * bsup
+    inf = np.minimum(np.minimum(p0, p1), np.minimum(p2, p3))
+    if out is None:
+        return inf, np.maximum(np.maximum(p0, p1), np.maximum(p2, p3))
+    # only the products are read from here on, so out may alias the operands
+    np.maximum(np.maximum(p0, p1, out=p0), np.maximum(p2, p3, out=p2), out=out[1])
+    out[0][...] = inf
+    return out
+
+
+def inv(inf, sup, out=None):
+    # [1/u,1/l] if 0 not in [l,u], [1/u,+inf] if l==0<u, [-inf,1/l] if l<0==u, [-inf,+inf] if l<0<u, empty if [0,0]
+    ninf, psup = (inf < 0) & (sup >= 0), (inf <= 0) & (sup > 0)
+    empty = (inf == 0) & (sup == 0)
+    with np.errstate(divide="ignore"):
+        rinf, rsup = 1 / sup, 1 / inf
+    np.copyto(rinf, -np.inf, where=ninf)
+    np.copyto(rsup, np.inf, where=psup)
+    _fill(rinf, rsup, np.nan, empty)
+    return _store(out, rinf, rsup)
+
+
+def div(ainf, asup, binf, bsup, out=None):
+    return mul(ainf, asup, *inv(binf, bsup), out=out)
+
+
+def pow_int(inf, sup, n: int, out=None):
+    if n < 0:
+        return pow_int(*inv(inf, sup), -n, out=out)
+    pinf, psup = inf ** n, sup ** n
+    rinf, rsup = np.minimum(pinf, psup), np.maximum(pinf, psup, out=psup)
+    if n % 2 == 0 and n != 0:
+        np.copyto(rinf, 0, where=(inf <= 0) & (sup >= 0))
+    return _store(out, rinf, rsup)
+
+
+def pow_real(inf, sup, x: float, out=None):
+    if x < 0:
+        return pow_real(*inv(inf, sup), -x, out=out)
+    with np.errstate(invalid="ignore"):
+        rinf, rsup = inf ** x, sup ** x
+    _fill(rinf, rsup, np.nan, inf < 0)
+    return _store(out, rinf, rsup)
+
+
+def absolute(inf, sup, out=None):
+    # [l,u] if 0<=l, [-u,-l] if u<0, [0,max(-l,u)] if l<0<=u
+    rinf = np.maximum(np.maximum(inf, -sup), 0)
+    return _store(out, rinf, np.maximum(-inf, sup))
+
+
+def exp(inf, sup, out=None):
+    return _unary(np.exp, inf, sup, out)
+
+
+# the functions below are monotone on their domain and NAN outside of it, so the bounds out of the domain are NAN
+# without any masking
+
+
+def log(inf, sup, out=None):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _unary(np.log, inf, sup, out)
+
+
+def sqrt(inf, sup, out=None):
+    with np.errstate(invalid="ignore"):
+        return _unary(np.sqrt, inf, sup, out)
+
+
+def arcsin(inf, sup, out=None):
+    with np.errstate(invalid="ignore"):
+        return _unary(np.arcsin, inf, sup, out)
+
+
+def arccos(inf, sup, out=None):
+    # decreasing, empty as soon as any part of the interval is out of [-1,1]
+    with np.errstate(invalid="ignore"):
+        rinf, rsup = np.arccos(sup), np.arccos(inf)
+    _fill(rinf, rsup, np.nan, np.isnan(rinf) | np.isnan(rsup))
+    return _store(out, rinf, rsup)
+
+
+def arctan(inf, sup, out=None):
+    return _unary(np.arctan, inf, sup, out)
+
+
+def sinh(inf, sup, out=None):
+    return _unary(np.sinh, inf, sup, out)
+
+
+def cosh(inf, sup, out=None):
+    # even and increasing in |x|, so the max of the bounds is the upper bound, the lower one is 1 if 0 is inside
+    cinf, csup = np.cosh(inf), np.cosh(sup)
+    zero = (inf <= 0) & (sup >= 0)
+    rinf, rsup = np.minimum(cinf, csup), np.maximum(cinf, csup, out=csup)
+    np.copyto(rinf, 1, where=zero)
+    return _store(out, rinf, rsup)
+
+
+def tanh(inf, sup, out=None):
+    return _unary(np.tanh, inf, sup, out)
+
+
+def arcsinh(inf, sup, out=None):
+    return _unary(np.arcsinh, inf, sup, out)
+
+
+def arccosh(inf, sup, out=None):
+    with np.errstate(invalid="ignore"):
+        return _unary(np.arccosh, inf, sup, out)
+
+
+def arctanh(inf, sup, out=None):
+    # the bounds reaching -1 or 1 are NAN, not infinite, unless the whole interval is beyond
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rinf, rsup = np.arctanh(inf), np.arctanh(sup)
+    np.copyto(rinf, np.nan, where=(inf <= -1) & (sup > -1))
+    np.copyto(rsup, np.nan, where=(sup >= 1) & (inf < 1))
+    return _store(out, rinf, rsup)
+
+
+def _sigmoid(x, out=None):
+    # 1 / (1 + exp(-x)), element-wise, so out may alias x
+    r = np.negative(x, out=out)
+    np.exp(r, out=r)
+    r += 1
+    return np.divide(1, r, out=r)
+
+
+def sigmoid(inf, sup, out=None):
+    return _unary(_sigmoid, inf, sup, out)
+
+
+def sin(inf, sup, out=None):
+    # regions of the bounds modulo 2 pi: 0 for [0,pi/2) and 2 for [3pi/2,2pi), where sin increases, 1 for
+    # [pi/2,3pi/2), where it decreases. the hull of sin at the bounds is the range unless the interval passes pi/2,
+    # then the upper bound is 1, or 3pi/2, then the lower bound is -1, or both
+    full = (sup - inf) >= 2 * np.pi
+    yinf, ysup = np.mod(inf, 2 * np.pi, out=_empty(inf)), np.mod(sup, 2 * np.pi, out=_empty(sup))
+    ainf = np.add(yinf >= np.pi * 0.5, yinf >= np.pi * 1.5, dtype=np.int8)
+    asup = np.add(ysup >= np.pi * 0.5, ysup >= np.pi * 1.5, dtype=np.int8)
+    full |= ((ainf == asup) & (yinf > ysup)) | ((ainf == 0) & (asup == 2))
+    # only yinf and ysup are read from here on, so out may alias the operands
+    sinf, ssup = np.sin(yinf, out=yinf), np.sin(ysup, out=ysup)
+    return _hull_fill(sinf, ssup, full | ((ainf == 1) & (asup != 1)), full | ((ainf != 1) & (asup == 1)), out)
+
+
+def cos(inf, sup, out=None):
+    # regions of the bounds modulo 2 pi: [0,pi), where cos decreases, and [pi,2pi), where it increases. the hull of
+    # cos at the bounds is the range unless the interval passes pi, then the lower bound is -1, or 2 pi, then the
+    # upper bound is 1, or both
+    full = (sup - inf) >= 2 * np.pi
+    yinf, ysup = np.mod(inf, 2 * np.pi, out=_empty(inf)), np.mod(sup, 2 * np.pi, out=_empty(sup))
+    binf, bsup = yinf < np.pi, ysup < np.pi
+    full |= (binf == bsup) & (yinf > ysup)
+    # only yinf and ysup are read from here on, so out may alias the operands
+    cinf, csup = np.cos(yinf, out=yinf), np.cos(ysup, out=ysup)
+    return _hull_fill(cinf, csup, full | (binf & ~bsup), full | (bsup & ~binf), out)
+
+
+def tan(inf, sup, out=None):
+    # [-inf,+inf] unless the interval lies within one branch
+    rinf, rsup = np.tan(inf), np.tan(sup)
+    unbounded = ~(((sup - inf) < np.pi) & (rinf <= rsup))
+    np.copyto(rinf, -np.inf, where=unbounded)
+    np.copyto(rsup, np.inf, where=unbounded)
+    return _store(out, rinf, rsup)
+
+
+def cot(inf, sup, out=None):
+    # TODO need check
+    ind0 = (sup - inf) >= np.pi  # xsup -xinf >= pi
+    zinf, zsup = np.mod(inf, np.pi), np.mod(sup, np.pi)
+    unbounded = ind0 | (zinf > zsup)
+    with np.errstate(divide="ignore"):
+        rinf, rsup = 1 / np.tan(zsup), 1 / np.tan(zinf)
+    np.copyto(rinf, -np.inf, where=unbounded)
+    np.copyto(rsup, np.inf, where=unbounded)
+    return _store(out, rinf, rsup)
+
+
+# matrix products, the operands follow the broadcasting rules of np.matmul instead of having the same shape
+
+
+def matmul_exact(ainf, asup, binf, bsup, max_bytes: int = None):
+    # hull of the products of the entries summed up, the contracted axis is split into blocks, so the temporaries
+    # of one block stay below max_bytes, all at once if not given
+    a1, b1 = ainf.ndim == 1, binf.ndim == 1
+    ainf, asup = (ainf[None, :], asup[None, :]) if a1 else (ainf, asup)
+    binf, bsup = (binf[:, None], bsup[:, None]) if b1 else (binf, bsup)
+    batch = np.broadcast_shapes(ainf.shape[:-2], binf.shape[:-2])
+    (m, k), n = ainf.shape[-2:], binf.shape[-1]
+    assert binf.shape[-2] == k
+    # the four products of the entries and their minimum and maximum are alive at once
+    size = 6 * 8 * int(np.prod(batch)) * m * n
+    step = k if max_bytes is None else max(1, min(k, max_bytes // max(size, 1)))
+    inf, sup = np.zeros(batch + (m, n)), np.zeros(batch + (m, n))
+    for s in range(0, k, step):
+        blk = slice(s, s + step)
+        pinf, psup = mul(ainf[..., blk, None], asup[..., blk, None], binf[..., None, blk, :], bsup[..., None, blk, :])
+        inf += pinf.sum(axis=-2)
+        sup += psup.sum(axis=-2)
+    if a1 and b1:
+        return inf[..., 0, 0][()], sup[..., 0, 0][()]
+    elif a1 or b1:
+        axis = -2 if a1 else -1
+        return inf.squeeze(axis), sup.squeeze(axis)
+    return inf, sup
+
+
+def matmul_midrad(ainf, asup, binf, bsup):
+    # midpoint radius form by Rump, three matrix products, so BLAS does the work and no temporaries beyond the
+    # operands are needed, the radius is overestimated by a factor of at most 1.5
+    ac, ar = (ainf + asup) * 0.5, (asup - ainf) * 0.5
+    bc, br = (binf + bsup) * 0.5, (bsup - binf) * 0.5
+    c = ac @ bc
+    r = abs(ac) @ br + ar @ (abs(bc) + br)
+    return c - r, c + r
@@ -0,0 +1,210 @@
+"""
+Collection of boxes of the same dimension stored as two (N, dim) arrays of lower and upper bounds, the struct of
+arrays counterpart of a list of Interval. Pavings of boundaries and partitions easily hold 10^4 to 10^6 boxes, as
+single objects they cost a few hundred bytes each and every operation on them is a Python loop, here they cost
+16 bytes per dimension and operations are vectorized over all the boxes at once.
+"""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .interval import Interval
+from .polytope import Polytope
+from .zonotope import Zonotope
+
+
+class IntervalSet:
+    """
+    set of N boxes [inf[i], sup[i]], it behaves as a sequence of Interval, i.e. len, iteration and indexing by an
+    integer give single boxes, indexing by slices, masks or index arrays give subsets
+    """
+
+    def __init__(self, inf: ArrayLike, sup: ArrayLike):
+        inf = np.asarray(inf, dtype=float)
+        sup = np.asarray(sup, dtype=float)
+        assert inf.ndim == 2 and inf.shape == sup.shape
+        mask = np.logical_not(np.isnan(inf) | np.isnan(sup))  # NAN indicates empty
+        assert np.all(inf[mask] <= sup[mask])
+        self._inf = inf
+        self._sup = sup
+
+    @classmethod
+    def from_intervals(cls, boxes: [Interval], dim: int = None) -> IntervalSet:
+        """
+        stack single boxes into a set
+        :param boxes: intervals of the same dimension
+        :param dim: dimension of the boxes, needed if there are none
+        :return: set of given boxes
+        """
+        if len(boxes) <= 0:
+            assert dim is not None
+            return cls(np.zeros((0, dim)), np.zeros((0, dim)))
+        return cls(np.stack([box.inf for box in boxes]), np.stack([box.sup for box in boxes]))
+
+    @classmethod
+    def from_zonotopes(cls, zonos: [Zonotope], dim: int = None) -> IntervalSet:
+        """
+        interval hulls of given zonotopes
+        :param zonos: zonotopes of the same dimension
+        :param dim: dimension of the zonotopes, needed if there are none
+        :return: set of the boxes enclosing given zonotopes
+        """
+        if len(zonos) <= 0:
+            assert dim is not None
+            return cls(np.zeros((0, dim)), np.zeros((0, dim)))
+        c = np.stack([z.c for z in zonos])
+        r = np.stack([abs(z.gen).sum(axis=1) for z in zonos])
+        return cls(c - r, c + r)
+
+    @staticmethod
+    def concatenate(sets: [IntervalSet]) -> IntervalSet:
+        assert len(sets) > 0
+        return IntervalSet(np.concatenate([s.inf for s in sets]), np.concatenate([s.sup for s in sets]))
+
+    # =============================================== property
+    @property
+    def inf(self) -> np.ndarray:
+        return self._inf
+
+    @property
+    def sup(self) -> np.ndarray:
+        return self._sup
+
+    @property
+    def c(self) -> np.ndarray:
+        return (self._inf + self._sup) * 0.5
+
+    @property
+    def rad(self) -> np.ndarray:
+        return (self._sup - self._inf) * 0.5
+
+    @property
+    def shape(self) -> tuple:
+        return self._inf.shape
+
+    @property
+    def dim(self) -> int:
+        return self._inf.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._inf.nbytes + self._sup.nbytes
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """
+        vertices of all the boxes
+        :return: array of shape (N, 2^dim, dim)
+        """
+        corners = np.asarray(list(itertools.product([False, True], repeat=self.dim)))
+        return np.where(corners[None], self._sup[:, None], self._inf[:, None])
+
+    # =============================================== sequence of boxes
+    def __len__(self):
+        return self._inf.shape[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield Interval.unchecked(self._inf[i], self._sup[i])
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return Interval.unchecked(self._inf[item], self._sup[item])
+        return IntervalSet(self._inf[item], self._sup[item])
+
+    def __str__(self):
+        return "IntervalSet of {} boxes in {}d".format(len(self), self.dim)
+
+    # =============================================== operations
+    def proj(self, dims) -> IntervalSet:
+        return IntervalSet(self._inf[:, dims], self._sup[:, dims])
+
+    def hull(self) -> Interval:
+        """
+        smallest box enclosing all the boxes of this set
+        :return: interval hull
+        """
+        assert len(self) > 0
+        return Interval(np.min(self._inf, axis=0), np.max(self._sup, axis=0))
+
+    def filter(self, mask: np.ndarray) -> IntervalSet:
+        """
+        boxes selected by given mask
+        :param mask: boolean array of shape (N,)
+        :return: subset of this set
+        """
+        mask = np.asarray(mask, dtype=bool)
+        assert mask.shape == (len(self),)
+        return self[mask]
+
+    def contains(self, x: ArrayLike) -> np.ndarray:
+        """
+        check which boxes contain given points
+        :param x: point of shape (dim,) or points of shape (M, dim)
+        :return: boolean array of shape (N,) for one point, (M, N) for several points
+        """
+        x = np.asarray(x, dtype=float)
+        inside = (x[..., None, :] >= self._inf) & (x[..., None, :] <= self._sup)
+        return np.all(inside, axis=-1)
+
+    def intersects(self, box: Interval) -> np.ndarray:
+        """
+        check which boxes intersect given box
+        :param box: interval of dimension dim
+        :return: boolean array of shape (N,)
+        """
+        return np.all((self._inf <= box.sup) & (self._sup >= box.inf), axis=-1)
+
+    def split(self, dims=None) -> IntervalSet:
+        """
+        bisect every box along given dimension, or along its widest one
+        :param dims: dimension to split along, either one for all the boxes or one per box, the widest if not given
+        :return: set of 2N boxes, the lower halves first
+        """
+        idx = np.arange(len(self))
+        dims = np.argmax(self._sup - self._inf, axis=1) if dims is None else np.broadcast_to(dims, idx.shape)
+        mid = (self._inf[idx, dims] + self._sup[idx, dims]) * 0.5
+        lo_sup, hi_inf = self._sup.copy(), self._inf.copy()
+        lo_sup[idx, dims] = mid
+        hi_inf[idx, dims] = mid
+        return IntervalSet(np.concatenate([self._inf, hi_inf]), np.concatenate([lo_sup, self._sup]))
+
+    def zonotopes(self) -> (np.ndarray, np.ndarray):
+        """
+        all the boxes as zonotopes, stacked
+        :return: centers of shape (N, dim) and generators of shape (N, dim, dim)
+        """
+        return self.c, self.rad[:, :, None] * np.eye(self.dim)
+
+    def polytopes(self) -> (np.ndarray, np.ndarray):
+        """
+        all the boxes as polytopes a @ x <= b[i], stacked, they share the same constraint matrix
+        :return: constraint matrix of shape (2 dim, dim) and offsets of shape (N, 2 dim)
+        """
+        a = np.concatenate([np.eye(self.dim), -np.eye(self.dim)], axis=0)
+        return a, np.concatenate([self._sup, -self._inf], axis=1)
+
+    def to_zonotopes(self) -> [Zonotope]:
+        c, gen = self.zonotopes()
+        return [Zonotope(ci, gi) for ci, gi in zip(c, gen)]
+
+    def to_polytopes(self) -> [Polytope]:
+        a, b = self.polytopes()
+        return [Polytope(a, bi) for bi in b]
+
+    # =============================================== serialization
+    def save(self, file):
+        """
+        save this set into a .npz file
+        :param file: file name or file object
+        """
+        np.savez(file, inf=self._inf, sup=self._sup)
+
+    @staticmethod
+    def load(file) -> IntervalSet:
+        with np.load(file) as data:
+            return IntervalSet(data["inf"], data["sup"])
@@ -1,6 +1,6 @@
 from .convert import cvt2
-from .boundary import boundary
-from .partition import partition
+from .boundary import boundary, boundary_chunks
+from .partition import partition, partition_chunks
 from .enclose import enclose
 
-__all__ = ["cvt2", "boundary", "enclose", "partition"]
+__all__ = ["cvt2", "boundary", "boundary_chunks", "enclose", "partition", "partition_chunks"]
@@ -1,41 +1,38 @@
-from itertools import chain
-
 import numpy as np
 
-from pybdr.geometry import Geometry, Interval, Polytope, Zonotope
+from pybdr.geometry import Geometry, Interval, IntervalSet, Polytope, Zonotope
 from pybdr.util.functional import RealPaver
 
 from .convert import cvt2
 
 
-def _interval2interval(src: Interval, r: float):
-    bd = []
+def _interval2interval_chunks(src: Interval, r: float, chunk_size: int = None):
     assert len(src.shape) == 1
     dims = np.arange(src.shape[0])
     for i in range(src.shape[0]):
         valid_dims = np.setdiff1d(dims, i)
-        g = src.proj(valid_dims).grid(r)
-        data = np.zeros((g.shape[0], src.shape[0] * 2, 2), dtype=float)
-        # set this dimension inf related boundary
-        data[:, valid_dims, :] = g
-        data[:, i, :] = src.inf[i]
-        # set this dimension sup related boundary
-        data[:, valid_dims + src.shape[0], :] = g
-        data[:, i + src.shape[0], :] = src.sup[i]
-        data = data.reshape((-1, src.shape[0], 2))
-        bd.append([Interval(cur_data[:, 0], cur_data[:, 1]) for cur_data in data])
+        for g in src.proj(valid_dims).grid_chunks(r, chunk_size):
+            data = np.zeros((g.shape[0], src.shape[0] * 2, 2), dtype=float)
+            # set this dimension inf related boundary
+            data[:, valid_dims, :] = g
+            data[:, i, :] = src.inf[i]
+            # set this dimension sup related boundary
+            data[:, valid_dims + src.shape[0], :] = g
+            data[:, i + src.shape[0], :] = src.sup[i]
+            data = data.reshape((-1, src.shape[0], 2))
+            yield IntervalSet(data[..., 0], data[..., 1])
 
-    return list(chain.from_iterable(bd))
+
+def _interval2interval(src: Interval, r: float):
+    return IntervalSet.concatenate(list(_interval2interval_chunks(src, r)))
 
 
 def _interval2polytope(src: Interval, r: float):
-    bound_boxes = _interval2interval(src, r)
-    return [cvt2(box, Geometry.TYPE.POLYTOPE) for box in bound_boxes]
+    return _interval2interval(src, r).to_polytopes()
 
 
 def _interval2zonotope(src: Interval, r: float):
-    bd_intervals = _interval2interval(src, r)
-    return [cvt2(interval, Geometry.TYPE.ZONOTOPE) for interval in bd_intervals]
+    return _interval2interval(src, r).to_zonotopes()
 
 
 # def _polytope2interval(src: Polytope, r: float):
@@ -92,26 +89,19 @@ def _polytope2interval(src: Polytope, r: float):
 
     realpaver.set_branch(precision=r)
     boxes = realpaver.solve()
-    bound_boxes = []
-    for b in boxes:
-        if b[0] == "OUTER":
-            bound_boxes.append((b[2]))
-    return bound_boxes
+    return IntervalSet.from_intervals([b[2] for b in boxes if b[0] == "OUTER"], num_var)
 
 
 def _polytope2polytope(src: Polytope, r: float):
-    bound_boxes = _polytope2interval(src, r)
-    return [cvt2(box, Geometry.TYPE.POLYTOPE) for box in bound_boxes]
+    return _polytope2interval(src, r).to_polytopes()
 
 
 def _polytope2zonotope(src: Polytope, r: float):
-    boxes = _polytope2interval(src, r)
-    return [cvt2(box, Geometry.TYPE.ZONOTOPE) for box in boxes]
+    return _polytope2interval(src, r).to_zonotopes()
 
 
 def _zonotope2zonotope_new(src: Zonotope, r: float):
-    bound_boxes = _zonotope2interval(src, r)
-    return [cvt2(box, Geometry.TYPE.ZONOTOPE) for box in bound_boxes]
+    return _zonotope2interval(src, r).to_zonotopes()
 
 
 def _zonotope2zonotope(src: Zonotope, r: float):
@@ -187,8 +177,7 @@ def _zonotope2interval(src: Zonotope, r: float):
 
 
 def _zonotope2polytope(src: Zonotope, r: float):
-    bound_boxes = _zonotope2interval(src, r)
-    return [cvt2(box, Geometry.TYPE.POLYTOPE) for box in bound_boxes]
+    return _zonotope2interval(src, r).to_polytopes()
 
 
 def boundary(src: Geometry.Base, r: float, elem: Geometry.TYPE):
@@ -213,3 +202,24 @@ def boundary(src: Geometry.Base, r: float, elem: Geometry.TYPE):
         return _zonotope2zonotope_new(src, r)
     else:
         raise NotImplementedError
+
+
+def boundary_chunks(src: Geometry.Base, r: float, elem: Geometry.TYPE, chunk_size: int = None):
+    """
+    lazily generate the same boundary as boundary, chunk by chunk, the boundary of intervals is generated on the fly
+    face by face, the one of polytopes and zonotopes is paved at once by realpaver and then split into chunks
+    :param src: geometry object
+    :param r: max width of the boxes covering the boundary
+    :param elem: type of the boundary elements
+    :param chunk_size: max number of boxes per chunk, Interval.GRID_CHUNK_SIZE if not given, chunks of the boundary of
+    intervals hold up to twice as many, one box per cell of a face and of the opposite one
+    :return: generator of IntervalSet for intervals, lists of geometry objects otherwise
+    """
+    if src.type == Geometry.TYPE.INTERVAL:
+        boxes = _interval2interval_chunks(src, r, chunk_size)
+    else:
+        chunk_size = Interval.GRID_CHUNK_SIZE if chunk_size is None else chunk_size
+        bound = boundary(src, r, Geometry.TYPE.INTERVAL)
+        boxes = (bound[start: start + chunk_size] for start in range(0, len(bound), chunk_size))
+    for chunk in boxes:
+        yield cvt2(chunk, elem)
@@ -147,11 +147,39 @@ def _cvt_from_geometry(src: Geometry.Base, target: Geometry.TYPE):
         raise NotImplementedError
 
 
+def _cvt_from_interval_set(src: IntervalSet, target: Geometry.TYPE):
+    # every box is converted, the set itself is kept for intervals
+    if target == Geometry.TYPE.INTERVAL:
+        return src
+    elif target == Geometry.TYPE.POLYTOPE:
+        return src.to_polytopes()
+    elif target == Geometry.TYPE.ZONOTOPE:
+        return src.to_zonotopes()
+    else:
+        raise NotImplementedError
+
+
+def _cvt_from_zonotope_batch(src: ZonotopeBatch, target: Geometry.TYPE):
+    # interval hulls are vectorized, the other conversions go zonotope by zonotope
+    if target == Geometry.TYPE.INTERVAL:
+        return src.interval_hull()
+    elif target == Geometry.TYPE.ZONOTOPE:
+        return src
+    elif target == Geometry.TYPE.POLYTOPE:
+        return [_zonotope2polytope(z) for z in src]
+    else:
+        raise NotImplementedError
+
+
 def cvt2(src, target: Geometry.TYPE):
     if src is None:
         return src
     elif isinstance(src, np.ndarray):
         return _cvt_from_vertices(src, target)
+    elif isinstance(src, IntervalSet):
+        return _cvt_from_interval_set(src, target)
+    elif isinstance(src, ZonotopeBatch):
+        return _cvt_from_zonotope_batch(src, target)
     elif isinstance(src, Geometry.Base):
         return _cvt_from_geometry(src, target)
     else:
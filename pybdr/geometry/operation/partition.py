@@ -4,43 +4,16 @@ from .convert import cvt2
 
 
 def __interval2interval(src: Interval, r: float):
-    def __ll2arr(ll, fill_value: float):
-        lens = [lst.shape[0] for lst in ll]
-        max_len = max(lens)
-        mask = np.arange(max_len) < np.array(lens)[:, None]
-        arr = np.ones((len(lens), max_len, 2), dtype=float) * fill_value
-        arr[mask] = np.concatenate(ll)
-        return arr, mask
-
-    def __get_seg(dim_idx: int, seg_num: int):
-        if seg_num <= 1:
-            return np.array([src.inf[dim_idx], src.sup[dim_idx]], dtype=float).reshape(
-                (1, -1)
-            )
-        else:
-            samples = np.linspace(src.inf[dim_idx], src.sup[dim_idx], num=seg_num + 1)
-            this_segs = np.zeros((seg_num, 2), dtype=float)
-            this_segs[:, 0] = samples[:-1]
-            this_segs[:, 1] = samples[1:]
-            return this_segs
-
-    assert len(src.shape) == 1
-    nums = np.floor((src.sup - src.inf) / r).astype(dtype=int) + 1
-    segs, _ = __ll2arr([__get_seg(i, nums[i]) for i in range(src.shape[0])], np.nan)
-    idx_list = [np.arange(nums[i]) for i in range(src.shape[0])]
-    ext_idx = np.array(np.meshgrid(*idx_list)).T.reshape((-1, len(idx_list)))
-    aux_idx = np.tile(np.arange(src.shape[0]), ext_idx.shape[0])
-    bounds = segs[aux_idx, ext_idx.reshape(-1)].reshape((-1, src.shape[0], 2))
-    return [Interval(bound[:, 0], bound[:, 1]) for bound in bounds]
+    bounds = src.grid(r)
+    return IntervalSet(bounds[..., 0], bounds[..., 1])
 
 
 def __interval2zonotope(src: Interval, r: float):
-    parts = __interval2interval(src, r)
-    return [cvt2(part, Geometry.TYPE.ZONOTOPE) for part in parts]
+    return __interval2interval(src, r).to_zonotopes()
 
 
 def __zonotope2interval(src: Interval, r: float):
-    return [cvt2(zono, Geometry.TYPE.INTERVAL) for zono in __zonotope2zonotope(src, r)]
+    return IntervalSet.from_zonotopes(__zonotope2zonotope(src, r), src.shape)
 
 
 def __zonotope2zonotope(src: Zonotope, r: float):
@@ -157,3 +130,22 @@ def partition(src: Geometry.Base, r: float, elem: Geometry.TYPE):
         return __zonotope2zonotope(src, r)
     else:
         raise NotImplementedError
+
+
+def partition_chunks(src: Geometry.Base, r: float, elem: Geometry.TYPE, chunk_size: int = None):
+    """
+    lazily generate the same parts as partition, chunk by chunk, the parts of intervals are generated on the fly
+    :param src: geometry object to partition
+    :param r: max width of the parts
+    :param elem: type of the parts
+    :param chunk_size: max number of parts per chunk, Interval.GRID_CHUNK_SIZE if not given
+    :return: generator of IntervalSet for intervals, lists of geometry objects otherwise
+    """
+    chunk_size = Interval.GRID_CHUNK_SIZE if chunk_size is None else chunk_size
+    if src.type == Geometry.TYPE.INTERVAL and elem in {Geometry.TYPE.INTERVAL, Geometry.TYPE.ZONOTOPE}:
+        for bounds in src.grid_chunks(r, chunk_size):
+            yield cvt2(IntervalSet(bounds[..., 0], bounds[..., 1]), elem)
+    else:
+        parts = partition(src, r, elem)
+        for start in range(0, len(parts), chunk_size):
+            yield parts[start: start + chunk_size]
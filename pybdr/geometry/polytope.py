@@ -10,6 +10,7 @@ from scipy.spatial import ConvexHull
 from .geometry import Geometry
 
 if TYPE_CHECKING:
+    from .interval import Interval
     from .zonotope import Zonotope
 
 
@@ -83,30 +84,29 @@ class Polytope(Geometry.Base):
         def __contains_pts(pts: np.ndarray):
             assert pts.ndim == 1 or pts.ndim == 2
             if pts.ndim == 1:
-                if self.dim != pts.shape[0]:
+                if self.shape != pts.shape[0]:
                     return False
-                return self._a @ pts <= self._b
+                return np.all(self._a @ pts <= self._b)
             elif pts.ndim == 2:
-                if self.dim != pts.shape[1]:
+                if self.shape != pts.shape[1]:
                     return np.full(pts.shape[0], False, dtype=bool)
-                return self._a[None, :, :] @ pts[:, :, None] <= self._b
+                return np.all(pts @ self._a.T <= self._b, axis=-1)
             else:
                 raise NotImplementedError
 
+        def __contains_interval(other: Interval):
+            # upper bounds of the box along all the normals of the half-spaces at once
+            return np.all(self._a @ other.c + abs(self._a) @ other.rad <= self._b)
+
         def __contains_zonotope(other: Zonotope):
-            # check all half-spaces bounding this given zonotope
-            for i in range(self._a.shape[0]):
-                b, _ = other.support_func(self._a[i].reshape((1, -1)), "u")
-                if b > self._b[i]:
-                    return False
-            return True
+            # upper bounds of the zonotope along all the normals of the half-spaces at once
+            return np.all(other.support_func(self._a, "u")[0] <= self._b)
 
         if isinstance(item, np.ndarray):
             return __contains_pts(item)
         elif isinstance(item, Geometry.Base):
             if item.type == Geometry.TYPE.INTERVAL:
-                # TODO
-                raise NotImplementedError
+                return __contains_interval(item)
             elif item.type == Geometry.TYPE.POLYTOPE:
                 # TODO
                 raise NotImplementedError
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 from enum import IntEnum
+from functools import lru_cache
 from numbers import Real
 from typing import TYPE_CHECKING
 
 import numpy as np
 from numpy.typing import ArrayLike
-from scipy.linalg import block_diag
+from scipy.linalg import block_diag, qr
 import pybdr.util.functional.auxiliary as aux
+from pybdr.util.functional.sparse_tensor import SparseTensor
 from .geometry import Geometry
 
 if TYPE_CHECKING:  # for type hint, easy coding :)
@@ -17,7 +19,11 @@ if TYPE_CHECKING:  # for type hint, easy coding :)
 class Zonotope(Geometry.Base):
     class METHOD:
         class REDUCE(IntEnum):
-            GIRARD = 0
+            GIRARD = 0  # box the generators with the smallest 1-norm minus inf-norm
+            COMBASTEL = 1  # box the shortest generators
+            PCA = 2  # box the picked generators in the frame of their principal components
+            ALTHOFF = 3  # box the picked generators in the frame of their dominant linearly independent ones
+            SCOTT = 4  # absorb the picked generators into a basis of generators instead of adding a box
 
     REDUCE_METHOD = METHOD.REDUCE.GIRARD
     ORDER = 50
@@ -254,7 +260,14 @@ class Zonotope(Geometry.Base):
         return Zonotope(np.zeros(dim), np.zeros((dim, gen_num)))
 
     # =============================================== private method
-    def _picked_gen(self) -> (np.ndarray, np.ndarray):
+    def _picked_gen(self, order: int, score=None) -> (np.ndarray, np.ndarray):
+        """
+        split the generators into the ones kept and the ones to reduce
+        :param order: order of the reduced zonotope
+        :param score: function of the generator matrix giving the score of every generator, the ones with the
+        smallest scores are reduced, the 1-norm minus the inf-norm of Girard if not given
+        :return: unreduced and reduced generators
+        """
         gur = np.empty((self.shape, 0), dtype=float)
         gr = np.empty((self.shape, 0), dtype=float)
 
@@ -263,18 +276,22 @@ class Zonotope(Geometry.Base):
             self.remove_zero_gen()
             dim, gen_num = self.shape, self.gen_num
             # only reduce if zonotope order is greater than the desired order
-            if gen_num > dim * self.ORDER:
+            if gen_num > dim * order:
                 # compute metric of generators
-                h = np.linalg.norm(self.gen, ord=1, axis=0) - np.linalg.norm(
-                    self.gen, ord=np.inf, axis=0
-                )
+                if score is None:
+                    h = np.linalg.norm(self.gen, ord=1, axis=0) - np.linalg.norm(
+                        self.gen, ord=np.inf, axis=0
+                    )
+                else:
+                    h = score(self.gen)
                 # number of generators that are not reduced
-                num_ur = np.floor(self.shape * (self.ORDER - 1)).astype(dtype=int)
+                num_ur = np.floor(self.shape * (order - 1)).astype(dtype=int)
                 # number of generators that are reduced
                 num_r = self.gen_num - num_ur
 
-                # pick generators with smallest h values to be reduced
-                idx_r = np.argpartition(h, num_r)[:num_r]
+                # pick generators with smallest h values to be reduced, ties go to the first ones as in
+                # ZonotopeBatch.reduce
+                idx_r = np.argsort(h, kind="stable")[:num_r]
                 gr = self.gen[:, idx_r]
                 # unreduced generators
                 idx_ur = np.setdiff1d(np.arange(self.gen_num), idx_r)
@@ -351,9 +368,22 @@ class Zonotope(Geometry.Base):
             raise NotImplementedError
 
     def reduce(self, method: REDUCE_METHOD, order: int):
+        def __box(t: np.ndarray, gr: np.ndarray):
+            # generators t diag(|t^-1 gr| 1) of the box enclosing gr in the frame of the basis t
+            return t * abs(np.linalg.solve(t, gr)).sum(axis=1)
+
+        def __independent(g: np.ndarray):
+            # indices of the dominant linearly independent columns of g by QR with column pivoting, None if g has
+            # not full row rank
+            r, piv = qr(g, mode="r", pivoting=True)
+            d = abs(np.diag(r[:, : self.shape]))
+            if d.shape[0] < self.shape or d[-1] <= d[0] * 1e-10:
+                return None
+            return piv[: self.shape]
+
         def __reduce_girard():
             # pick generators to reduce
-            gur, gr = self._picked_gen()
+            gur, gr = self._picked_gen(order)
             # box remaining generators
             d = np.sum(abs(gr), axis=1)
             d[abs(d) < 0] = 0
@@ -363,8 +393,65 @@ class Zonotope(Geometry.Base):
             # build reduced zonotope
             return Zonotope(self.c, np.hstack([gur, gb]))
 
-        if self.REDUCE_METHOD == Zonotope.METHOD.REDUCE.GIRARD:
+        def __reduce_combastel():
+            # Combastel, C. (2003). A state bounding observer based on zonotopes. ECC
+            gur, gr = self._picked_gen(order, lambda g: np.linalg.norm(g, axis=0))
+            gb = np.diag(np.sum(abs(gr), axis=1)) if gr.shape[1] > 0 else gr
+            return Zonotope(self.c, np.hstack([gur, gb]))
+
+        def __reduce_pca():
+            # Kopetzki, A. K., Schuermann, B., Althoff, M. (2017). Methods for order reduction of zonotopes. CDC
+            gur, gr = self._picked_gen(order)
+            if gr.shape[1] <= 0:
+                return Zonotope(self.c, gur)
+            # the reduced generators are symmetric around the origin, so their covariance is gr gr^T up to a factor
+            u, _, _ = np.linalg.svd(gr @ gr.T)
+            return Zonotope(self.c, np.hstack([gur, u * abs(u.T @ gr).sum(axis=1)]))
+
+        def __reduce_althoff():
+            # Althoff, M., Stursberg, O., Buss, M. (2008). Reachability analysis of nonlinear systems with uncertain
+            # parameters using conservative linearization. CDC, method A
+            gur, gr = self._picked_gen(order)
+            if gr.shape[1] <= 0:
+                return Zonotope(self.c, gur)
+            idx = __independent(gr)
+            if idx is None:
+                return __reduce_girard()
+            return Zonotope(self.c, np.hstack([gur, __box(gr[:, idx], gr)]))
+
+        def __reduce_scott():
+            # Scott, J. K., Raimondo, D. M., Marseglia, G. R., Braatz, R. D. (2016). Constrained zonotopes: A new tool
+            # for set-based estimation and fault detection. Automatica
+            self.remove_zero_gen()
+            num_r = self.gen_num - self.shape * order
+            if num_r <= 0:
+                return Zonotope(self.c, self.gen)
+            idx = __independent(self.gen)
+            if idx is None:
+                return __reduce_girard()
+            # the other generators in the frame of the basis t, boxing one of them scales the basis generators by
+            # the magnitudes of its coordinates, so the ones growing the basis the least are absorbed
+            t = self.gen[:, idx]
+            mask = np.ones(self.gen_num, dtype=bool)
+            mask[idx] = False
+            rest = self.gen[:, mask]
+            v = np.linalg.solve(t, rest)
+            h = np.linalg.norm(t, axis=0) @ abs(v)
+            absorb = np.zeros(rest.shape[1], dtype=bool)
+            absorb[np.argpartition(h, num_r - 1)[:num_r]] = True
+            t = t * (1 + abs(v[:, absorb]).sum(axis=1))
+            return Zonotope(self.c, np.hstack([rest[:, ~absorb], t]))
+
+        if method == Zonotope.METHOD.REDUCE.GIRARD:
             return __reduce_girard()
+        elif method == Zonotope.METHOD.REDUCE.COMBASTEL:
+            return __reduce_combastel()
+        elif method == Zonotope.METHOD.REDUCE.PCA:
+            return __reduce_pca()
+        elif method == Zonotope.METHOD.REDUCE.ALTHOFF:
+            return __reduce_althoff()
+        elif method == Zonotope.METHOD.REDUCE.SCOTT:
+            return __reduce_scott()
         else:
             raise NotImplementedError
 
@@ -453,37 +540,46 @@ class Zonotope(Geometry.Base):
         else:
             raise NotImplementedError
 
-    def quad_map(self, q: [np.ndarray], rz: Zonotope = None):
+    def quad_map(self, q: [np.ndarray | SparseTensor], rz: Zonotope = None):
+        # the quadratic forms are handled as one sparse tensor w.r.t. the stacked variables, so only the nonzero
+        # entries of the possibly very sparse hessians are touched
+        q = SparseTensor.block_diag(
+            [iq if isinstance(iq, SparseTensor) else SparseTensor.from_dense(iq) for iq in q]
+        )
+        dim_q = q.shape[0]
+        rows, cols0, cols1 = q.coords
+        vals = np.asarray(q.values)
+        # structurally zero slices are skipped, only the rows with nonzero entries are contracted
+        nz = vals != 0
+        rows, cols0, cols1, vals = rows[nz], cols0[nz], cols1[nz], vals[nz]
+        num_noz = np.unique(rows).size
+
         def _xTQx():
-            dim_q = q[0].shape[0]
-            c = np.zeros(dim_q)
-            gen_num = int(0.5 * (self.gen_num ** 2 + self.gen_num)) + self.gen_num
-            gens = self.gen_num
-            gen = np.zeros((dim_q, gen_num))
+            # x.T @ q[i] @ x only depends on the symmetric part of q[i], whose entries (j, k) and (k, j) are merged
+            # into the upper triangle with half the weight, so that z.T @ q[i] @ z = u + u.T with u computed from the
+            # upper triangle only
+            lo, hi = np.minimum(cols0, cols1), np.maximum(cols0, cols1)
+            keys, inv = np.unique(np.ravel_multi_index((rows, lo, hi), q.shape), return_inverse=True)
+            half = np.bincount(inv.reshape(-1), weights=0.5 * vals, minlength=keys.size)
+            u_rows, u_lo, u_hi = np.unravel_index(keys, q.shape)
 
+            gens = self.gen_num
+            c = np.zeros(dim_q)
+            gen = np.zeros((dim_q, int(0.5 * (gens ** 2 + gens)) + gens))
             z = self.z
-
-            # count empty matrices
-            q_noz = np.zeros(dim_q, dtype=bool)
-
-            # for each dimension, compute generator elements
-            for i in range(dim_q):
-                q_noz[i] = np.any([np.any(iq[i]) for iq in q])
-                if q_noz[i]:
-                    # pure quadratic evaluation
-                    qi = block_diag(*[iq[i] for iq in q])
-                    quad_mat = z.T @ qi @ z
-                    # faster method diag elements
-                    gen[i, :gens] = 0.5 * np.diag(quad_mat[1: gens + 1, 1: gens + 1])
-                    # center
-                    c[i] = quad_mat[0, 0] + np.sum(gen[i, 0:gens])
-                    # off-diagonal elements added, pick via logical indexing
-                    quad_mat_off_diag = quad_mat + quad_mat.T
-                    k_ind = np.tril(np.ones((gens + 1, gens + 1), dtype=bool), -1)
-                    gen[i, gens:] = quad_mat_off_diag[k_ind]
+            a, b = z[u_lo] * half[:, None], z[u_hi]
+            # u + u.T of all the dimensions at once, as one product of the stacked factors
+            i, quad_mat = _batched_quad(np.concatenate([u_rows, u_rows]), np.vstack([a, b]), np.vstack([b, a]))
+            diag = np.diagonal(quad_mat, axis1=1, axis2=2)
+            # faster method diag elements
+            gen[i, :gens] = 0.5 * diag[:, 1:]
+            # center
+            c[i] = diag[:, 0] + np.sum(gen[i, :gens], axis=1)
+            # off-diagonal elements added, picked by the cached indices of the lower triangle
+            gen[i, gens:] = 2 * np.take(quad_mat.reshape((i.size, (gens + 1) ** 2)), _tril_indices(gens + 1), axis=1)
 
             # generate new zonotope
-            if np.sum(q_noz) <= 1:
+            if num_noz <= 1:
                 return Zonotope(c, np.sum(abs(gen), axis=1).reshape((-1, 1)))
             else:
                 z = Zonotope(c, gen)
@@ -493,25 +589,14 @@ class Zonotope(Geometry.Base):
         def _x1TQx2():
             z_mat1 = self.z
             z_mat2 = rz.z
-            dim_q = q[0].shape[0]
 
             # init solution (center + generator matrix)
             z = np.zeros((dim_q, z_mat1.shape[1] * z_mat2.shape[1]))
-
-            # count empty matrices
-            q_noz = np.zeros(dim_q, dtype=bool)
-
-            # for each dimension, compute center + generator elements
-            for i in range(dim_q):
-                q_noz[i] = np.any([np.any(iq[i]) for iq in q])
-                if q_noz[i]:
-                    # pure quadratic evaluation
-                    qi = block_diag(*[iq[i] for iq in q])
-                    quad_mat = z_mat1.T @ qi @ z_mat2
-                    z[i] = quad_mat.reshape(-1)
+            i, u = _batched_quad(rows, z_mat1[cols0], vals[:, None] * z_mat2[cols1])
+            z[i] = u.reshape((i.size, z.shape[1]))
 
             # generate new zonotope
-            if np.sum(q_noz) <= 1:
+            if num_noz <= 1:
                 return Zonotope(z[:, 0], np.sum(abs(z[:, 1:]), axis=1).reshape((-1, 1)))
             else:
                 zono = Zonotope(z[:, 0], z[:, 1:])
@@ -522,21 +607,54 @@ class Zonotope(Geometry.Base):
 
     def support_func(self, direction: np.ndarray, bound_type: str = "u"):
         """
-        calculates the upper or lower bound of this zonotope along given direction
+        calculates the upper or lower bounds of this zonotope along given directions, all at once
+        :param direction: one direction of shape (dim,) or k directions stacked as rows of shape (k, dim)
         :param bound_type: type of the calculation, "u" for upper bound, "l" for lower bound
-        :param dir: given direction in numpy ndarray format
-        :return:
-
-        # TODO speed up this function !!!!!!!!!!
+        :return: bounds of shape () or (k,), and the factors of the generators reaching them of shape (gen_num,) or
+        (k, gen_num)
         """
-        proj_zono = direction @ self
-        c, g = proj_zono.c, proj_zono.gen
+        g = direction @ self.gen
+        r = np.sum(abs(g), axis=-1)
         if bound_type == "u":
-            val = c + np.sum(abs(g))
+            val = direction @ self.c + r
             fac = np.sign(g)
         elif bound_type == "l":
-            val = c - np.sum(abs(g))
+            val = direction @ self.c - r
             fac = -np.sign(g)
         else:
             raise NotImplementedError
         return val, fac
+
+    def to_template_polytope(self, directions: np.ndarray):
+        """
+        over-approximate this zonotope by the polytope bounded by half-spaces of given normals
+        :param directions: normals of the half-spaces of shape (k, dim)
+        :return: polytope directions @ x <= upper bounds of this zonotope along the directions
+        """
+        from .polytope import Polytope
+
+        directions = np.asarray(directions, dtype=float)
+        return Polytope(directions, self.support_func(directions, "u")[0])
+
+
+@lru_cache(maxsize=64)
+def _tril_indices(n: int) -> np.ndarray:
+    # flat indices of the strictly lower triangle of a n by n matrix, row by row, cached per generator count
+    t0, t1 = np.tril_indices(n, -1)
+    return t0 * n + t1
+
+
+def _batched_quad(rows: np.ndarray, a: np.ndarray, b: np.ndarray) -> (np.ndarray, np.ndarray):
+    # a[rows == i].T @ b[rows == i] for every row i with entries, as one batched product over the entries of the
+    # rows padded to the same number
+    order = np.argsort(rows, kind="stable")
+    rows, a, b = rows[order], a[order], b[order]
+    i, start, count = np.unique(rows, return_index=True, return_counts=True)
+    inv = np.repeat(np.arange(i.size), count)
+    pos = np.arange(rows.size) - np.repeat(start, count)
+    num = count.max(initial=0)
+    pa = np.zeros((i.size, a.shape[1], num))
+    pb = np.zeros((i.size, num, b.shape[1]))
+    pa[inv, :, pos] = a
+    pb[inv, pos] = b
+    return i, np.matmul(pa, pb)
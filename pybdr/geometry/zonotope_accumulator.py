@@ -0,0 +1,118 @@
+"""
+Mutable zonotope for chains of Minkowski sums. Zonotope is immutable, so every sum a + b + c + ... stacks the
+generator matrices again and long chains copy the generators quadratically often. Here the generators live in a
+buffer whose capacity doubles when full, a sum only writes the new generators behind the used ones, and freeze
+hands the result over as an ordinary Zonotope, e.g. to reduce it.
+"""
+
+from __future__ import annotations
+
+from numbers import Real
+
+import numpy as np
+
+from .geometry import Geometry
+from .zonotope import Zonotope
+
+
+class ZonotopeAccumulator:
+    """
+    zonotope summed up in place, the generators are appended in the order of the sums, so freezing gives the same
+    zonotope as the chain of sums of Zonotope
+    """
+
+    MIN_CAPACITY = 16
+
+    def __init__(self, z: Zonotope, capacity: int = None):
+        """
+        :param z: initial zonotope, it is copied and never modified
+        :param capacity: initial number of generators the buffer holds, grown on demand
+        """
+        assert isinstance(z, Zonotope)
+        capacity = max(z.gen_num, self.MIN_CAPACITY if capacity is None else capacity)
+        self._c = np.array(z.c, dtype=float)
+        # columns are contiguous, so appending generators copies whole blocks of memory
+        self._buf = np.empty((z.c.shape[0], capacity), dtype=float, order="F")
+        self._buf[:, : z.gen_num] = z.gen
+        self._num = z.gen_num
+
+    @staticmethod
+    def zero(dim: int, capacity: int = None) -> ZonotopeAccumulator:
+        return ZonotopeAccumulator(Zonotope.zero(dim), capacity)
+
+    # =============================================== property
+    @property
+    def c(self) -> np.ndarray:
+        return self._c
+
+    @property
+    def gen(self) -> np.ndarray:
+        # view of the used part of the buffer, valid until the next sum
+        return self._buf[:, : self._num]
+
+    @property
+    def shape(self) -> int:
+        return self._c.shape[0]
+
+    @property
+    def gen_num(self) -> int:
+        return self._num
+
+    @property
+    def capacity(self) -> int:
+        return self._buf.shape[1]
+
+    # =============================================== operator
+    def __iadd__(self, other):
+        if isinstance(other, (np.ndarray, Real)):
+            self._c += other
+        elif isinstance(other, ZonotopeAccumulator):
+            self._c += other.c
+            self._append(other.gen)
+        elif isinstance(other, Geometry.Base):
+            if other.type == Geometry.TYPE.ZONOTOPE:
+                self._c += other.c
+                self._append(other.gen)
+            elif other.type == Geometry.TYPE.INTERVAL:
+                self._c += other.c
+                self._append(np.diag(other.rad))
+            else:
+                raise NotImplementedError
+        else:
+            raise NotImplementedError
+        return self
+
+    def __isub__(self, other):
+        if isinstance(other, (np.ndarray, Real)):
+            self._c -= other
+            return self
+        raise NotImplementedError
+
+    def __str__(self):
+        return "ZonotopeAccumulator of {} generators in {}d, capacity {}".format(
+            self._num, self.shape, self.capacity
+        )
+
+    # =============================================== private method
+    def _append(self, gen: np.ndarray):
+        assert gen.ndim == 2 and gen.shape[0] == self.shape
+        num = self._num + gen.shape[1]
+        if num > self.capacity:
+            # doubled, or grown to the sum if that is not enough, e.g. from no capacity at all
+            buf = np.empty((self.shape, max(num, 2 * self.capacity)), dtype=float, order="F")
+            buf[:, : self._num] = self.gen
+            self._buf = buf
+        self._buf[:, self._num: num] = gen
+        self._num = num
+
+    # =============================================== public method
+    def freeze(self) -> Zonotope:
+        """
+        the accumulated zonotope, its generators are the used part of the buffer without copying, later sums only
+        write behind them or into a new buffer, so summing further does not change it
+        :return: zonotope with the center and the generators summed so far
+        """
+        return Zonotope(self._c.copy(), self.gen)
+
+    def reduce(self, method: Zonotope.METHOD.REDUCE, order: int) -> Zonotope:
+        return self.freeze().reduce(method, order)
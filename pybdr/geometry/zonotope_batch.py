@@ -0,0 +1,272 @@
+"""
+Batch of zonotopes of the same dimension stored as stacked arrays, the centers of shape (N, dim) and the generators
+of shape (N, dim, m) padded with zero columns up to the largest number of generators m, with the number of
+generators of every zonotope kept aside. Partitions, boundaries and the sets of parallel analyses are lists of
+zonotopes alike, here their maps, sums, hulls and reductions run vectorized over all of them at once.
+"""
+
+from __future__ import annotations
+
+from numbers import Real
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .interval_set import IntervalSet
+from .polytope import Polytope
+from .zonotope import Zonotope
+
+
+def _compact(gen: np.ndarray, mask: np.ndarray) -> (np.ndarray, np.ndarray):
+    # move the generators selected by the mask to the front keeping their order, and cut the padding to the largest
+    # number of selected generators
+    order = np.argsort(~mask, axis=1, kind="stable")
+    counts = mask.sum(axis=1)
+    m = counts.max(initial=0)
+    gen = np.take_along_axis(gen, order[:, None, :m], axis=2)
+    return np.where((np.arange(m) < counts[:, None])[:, None, :], gen, 0), counts
+
+
+class ZonotopeBatch:
+    """
+    set of N zonotopes <c[i], gen[i, :, :gen_nums[i]]>, it behaves as a sequence of Zonotope, i.e. len, iteration
+    and indexing by an integer give single zonotopes, indexing by slices, masks or index arrays give sub-batches
+    """
+
+    __array_ufunc__ = None  # so that matrix @ batch reaches __rmatmul__
+
+    def __init__(self, c: ArrayLike, gen: ArrayLike, gen_nums: ArrayLike = None):
+        """
+        :param c: centers of shape (N, dim)
+        :param gen: generators of shape (N, dim, m), the columns beyond the number of generators of a zonotope are
+        zeros
+        :param gen_nums: number of generators of every zonotope, m for all of them if not given
+        """
+        c = np.asarray(c, dtype=float)
+        gen = np.asarray(gen, dtype=float)
+        assert c.ndim == 2 and gen.ndim == 3 and gen.shape[:2] == c.shape
+        gen_nums = np.full(c.shape[0], gen.shape[2]) if gen_nums is None else np.asarray(gen_nums, dtype=int)
+        assert gen_nums.shape == (c.shape[0],) and np.all((gen_nums >= 0) & (gen_nums <= gen.shape[2]))
+        self._c = c
+        self._gen = gen
+        self._gen_nums = gen_nums
+
+    @classmethod
+    def from_zonotopes(cls, zonos: [Zonotope], dim: int = None) -> ZonotopeBatch:
+        """
+        stack single zonotopes into a batch
+        :param zonos: zonotopes of the same dimension
+        :param dim: dimension of the zonotopes, needed if there are none
+        :return: batch of given zonotopes
+        """
+        if len(zonos) <= 0:
+            assert dim is not None
+            return cls(np.zeros((0, dim)), np.zeros((0, dim, 0)))
+        gen_nums = np.array([z.gen_num for z in zonos])
+        gen = np.zeros((len(zonos), zonos[0].shape, gen_nums.max()))
+        for i, z in enumerate(zonos):
+            gen[i, :, : z.gen_num] = z.gen
+        return cls(np.stack([z.c for z in zonos]), gen, gen_nums)
+
+    @classmethod
+    def from_interval_set(cls, boxes: IntervalSet) -> ZonotopeBatch:
+        return cls(*boxes.zonotopes())
+
+    # =============================================== property
+    @property
+    def c(self) -> np.ndarray:
+        return self._c
+
+    @property
+    def gen(self) -> np.ndarray:
+        return self._gen
+
+    @property
+    def gen_nums(self) -> np.ndarray:
+        return self._gen_nums
+
+    @property
+    def shape(self) -> int:
+        return self._c.shape[1]
+
+    @property
+    def max_gen_num(self) -> int:
+        return self._gen.shape[2]
+
+    @property
+    def nbytes(self) -> int:
+        return self._c.nbytes + self._gen.nbytes + self._gen_nums.nbytes
+
+    # =============================================== sequence of zonotopes
+    def __len__(self):
+        return self._c.shape[0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return Zonotope(self._c[item], self._gen[item, :, : self._gen_nums[item]])
+        gen_nums = self._gen_nums[item]
+        return ZonotopeBatch(self._c[item], self._gen[item, :, : gen_nums.max(initial=0)], gen_nums)
+
+    def __str__(self):
+        return "ZonotopeBatch of {} zonotopes in {}d, at most {} generators".format(
+            len(self), self.shape, self.max_gen_num
+        )
+
+    # =============================================== operator
+    def __add__(self, other):
+        if isinstance(other, (np.ndarray, Real)):
+            # one translation for all the zonotopes, or one per zonotope
+            return ZonotopeBatch(self._c + other, self._gen, self._gen_nums)
+        elif isinstance(other, Zonotope):
+            other = ZonotopeBatch(other.c[None], other.gen[None])
+        elif not isinstance(other, ZonotopeBatch):
+            raise NotImplementedError
+        # Minkowski sums item by item, the generators of other follow the ones of this batch
+        n, m0, m1 = len(self), self.max_gen_num, other.max_gen_num
+        gen = np.concatenate([self._gen, np.broadcast_to(other.gen, (n, self.shape, m1))], axis=2)
+        mask = np.concatenate(
+            [np.arange(m0) < self._gen_nums[:, None], np.arange(m1) < np.broadcast_to(other.gen_nums, n)[:, None]],
+            axis=1,
+        )
+        return ZonotopeBatch(self._c + other.c, *_compact(gen, mask))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        if isinstance(other, (np.ndarray, Real)):
+            return self + (-other)
+        raise NotImplementedError
+
+    def __neg__(self):
+        return ZonotopeBatch(-self._c, -self._gen, self._gen_nums)
+
+    def __mul__(self, other):
+        if isinstance(other, Real):
+            return ZonotopeBatch(self._c * other, self._gen * other, self._gen_nums)
+        raise NotImplementedError
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rmatmul__(self, other):
+        """
+        linear maps of the zonotopes
+        :param other: one matrix of shape (k, dim) for all the zonotopes, or one per zonotope of shape (N, k, dim)
+        :return: batch of the mapped zonotopes in k dimensions
+        """
+        if isinstance(other, np.ndarray):
+            c = np.matmul(other, self._c[:, :, None])[:, :, 0]
+            return ZonotopeBatch(c, np.matmul(other, self._gen), self._gen_nums)
+        raise NotImplementedError
+
+    # =============================================== public method
+    def proj(self, dims) -> ZonotopeBatch:
+        return ZonotopeBatch(self._c[:, dims], self._gen[:, dims], self._gen_nums)
+
+    def interval_hull(self) -> IntervalSet:
+        """
+        boxes enclosing the zonotopes
+        :return: set of N boxes
+        """
+        r = abs(self._gen).sum(axis=2)
+        return IntervalSet(self._c - r, self._c + r)
+
+    def support_func(self, directions: np.ndarray, bound_type: str = "u") -> np.ndarray:
+        """
+        bounds of all the zonotopes along given directions
+        :param directions: directions of shape (k, dim)
+        :param bound_type: type of the calculation, "u" for upper bound, "l" for lower bound
+        :return: array of shape (N, k)
+        """
+        directions = np.atleast_2d(directions)
+        r = abs(np.matmul(directions, self._gen)).sum(axis=2)
+        if bound_type == "u":
+            return self._c @ directions.T + r
+        elif bound_type == "l":
+            return self._c @ directions.T - r
+        else:
+            raise NotImplementedError
+
+    def template_polytopes(self, directions: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        over-approximate all the zonotopes by polytopes a @ x <= b[i] bounded by half-spaces of given normals, they
+        share the same constraint matrix
+        :param directions: normals of the half-spaces of shape (k, dim)
+        :return: constraint matrix of shape (k, dim) and offsets of shape (N, k)
+        """
+        directions = np.asarray(directions, dtype=float)
+        return directions, self.support_func(directions, "u")
+
+    def to_template_polytopes(self, directions: np.ndarray) -> [Polytope]:
+        a, b = self.template_polytopes(directions)
+        return [Polytope(a, bi) for bi in b]
+
+    def enclose(self, other: ZonotopeBatch) -> ZonotopeBatch:
+        """
+        zonotopes enclosing the convex hulls of the zonotopes of this batch and of other, item by item, as
+        Zonotope.enclose
+        :param other: batch of the same length and dimension
+        :return: batch of enclosing zonotopes
+        """
+        assert len(other) == len(self) and other.shape == self.shape
+        m = max(self.max_gen_num, other.max_gen_num)
+
+        def __z(b: ZonotopeBatch):
+            z = np.zeros((len(b), b.shape, m + 1))
+            z[:, :, 0] = b.c
+            z[:, :, 1: b.max_gen_num + 1] = b.gen
+            return z
+
+        z0, z1 = __z(self), __z(other)
+        # the columns of the center and of the common generators are averaged, the ones of the longer zonotope only
+        # are kept, and the differences are taken as the longer minus the shorter one
+        p = np.minimum(self._gen_nums, other.gen_nums)[:, None] + 1
+        q = np.maximum(self._gen_nums, other.gen_nums)[:, None] + 1
+        sign = np.where(self._gen_nums > other.gen_nums, 1.0, -1.0)[:, None, None]
+        avg, rest = (z0 + z1) * 0.5, z0 + z1
+        j = np.arange(m + 1)
+        gen = np.concatenate([avg[:, :, 1:], (z0 - z1) * 0.5 * sign, rest], axis=2)
+        mask = np.concatenate([j[:-1] < p - 1, j < p, (j >= p) & (j < q)], axis=1)
+        return ZonotopeBatch(avg[:, :, 0], *_compact(gen, mask))
+
+    def reduce(self, method: Zonotope.METHOD.REDUCE, order: int) -> ZonotopeBatch:
+        """
+        reduce the zonotopes with more than dim * order generators, every zonotope of the result equals the one of
+        Zonotope.reduce with the same arguments, i.e. the remaining generators followed by the box of the reduced ones,
+        which is zero if none is reduced
+        :param method: reduction method, only Girard's method is vectorized
+        :param order: order of the reduced zonotopes
+        :return: batch of reduced zonotopes
+        """
+        if method != Zonotope.METHOD.REDUCE.GIRARD:
+            raise NotImplementedError
+        n, dim, m = len(self), self.shape, self.max_gen_num
+        # delete zero-length generators, as Zonotope.remove_zero_gen, which keeps single generators and the first one
+        # if all are zero
+        valid = np.arange(m) < self._gen_nums[:, None]
+        keep = valid & (abs(self._gen).sum(axis=1) > 0)
+        keep[self._gen_nums <= 1] = valid[self._gen_nums <= 1]
+        keep[(self._gen_nums > 1) & ~keep.any(axis=1), 0] = True
+        gen, gen_nums = _compact(self._gen, keep)
+        m = gen.shape[2]
+        valid = np.arange(m) < gen_nums[:, None]
+        num_ur = np.floor(dim * (order - 1)).astype(dtype=int)
+        num_r = np.where(gen_nums > dim * order, gen_nums - num_ur, 0)
+        # box the generators with the smallest 1-norm minus inf-norm, ties go to the first ones as in Zonotope.reduce
+        h = abs(gen).sum(axis=1) - abs(gen).max(axis=1, initial=0)
+        h[~valid] = np.inf
+        rank = np.empty((n, m), dtype=int)
+        np.put_along_axis(rank, np.argsort(h, axis=1, kind="stable"), np.arange(m), axis=1)
+        picked = rank < num_r[:, None]
+        d = abs(gen * picked[:, None, :]).sum(axis=2)
+        gen = np.concatenate([gen, d[:, :, None] * np.eye(dim)], axis=2)
+        mask = np.concatenate([valid & ~picked, np.ones((n, dim), dtype=bool)], axis=1)
+        return ZonotopeBatch(self._c, *_compact(gen, mask))
+
+    def to_zonotopes(self) -> [Zonotope]:
+        return list(self)
@@ -1,4 +1,8 @@
 from .model import Model
+from .registry import ModelRegistry, get_model
+from .evaluator_cache import EvaluatorCache
+from .ad_model import ADModel
+from .neural_model import NeuralModel
 from .tank6Eq import tank6eq
 from .vanderpol import vanderpol
 from .laubLoomis import laubloomis
@@ -21,6 +25,11 @@ from .bicycle import bicycle
 
 __all__ = [
     "Model",
+    "ModelRegistry",
+    "get_model",
+    "EvaluatorCache",
+    "ADModel",
+    "NeuralModel",
     "tank6eq",
     "vanderpol",
     "laubloomis",
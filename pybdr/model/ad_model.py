@@ -0,0 +1,451 @@
+"""
+Model backend based on forward-mode automatic differentiation. Only the dynamics itself is turned into code, the
+derivative tensors are propagated through it as truncated multivariate Taylor expansions (jets), so their cost
+scales with the cost of evaluating f instead of the size of the symbolic derivative expressions.
+"""
+
+from __future__ import annotations
+
+import inspect
+import sys
+from dataclasses import dataclass
+from numbers import Real
+from typing import Callable
+
+import numpy as np
+from sympy import symbols, Matrix
+
+from pybdr.geometry import Interval
+from pybdr.util.functional import SparseTensor
+from .codegen import GENERATED_NAME, generate_function
+from .model import Model, mean_value_form
+
+MAX_ORDER = 3
+
+
+def _expand(a, k: int):
+    # append k unit axes, so values broadcast against derivative tensors of order k
+    return a[(...,) + (None,) * k] if k > 0 else a
+
+
+def _add(a, b):
+    return b if a is None else a if b is None else a + b
+
+
+def _scale(g, t, k: int):
+    # product of a value g and a derivative tensor t of order k, interval operand first
+    return None if t is None else _expand(g, k) * t
+
+
+def _outer(a, b):
+    return a[..., :, None] * b[..., None, :]
+
+
+def _sym3(a, m):
+    # a_i m_jk + a_j m_ik + a_k m_ij for a vector a and a symmetric matrix m
+    t = a[..., :, None, None] * m[..., None, :, :]
+    return t + _swap(t, -3, -2) + _swap(t, -3, -1)
+
+
+def _swap(t, i, j):
+    if isinstance(t, Interval):
+        return Interval(np.swapaxes(t.inf, i, j), np.swapaxes(t.sup, i, j))
+    return np.swapaxes(t, i, j)
+
+
+def _fn(name: str, a):
+    return getattr(Interval, name)(a) if isinstance(a, Interval) else getattr(np, name)(a)
+
+
+class Jet:
+    """
+    truncated Taylor expansion of a scalar quantity w.r.t. one variable vector, holding the value and the gradient,
+    hessian and third order tensor, None for identically zero ones. coefficients are numpy arrays or intervals,
+    prefixed by the batch shape. jets of order 0 are constants w.r.t. the seeded variable.
+    """
+
+    __array_ufunc__ = None  # numpy defers to the reflected operators of Jet
+
+    def __init__(self, c: list, order: int):
+        self.c = list(c) + [None] * (order + 1 - len(c))
+        self.order = order
+
+    @classmethod
+    def variables(cls, x, order: int) -> list:
+        """
+        seed the components of given variable
+        :param x: values of shape (batch, n), numpy array or interval
+        :param order: highest order of derivatives to propagate
+        :return: list of n jets
+        """
+        n = x.shape[-1]
+        jets = []
+        for j in range(n):
+            c1 = np.zeros(x.shape)
+            c1[..., j] = 1
+            if isinstance(x, Interval):
+                c1 = Interval(c1, c1.copy())
+            jets.append(cls([x[..., j], c1 if order > 0 else None], order))
+        return jets
+
+    @classmethod
+    def constants(cls, x) -> list:
+        return [cls([x[..., j]], 0) for j in range(x.shape[-1])]
+
+    def __lift(self, other):
+        if isinstance(other, Jet):
+            return other
+        if isinstance(other, Real):
+            return Jet([float(other)], 0)
+        return NotImplemented
+
+    def __add__(self, other):
+        other = self.__lift(other)
+        if other is NotImplemented:
+            return other
+        order = max(self.order, other.order)
+        # coefficients missing from the lower order jet are zero
+        a, b = Jet(self.c, order).c, Jet(other.c, order).c
+        return Jet([a[0] + b[0]] + [_add(x, y) for x, y in zip(a[1:], b[1:])], order)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return Jet([None if a is None else -a for a in self.c], self.order)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        other = self.__lift(other)
+        if other is NotImplemented:
+            return other
+        # numbers are always the second operand
+        a, b = (other, self) if isinstance(self.c[0], float) else (self, other)
+        order = max(a.order, b.order)
+        if isinstance(b.c[0], float):
+            return Jet([None if t is None else t * b.c[0] for t in a.c], a.order)
+        a, b = Jet(a.c, order), Jet(b.c, order)
+        c = [a.c[0] * b.c[0]]
+        if order >= 1:
+            c.append(_add(_scale(a.c[0], b.c[1], 1), _scale(b.c[0], a.c[1], 1)))
+        if order >= 2:
+            c2 = _add(_scale(a.c[0], b.c[2], 2), _scale(b.c[0], a.c[2], 2))
+            if a.c[1] is not None and b.c[1] is not None:
+                ab = _outer(a.c[1], b.c[1])
+                c2 = _add(c2, ab + _swap(ab, -2, -1))
+            c.append(c2)
+        if order >= 3:
+            c3 = _add(_scale(a.c[0], b.c[3], 3), _scale(b.c[0], a.c[3], 3))
+            if a.c[1] is not None and b.c[2] is not None:
+                c3 = _add(c3, _sym3(a.c[1], b.c[2]))
+            if b.c[1] is not None and a.c[2] is not None:
+                c3 = _add(c3, _sym3(b.c[1], a.c[2]))
+            c.append(c3)
+        return Jet(c, order)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        if isinstance(other, Jet):
+            return self * other ** -1
+        return self * (1 / other)
+
+    def __rtruediv__(self, other):
+        return self ** -1 * other
+
+    def __pow__(self, p):
+        if not isinstance(p, Real):
+            raise NotImplementedError
+        p = int(p) if float(p).is_integer() else float(p)
+        x = self.c[0]
+        # p (p - 1) ... (p - k + 1) x ** (p - k), zero coefficients are skipped as x ** (p - k) may be infinite
+        ds, f = [], 1
+        for k in range(self.order + 1):
+            ds.append(None if f == 0 else f * x ** (p - k))
+            f *= p - k
+        return self.__compose(ds)
+
+    def __compose(self, ds: list):
+        # chain rule of g(self), given the derivatives g, g', g'', g''' at the value of self
+        a, c = self.c, [ds[0]]
+        if self.order >= 1:
+            c.append(None if ds[1] is None else _scale(ds[1], a[1], 1))
+        if self.order >= 2:
+            c2 = None if ds[1] is None else _scale(ds[1], a[2], 2)
+            if ds[2] is not None and a[1] is not None:
+                c2 = _add(c2, _scale(ds[2], _outer(a[1], a[1]), 2))
+            c.append(c2)
+        if self.order >= 3:
+            c3 = None if ds[1] is None else _scale(ds[1], a[3], 3)
+            if ds[2] is not None and a[1] is not None and a[2] is not None:
+                c3 = _add(c3, _scale(ds[2], _sym3(a[1], a[2]), 3))
+            if ds[3] is not None and a[1] is not None:
+                c3 = _add(c3, _scale(ds[3], a[1][..., :, None, None] * _outer(a[1], a[1])[..., None, :, :], 3))
+            c.append(c3)
+        return Jet(c, self.order)
+
+    def apply(self, name: str) -> Jet:
+        """
+        apply an elementary function
+        :param name: name of the function, e.g. "sin"
+        :return:
+        """
+        x = self.c[0]
+        if name == "exp":
+            v = _fn("exp", x)
+            ds = [v, v, v, v]
+        elif name == "log":
+            ds = [_fn("log", x), x ** -1, -1 * x ** -2, 2 * x ** -3]
+        elif name == "sqrt":
+            ds = [_fn("sqrt", x), 0.5 * x ** -0.5, -0.25 * x ** -1.5, 0.375 * x ** -2.5]
+        elif name == "sin":
+            s, co = _fn("sin", x), _fn("cos", x)
+            ds = [s, co, -s, -co]
+        elif name == "cos":
+            s, co = _fn("sin", x), _fn("cos", x)
+            ds = [co, -s, -co, s]
+        elif name == "tan":
+            t = _fn("tan", x)
+            d = 1 + t ** 2
+            ds = [t, d, 2 * t * d, 2 * d * (1 + 3 * t ** 2)]
+        elif name == "sinh":
+            s, co = _fn("sinh", x), _fn("cosh", x)
+            ds = [s, co, s, co]
+        elif name == "cosh":
+            s, co = _fn("sinh", x), _fn("cosh", x)
+            ds = [co, s, co, s]
+        elif name == "tanh":
+            t = _fn("tanh", x)
+            d = 1 - t ** 2
+            ds = [t, d, -2 * t * d, -2 * d * (1 - 3 * t ** 2)]
+        elif name == "arctan":
+            d = (1 + x ** 2) ** -1
+            ds = [_fn("arctan", x), d, -2 * x * d ** 2, (6 * x ** 2 - 2) * d ** 3]
+        else:
+            raise NotImplementedError
+        return self.__compose(ds[: self.order + 1] + [None] * (3 - self.order))
+
+
+def _elementary(name: str):
+    def _f(x):
+        if isinstance(x, Jet):
+            return x.apply(name)
+        return _fn(name, x)
+
+    return _f
+
+
+# functions the generated code of the dynamics refers to
+NAMESPACE = {name: _elementary(name) for name in ["exp", "log", "sqrt", "sin", "cos", "tan", "sinh", "cosh", "tanh"]}
+NAMESPACE.update({"arctan": _elementary("arctan"), "pi": np.pi, "e": np.e})
+
+
+@dataclass
+class ADModel:
+    """
+    model with the same evaluate contract as Model, where only f is generated from the symbolic dynamics and all
+    derivative tensors up to third order come from forward-mode automatic differentiation, in float arithmetic for
+    "numpy" and interval arithmetic for "interval"
+    """
+
+    f: Callable[..., Matrix] = None
+    var_dims: [int] = None
+    name: str = "DYNAMIC SYSTEM"
+    dim: int = None
+    __inr_fn = None
+    __inr_src = None
+    __inr_counters = None
+    __reversed = False
+
+    def __validation(self):
+        vars = inspect.getfullargspec(self.f).args
+        assert len(self.var_dims) == len(vars)
+        x = symbols("inr_x:" + str(sum(self.var_dims)))
+        bounds = np.cumsum([0] + list(self.var_dims))
+        f = self.f(*[Matrix(x[bounds[i]: bounds[i + 1]]) for i in range(len(vars))])
+        self.dim = f.rows
+        self.__inr_src = generate_function(x, list(f))
+        self.__inr_counters["generations"] += 1
+        ns = dict(NAMESPACE)
+        exec(compile(self.__inr_src, "<pybdr-ad>", "exec"), ns)
+        self.__inr_fn = ns[GENERATED_NAME]
+        self.__inr_counters["compilations"] += 1
+        # functions of the dynamics without jet rules, e.g. arcsin or abs, would only fail when evaluated
+        unknown = [name for name in self.__inr_fn.__code__.co_names if name not in NAMESPACE]
+        if len(unknown) > 0:
+            raise NotImplementedError("no automatic differentiation for " + ", ".join(unknown))
+
+    def __post_init__(self):
+        self.__inr_counters = {"derivations": 0, "generations": 0, "compilations": 0}
+        self.__validation()
+
+    def __getstate__(self):
+        # the generated function is rebuilt on unpickling
+        state = dict(self.__dict__)
+        state["_ADModel__inr_fn"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        ns = dict(NAMESPACE)
+        exec(compile(self.__inr_src, "<pybdr-ad>", "exec"), ns)
+        self.__inr_fn = ns[GENERATED_NAME]
+
+    @property
+    def counters(self) -> dict:
+        return dict(self.__inr_counters)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.__inr_src) + sys.getsizeof(self.__inr_fn.__code__.co_code)
+
+    def reverse(self):
+        # the results are negated on evaluation, the generated function is kept
+        self.__reversed = not self.__reversed
+
+    def reversed_view(self) -> ADModel:
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view.__reversed = not self.__reversed
+        return view
+
+    def __propagate(self, xs: list, v: int, order: int, batch: tuple) -> list:
+        # run the dynamics on jets seeded at the variable v, other variables are constants, or seeded at all the
+        # variables stacked into one vector if v is None
+        if v is None:
+            bounds = np.cumsum([0] + list(self.var_dims))
+            if isinstance(xs[0], Interval):
+                x = Interval(np.concatenate([x.inf for x in xs], axis=-1), np.concatenate([x.sup for x in xs], axis=-1))
+            else:
+                x = np.concatenate(xs, axis=-1)
+            jets = Jet.variables(x, order)
+            args = [jet for i in range(len(xs)) for jet in jets[bounds[i]: bounds[i + 1]]]
+            n = bounds[-1]
+        else:
+            args = []
+            for i, x in enumerate(xs):
+                args += Jet.variables(x, order) if i == v else Jet.constants(x)
+            n = self.var_dims[v]
+        rows = self.__inr_fn(*args)
+
+        def _coef(r, k):
+            c = Jet(r.c, order).c[k] if isinstance(r, Jet) else (float(r) if k == 0 else None)
+            if c is None:
+                return np.zeros(batch + (n,) * k), np.zeros(batch + (n,) * k)
+            if isinstance(c, Interval):
+                return np.broadcast_to(c.inf, batch + (n,) * k), np.broadcast_to(c.sup, batch + (n,) * k)
+            return np.broadcast_to(c, batch + (n,) * k), np.broadcast_to(c, batch + (n,) * k)
+
+        return [[_coef(r, k) for r in rows] for k in range(order + 1)]
+
+    def __evaluate(self, xs: tuple, mod: str, terms: list) -> list:
+        # dense tensors of given terms, v is None for the tensors w.r.t. all the variables stacked into one vector
+        if mod == "numpy":
+            xs = [np.asarray(x, dtype=float) for x in xs]
+        elif mod == "interval":
+            assert all(isinstance(x, Interval) for x in xs)
+        else:
+            raise NotImplementedError
+        # the batch is flattened, so every component of the variables is a 1-d vector
+        batch = np.broadcast_shapes(*[x.shape[:-1] for x in xs])
+        m = int(np.prod(batch))
+
+        def _flat(bd):
+            return np.broadcast_to(bd, batch + bd.shape[-1:]).reshape((m, bd.shape[-1]))
+
+        if mod == "numpy":
+            xs = [_flat(x) for x in xs]
+        else:
+            xs = [Interval(_flat(x.inf), _flat(x.sup)) for x in xs]
+
+        coefs = {}
+        for v in dict.fromkeys(v for _, v in terms):
+            coefs[v] = self.__propagate(xs, v, max(order for order, w in terms if w == v), (m,))
+            self.__inr_counters["derivations"] += 1
+
+        results = []
+        for order, v in terms:
+            n = sum(self.var_dims) if v is None else self.var_dims[v]
+            shape = batch + (self.dim,) + (n,) * order
+            inf = np.stack([c[0] for c in coefs[v][order]], axis=1).reshape(shape)
+            sup = np.stack([c[1] for c in coefs[v][order]], axis=1).reshape(shape)
+            inf, sup = (-sup, -inf) if self.__reversed else (inf, sup)
+            results.append(inf if mod == "numpy" else Interval(inf, sup))
+        return results
+
+    def __evaluate_mv(self, xs: tuple, terms: list) -> list:
+        # mean value form, the slopes w.r.t. every variable are the next order tensor w.r.t. all the variables
+        # stacked, whose leading axes are cut to the variable of the term. the tensors of the highest order have no
+        # next order within the jets, they keep the natural enclosure
+        assert all(isinstance(x, Interval) for x in xs)
+        results = self.__evaluate(xs, "interval", terms)
+        mv = [i for i, (order, _) in enumerate(terms) if order < MAX_ORDER]
+        if len(mv) <= 0:
+            return results
+        cs = self.__evaluate([x.c for x in xs], "numpy", [terms[i] for i in mv])
+        top = max(terms[i][0] for i in mv)
+        gs = self.__evaluate(xs, "interval", [(order + 1, None) for order in range(top + 1)])
+        bounds = np.cumsum([0] + list(self.var_dims))
+        batch = np.broadcast_shapes(*[x.shape[:-1] for x in xs])
+        rad = np.concatenate([np.broadcast_to(x.rad, batch + x.shape[-1:]) for x in xs], axis=-1)
+        for i, c in zip(mv, cs):
+            order, v = terms[i]
+            cut = (Ellipsis, slice(None)) + (slice(bounds[v], bounds[v + 1]),) * order + (slice(None),)
+            g = Interval(gs[order].inf[cut], gs[order].sup[cut])
+            results[i] = mean_value_form(results[i], c, [(g, rad)])
+        return results
+
+    def evaluate_many(self, xs: tuple, mod: str, terms: list, out: list = None, sparse=False) -> list:
+        """
+        evaluate several derivative tensors at once, the dynamics is run once per variable the tensors are taken
+        w.r.t., propagating derivatives up to the highest requested order
+        :param xs: values of the variables, either one point per variable, or a batch of points stacked along the
+        leading axes, i.e. arrays or intervals of shape (N, var_dim)
+        :param mod: "numpy" for point evaluation, "interval" for range enclosure over interval variables by the
+        natural interval extension, "interval_mv" for the enclosure by the mean value form as Model.evaluate_many,
+        the tensors of third order keep the natural enclosure
+        :param terms: (order, v) of every requested tensor
+        :param out: optional tensors the results are written into
+        :param sparse: if the tensors are returned as SparseTensor, either for all of them or a list of flags, one per
+        term
+        :return: list of tensors of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        terms = [(int(order), int(v)) for order, v in terms]
+        sparse = [bool(sp) for sp in sparse] if isinstance(sparse, (list, tuple)) else [bool(sparse)] * len(terms)
+        assert all(0 <= order <= MAX_ORDER and 0 <= v < len(self.var_dims) for order, v in terms)
+        if mod == "interval_mv":
+            results = self.__evaluate_mv(xs, terms)
+        else:
+            results = self.__evaluate(xs, mod, terms)
+        results = [SparseTensor.from_dense(r, len(r.shape) - 1 - order) if sp else r
+                   for r, sp, (order, _) in zip(results, sparse, terms)]
+        if out is not None:
+            for o, r, sp in zip(out, results, sparse):
+                if sp:
+                    o.values, o.coords = r.values, r.coords
+                elif mod == "numpy":
+                    o[...] = r
+                else:
+                    o.inf[...], o.sup[...] = r.inf, r.sup
+            return out
+        return results
+
+    taylor_at = Model.taylor_at
+
+    def evaluate(self, xs: tuple, mod: str, order: int, v: int, sparse: bool = False):
+        """
+        evaluate the derivative tensor of given order w.r.t. given variable
+        :param xs: values of the variables
+        :param mod: "numpy" for point evaluation, "interval" for range enclosure over interval variables
+        :param order: order of the derivative, at most 3
+        :param v: index of the variable the derivative is taken w.r.t.
+        :param sparse: if the tensor is returned as SparseTensor
+        :return: tensor of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        return self.evaluate_many(xs, mod, [(order, v)], sparse=sparse)[0]
@@ -0,0 +1,182 @@
+"""
+Source generators for the evaluators of Model. All requested tensors are generated into one flat function, the
+common subexpressions among them are computed once, and every non-constant entry is written into a preallocated
+output array instead of being collected into nested lists. Interval evaluators are straight-line calls of the
+interval kernels on stacked lower and upper bound arrays, no interval objects are created per entry.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from sympy import Rational, cse, numbered_symbols
+from sympy.printing.numpy import NumPyPrinter
+
+GENERATED_NAME = "_pybdr_generated"
+
+
+# sympy functions and the interval kernels computing their range
+_KERNELS = {
+    "exp": "exp",
+    "log": "log",
+    "sin": "sin",
+    "cos": "cos",
+    "tan": "tan",
+    "cot": "cot",
+    "sinh": "sinh",
+    "cosh": "cosh",
+    "tanh": "tanh",
+    "asin": "arcsin",
+    "acos": "arccos",
+    "atan": "arctan",
+    "asinh": "arcsinh",
+    "acosh": "arccosh",
+    "atanh": "arctanh",
+    "Abs": "absolute",
+    "sigmoid": "sigmoid",
+}
+
+
+def _printer():
+    # same settings as lambdify, so the generated code runs in the namespace lambdify would build
+    settings = {"fully_qualified_modules": False, "inline": True, "allow_unknown_functions": True}
+    return NumPyPrinter(dict(settings, user_functions={}))
+
+
+class _IntervalEmitter:
+    """
+    flatten expressions into straight-line calls of the interval kernels on bound arrays, every intermediate result
+    is a (inf, sup) pair of float arrays, numbers are kept as floats and folded into the operations using them
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.names = {}
+        self.count = 0
+
+    def _new(self, rhs: str):
+        name = "_v" + str(self.count)
+        self.count += 1
+        self.lines.append("    " + name + "_l, " + name + "_u = " + rhs)
+        return name + "_l", name + "_u"
+
+    def _call(self, kernel: str, *args):
+        return self._new("ik." + kernel + "(" + ", ".join(args) + ")")
+
+    def emit(self, e):
+        if e.is_number:
+            return float(e)
+        elif e.is_Symbol:
+            return self.names[e]
+        elif e.is_Add:
+            return self._add([self.emit(a) for a in e.args])
+        elif e.is_Mul:
+            return self._mul([self.emit(a) for a in e.args])
+        elif e.is_Pow:
+            return self._pow(e)
+        elif e.is_Function and type(e).__name__ in _KERNELS and len(e.args) == 1:
+            x = self.emit(e.args[0])
+            assert not isinstance(x, float)
+            return self._call(_KERNELS[type(e).__name__], *x)
+        raise NotImplementedError("no interval kernel for " + type(e).__name__)
+
+    def _add(self, args):
+        c = sum(a for a in args if isinstance(a, float))
+        xs = [a for a in args if not isinstance(a, float)]
+        if c != 0:
+            xs.append((repr(c), repr(c)))
+        return self._new(" + ".join(x[0] for x in xs) + ", " + " + ".join(x[1] for x in xs))
+
+    def _mul(self, args):
+        c = float(np.prod([a for a in args if isinstance(a, float)]))
+        xs = [a for a in args if not isinstance(a, float)]
+        r = xs[0]
+        for x in xs[1:]:
+            r = self._call("mul", *r, *x)
+        if c == -1:
+            return self._call("neg", *r)
+        elif c != 1:
+            return self._call("scale", *r, repr(c))
+        return r
+
+    def _pow(self, e):
+        base, p = e.args
+        if base.is_number:
+            # c ** x with a number c > 0 is monotone in x
+            c, x = float(base), self.emit(p)
+            assert c > 0
+            r = self._call("scale", *x, repr(np.log(c)))
+            return self._call("exp", *r)
+        x = self.emit(base)
+        if not p.is_number:
+            raise NotImplementedError("no interval kernel for symbolic exponents")
+        if p.is_Integer:
+            return self._call("pow_int", *x, str(int(p)))
+        elif p == Rational(1, 2):
+            return self._call("sqrt", *x)
+        elif p == Rational(-1, 2):
+            return self._call("inv", *self._call("sqrt", *x))
+        return self._call("pow_real", *x, repr(float(p)))
+
+
+def generate(args, outputs: [list], mod: str) -> str:
+    """
+    generate the source of an evaluator computing several tensors in one pass
+    :param args: input symbols, passed as 1-d arrays (numpy), or all together as their stacked lower and upper bounds
+    of shape (len(args), batch) (interval)
+    :param outputs: for every output tensor, list of (column, expression) of the entries to compute
+    :param mod: "numpy" or "interval"
+    :return: source of a function taking the inputs followed by one output per tensor, a 2-d (batch, size) array
+    for "numpy", a (inf, sup) pair of such arrays for "interval"
+    """
+    exprs = [e for out in outputs for _, e in out]
+    temps, reduced = cse(exprs, symbols=numbered_symbols("_t"))
+    outs = ["out" + str(i) for i in range(len(outputs))]
+
+    if mod == "numpy":
+        printer = _printer()
+        names = [printer.doprint(a) for a in args]
+        lines = ["def " + GENERATED_NAME + "(" + ", ".join(names + outs) + "):"]
+        for t, e in temps:
+            lines.append("    " + printer.doprint(t) + " = " + printer.doprint(e))
+        pos = 0
+        for out, entries in zip(outs, outputs):
+            for k, _ in entries:
+                lines.append("    " + out + "[:, " + str(k) + "] = " + printer.doprint(reduced[pos]))
+                pos += 1
+    elif mod == "interval":
+        emitter = _IntervalEmitter()
+        lines = emitter.lines
+        lines.append("def " + GENERATED_NAME + "(" + ", ".join(["x_inf", "x_sup"] + outs) + "):")
+        for i, a in enumerate(args):
+            emitter.names[a] = "x_inf[" + str(i) + "]", "x_sup[" + str(i) + "]"
+        for t, e in temps:
+            emitter.names[t] = emitter.emit(e)
+        pos = 0
+        for out, entries in zip(outs, outputs):
+            for k, _ in entries:
+                r = emitter.emit(reduced[pos])
+                r = (repr(r), repr(r)) if isinstance(r, float) else r
+                lines.append("    " + out + "[0][:, " + str(k) + "] = " + r[0])
+                lines.append("    " + out + "[1][:, " + str(k) + "] = " + r[1])
+                pos += 1
+    else:
+        raise NotImplementedError
+    lines.append("    return None")
+    return "\n".join(lines) + "\n"
+
+
+def generate_function(args, exprs: list) -> str:
+    """
+    generate the source of a plain function returning the values of given expressions, the operations are left to
+    the types of the arguments, e.g. the jets of ADModel
+    :param args: input symbols
+    :param exprs: expressions to compute
+    :return: source of a function taking the inputs and returning the list of values
+    """
+    printer = _printer()
+    temps, reduced = cse(exprs, symbols=numbered_symbols("_t"))
+    lines = ["def " + GENERATED_NAME + "(" + ", ".join(printer.doprint(a) for a in args) + "):"]
+    for t, e in temps:
+        lines.append("    " + printer.doprint(t) + " = " + printer.doprint(e))
+    lines.append("    return [" + ", ".join(printer.doprint(e) for e in reduced) + "]")
+    return "\n".join(lines) + "\n"
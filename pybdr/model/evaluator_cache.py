@@ -0,0 +1,155 @@
+"""
+On-disk cache of the generated evaluators of Model, so new processes (including the workers of reach_parallel)
+can skip the symbolic differentiation and the lambdification done by previous runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import sympy
+from sympy import lambdify
+
+
+class EvaluatorCache:
+    VERSION = 6
+    MAX_BYTES = 256 << 20  # the least recently used entries beyond this size are dropped
+
+    def __init__(self, root: str = None):
+        if root is None:
+            root = os.environ.get("PYBDR_CACHE_DIR")
+        if root is None:
+            base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+            root = os.path.join(base, "pybdr")
+        self.root = Path(root)
+        # estimated size of the entries, known after the first pruning and increased by every store
+        self._size = None
+
+    @classmethod
+    def key(cls, *items) -> str:
+        """
+        hash given items into the file name of one cache entry
+        :param items: items identifying the evaluator, e.g. model expression, order, variable and mode
+        :return: hex digest
+        """
+        h = hashlib.sha256()
+        for item in (cls.VERSION, sympy.__version__) + items:
+            h.update(str(item).encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / (key + ".pkl")
+
+    def load(self, key: str):
+        """
+        load the cache entry for given key
+        :param key: hex digest computed by key()
+        :return: the stored entry, None if missing or unreadable
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # broken entry, e.g. written by an interrupted process, drop it
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            # mark the entry as recently used for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key: str, entry: dict):
+        """
+        store an entry atomically, concurrent writers of the same key are harmless
+        :param key: hex digest computed by key()
+        :param entry: picklable dict holding the generated source and its metadata
+        :return:
+        """
+        # the entries are listed by the first store only, and again once the ones stored since may exceed the bound
+        if self._size is None or self._size > self.MAX_BYTES:
+            self._size = self.prune()
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                self._size += f.tell()
+            os.replace(tmp, path)
+        except OSError:
+            pass  # read-only or full file system, caching is best effort
+
+    def clear(self):
+        for path in self.root.glob("*/*.pkl"):
+            path.unlink(missing_ok=True)
+        self._size = None
+
+    def prune(self, max_bytes: int = None):
+        """
+        drop all the entries if they were written by another version of the cache, whose keys are never looked up
+        again, and the least recently used entries beyond given size
+        :param max_bytes: size the entries are pruned to, MAX_BYTES if not given
+        :return: size of the remaining entries, 0 if they cannot be listed
+        """
+        max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        marker = self.root / "VERSION"
+        try:
+            if not marker.exists() or marker.read_text() != str(self.VERSION):
+                self.clear()
+                self.root.mkdir(parents=True, exist_ok=True)
+                marker.write_text(str(self.VERSION))
+            entries = [(path.stat(), path) for path in self.root.glob("*/*.pkl")]
+        except OSError:
+            return 0  # read-only file system, or entries removed by a concurrent process
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda e: e[0].st_mtime):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+        return total
+
+
+_namespaces = {}
+
+
+def namespace(mod: str) -> dict:
+    """
+    namespace the generated sources of given mode are executed in, the one lambdify would build for "numpy", the
+    interval kernels for "interval"
+    :param mod: "numpy" or "interval"
+    :return:
+    """
+    if mod not in _namespaces:
+        if mod == "numpy":
+            _namespaces[mod] = lambdify((), 0, "numpy").__globals__
+        elif mod == "interval":
+            from pybdr.geometry import interval_kernels
+
+            _namespaces[mod] = {"ik": interval_kernels, "inf": float("inf"), "nan": float("nan")}
+        else:
+            raise NotImplementedError
+    return _namespaces[mod]
+
+
+def compile_source(src: str, mod: str, name: str = "_lambdifygenerated"):
+    """
+    build the evaluator function from its generated source
+    :param src: source code defining the function
+    :param mod: mode of the evaluator, "numpy" or "interval"
+    :param name: name of the function defined in the source
+    :return: the evaluator
+    """
+    ns = dict(namespace(mod))
+    exec(compile(src, "<pybdr-" + mod + ">", "exec"), ns)
+    return ns[name]
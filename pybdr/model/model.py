@@ -1,9 +1,115 @@
 import inspect
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from typing import Callable
 
 import numpy as np
-from sympy import symbols, Matrix, lambdify, derive_by_array, ImmutableDenseNDimArray
+from sympy import symbols, Matrix, derive_by_array, ImmutableDenseNDimArray, srepr, diff
+
+from pybdr.util.functional import SparseTensor
+from .codegen import GENERATED_NAME, generate
+from .evaluator_cache import EvaluatorCache, compile_source
+
+
+def _expr_nbytes(exprs, seen: set) -> int:
+    # shallow size of every unique node reachable from the given expressions, shared subtrees counted once
+    total = 0
+    stack = list(exprs)
+    while stack:
+        e = stack.pop()
+        if id(e) in seen:
+            continue
+        seen.add(id(e))
+        args = getattr(e, "args", ())
+        total += sys.getsizeof(e) + sys.getsizeof(args)
+        stack.extend(args)
+    return total
+
+
+def _symmetric_index(shape: tuple, k: int) -> np.ndarray:
+    # flat index of the representative of every entry of a tensor symmetric along its axes 1..k, i.e. the entry with
+    # the same indices sorted along these axes
+    idx = np.indices(shape).reshape((len(shape), -1))
+    if k >= 2:
+        idx[1: k + 1] = np.sort(idx[1: k + 1], axis=0)
+    return np.ravel_multi_index(idx, shape)
+
+
+def _derive(d: np.ndarray, x, k: int) -> np.ndarray:
+    # derivative of the tensor d of order k - 1 w.r.t. the symbols x as its new last axis, the result is symmetric
+    # along its axes 1..k, so only the representatives are derived and the other entries share them
+    if k < 2:
+        return np.moveaxis(np.asarray(derive_by_array(d, x)), 0, -2)
+    shape = d.shape[:-1] + (len(x),)
+    canon = _symmetric_index(shape, k)
+    flat, r = d.reshape(-1), np.empty(canon.size, dtype=object)
+    for i in np.flatnonzero(canon == np.arange(canon.size)):
+        j, col = divmod(i, len(x))
+        r[i] = diff(flat[j], x[col])
+    return r[canon].reshape(shape + (1,))
+
+
+def _derive_rows(row: np.ndarray, xs: dict, order: int) -> dict:
+    # derivatives of one row of the dynamics up to given order w.r.t. every given variable, same layout as the
+    # tensors of Model restricted to that row
+    ds = {}
+    for v, x in xs.items():
+        d = row
+        for k in range(1, order + 1):
+            d = _derive(d, x, k)
+            ds[k, v] = d
+    return ds
+
+
+def mean_value_form(r, c: np.ndarray, slopes: list):
+    """
+    mean value form f(c) + sum_w f_w(X) (X_w - c_w) intersected with the natural enclosure
+    :param r: natural enclosure of the tensor, interval
+    :param c: value of the tensor at the midpoint of the boxes
+    :param slopes: pairs of the range of the derivatives f_w along their last axis and the radii of the boxes X_w
+    :return: enclosure of the tensor, interval
+    """
+    from pybdr.geometry import Interval
+
+    rad = 0
+    for g, xr in slopes:
+        mag = np.maximum(abs(g.inf), abs(g.sup))
+        xr = xr.reshape(xr.shape[:-1] + (1,) * (mag.ndim - xr.ndim) + xr.shape[-1:])
+        rad = rad + (mag * xr).sum(axis=-1)
+    return Interval(np.maximum(r.inf, c - rad), np.minimum(r.sup, c + rad))
+
+
+def _generate_entry(x, tensors: list, mod: str, syms: list) -> dict:
+    # source of the evaluator of given tensors and the layouts of their results, syms are the numbers of leading
+    # variable axes each tensor is symmetric along
+    outputs, layouts = [], []
+    for d, k in zip(tensors, syms):
+        shape = d.shape[:-1]
+        # only the nonzero representatives under the symmetry are generated, and among them only the non-constant
+        # ones, the constant ones are filled in at evaluation, the other entries are copies of their representatives
+        d = d.reshape(-1)
+        canon = _symmetric_index(shape, k)
+        uq = np.flatnonzero(canon == np.arange(canon.size))
+        ff = np.frompyfunc(lambda e: e.is_number, 1, 1)
+        is_const = ff(d[uq]).astype(dtype=bool)
+        keep = ~is_const | (d[uq] != 0)
+        uq, is_const = uq[keep], is_const[keep]
+        const = np.zeros(uq.size, dtype=float)
+        const[is_const] = d[uq][is_const].astype(dtype=float)
+        slots = np.flatnonzero(~is_const)
+        outputs.append(list(zip(slots, d[uq][slots])))
+        pos = np.full(canon.size, -1)
+        pos[uq] = np.arange(uq.size)
+        nz = np.flatnonzero(pos[canon] >= 0)
+        # position of the representative of every nonzero entry, None if all of them are representatives
+        rep = pos[canon[nz]] if nz.size > uq.size else None
+        layouts.append((nz, const, shape, rep))
+    src = None
+    if any(len(out) > 0 for out in outputs):
+        src = generate(x, outputs, mod)
+    return {"src": src, "layouts": layouts}
 
 
 @dataclass
@@ -18,9 +124,21 @@ class Model:
     __inr_dim: int = 0
     __inr_f: Matrix = None
     __inr_series = {}
+    __inr_evaluators = {}
+    __inr_entries = {}
+    __inr_counters = None
+    __inr_nbytes = None
+    __inr_hash = None
     __reversed = False
+    CACHE = EvaluatorCache()  # set to None to disable the on-disk cache of generated evaluators
 
     def __validation(self):
+        # every instance owns its derivative tensors and evaluators
+        self.__inr_series = {}
+        self.__inr_evaluators = {}
+        self.__inr_entries = {}
+        self.__inr_nbytes = None
+        self.__inr_hash = None
         vars = inspect.getfullargspec(self.f).args
         vars_num = len(vars)
         assert len(self.var_dims) == vars_num
@@ -30,8 +148,8 @@ class Model:
             [vars[i] + ":" + str(self.var_dims[i]) for i in range(vars_num)]
         )
         self.__inr_x = symbols("inr_x:" + str(self.__inr_dim))
+        # the tensors are always the forward ones, the results of a reversed model are negated on evaluation
         self.__inr_f = self.f(*self.__inr_vars)
-        self.__inr_f = -1 * self.__inr_f if self.__reversed else self.__inr_f
         self.dim = self.__inr_f.rows
         self.__inr_idx = np.zeros((vars_num, 2), dtype=int)
         self.__inr_idx[:, 0] = np.cumsum(self.var_dims) - self.var_dims
@@ -45,100 +163,370 @@ class Model:
                 )
             )
             self.__inr_f = self.__inr_f.subs(d)
-        self.__inr_series[0] = {
-            "sym": {v: np.asarray(self.__inr_f) for v in range(vars_num)}
-        }
+        f = np.asarray(self.__inr_f)
+        self.__inr_series = {(0, v): f for v in range(vars_num)}
 
     def __post_init__(self):
+        self.__inr_counters = {"derivations": 0, "generations": 0, "compilations": 0}
         self.__validation()
 
-    def __series(self, order: int, mod: str, v: int):
-        return self.__inr_series[order][mod][v]
-
-    def __take_derivative(self, order: int, v: int):
-        if (
-                order - 1 not in self.__inr_series
-                or v not in self.__inr_series[order - 1]["sym"]
-        ):
-            self.__take_derivative(order - 1, v)
-        start, end = self.__inr_idx[v]
-        x = self.__inr_x[start:end]
-        d = derive_by_array(self.__series(order - 1, "sym", v), x)
-        d = np.asarray(d)
-        self.__inr_series[order] = {"sym": {v: np.moveaxis(d, 0, -2)}}
+    def __getstate__(self):
+        # only the generated sources are shipped, e.g. to the workers of reach_parallel, the evaluators are compiled
+        # from them on unpickling and the symbolic tensors are rebuilt only if a missing evaluator needs them
+        state = dict(self.__dict__)
+        for name in ["f", "series", "evaluators", "nbytes"]:
+            state.pop("_Model__inr_" + name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__inr_f, self.__inr_series, self.__inr_evaluators = None, None, {}
+        for (mod, terms), entry in self.__inr_entries.items():
+            self.__register(terms, mod, entry)
+
+    def __symbolic(self):
+        # the symbolic tensors of an unpickled model are rebuilt on demand, keeping the evaluators it came with
+        if self.__inr_series is None:
+            evaluators, entries, counters = self.__inr_evaluators, self.__inr_entries, self.__inr_counters
+            self.__validation()
+            self.__inr_evaluators, self.__inr_entries, self.__inr_counters = evaluators, entries, counters
+
+    @property
+    def counters(self) -> dict:
+        """
+        how often this model did the expensive work, i.e. symbolic derivations of one tensor, source generations of
+        one evaluator and compilations of one evaluator, evaluators loaded from the on-disk cache are compiled but
+        not generated
+        :return: copy of the counters
+        """
+        return dict(self.__inr_counters)
+
+    def __derivative(self, order: int, v: int, w: int = None):
+        # every tensor is derived once from the one of the previous order
+        self.__symbolic()
+        if w is not None and w != v:
+            # derivative of the tensor (order, v) w.r.t. another variable, appended as the last axis
+            if (order, v, w) not in self.__inr_series:
+                start, end = self.__inr_idx[w]
+                d = derive_by_array(self.__derivative(order, v), self.__inr_x[start:end])
+                self.__inr_series[order, v, w] = np.moveaxis(np.asarray(d), 0, -2)
+                self.__inr_counters["derivations"] += 1
+                self.__inr_nbytes = None
+            return self.__inr_series[order, v, w]
+        order = order if w is None else order + 1
+        if (order, v) not in self.__inr_series:
+            start, end = self.__inr_idx[v]
+            self.__inr_series[order, v] = _derive(self.__derivative(order - 1, v), self.__inr_x[start:end], order)
+            self.__inr_counters["derivations"] += 1
+            self.__inr_nbytes = None
+        return self.__inr_series[order, v]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        approximate memory held by the derivative tensors and the compiled evaluators of this model
+        :return: estimated size in bytes
+        """
+        if self.__inr_nbytes is not None:
+            return self.__inr_nbytes
+        seen = set()
+        total = 0
+        for d in ({} if self.__inr_series is None else self.__inr_series).values():
+            total += d.nbytes + _expr_nbytes(d.flat, seen)
+        for fn, _ in self.__inr_evaluators.values():
+            total += 0 if fn is None else sys.getsizeof(fn.__code__.co_code)
+        self.__inr_nbytes = total
+        return total
 
     def reverse(self):
+        # x' = -f(x, u), every derivative tensor is negated, so the tensors and evaluators are kept as they are
         self.__reversed = not self.__reversed
-        self.__validation()
 
-    def evaluate(self, xs: tuple, mod: str, order: int, v: int):
-        assert order >= 0 and 0 <= v < len(self.__inr_vars)
-        if order not in self.__inr_series or v not in self.__inr_series[order]["sym"]:
-            self.__take_derivative(order, v)
-
-        def _eval_numpy():
-            if mod not in self.__inr_series[order] or v not in self.__inr_series[order][mod]:
-                if mod not in self.__inr_series:
-                    self.__inr_series[order][mod] = {}
-                d = self.__series(order, "sym", v)
-                d = d if order == 0 else d.squeeze(axis=-1)
-                d = ImmutableDenseNDimArray(d)
-                if v not in self.__inr_series[order][mod]:
-                    self.__inr_series[order][mod][v] = lambdify(self.__inr_x, d, "numpy")
-                # self.__inr_series[order][mod] = {v: lambdify(self.__inr_x, d, "numpy")}
-            r = np.asarray(self.__series(order, mod, v)(*np.concatenate(xs, axis=-1)))
-            return r.squeeze(axis=-1) if order == 0 else r
-
-        def _eval_interval():
-            from pybdr.geometry import Interval
+    def reversed_view(self) -> "Model":
+        """
+        model of the backward dynamics x' = -f(x, u) sharing the derivative tensors, the evaluators and the counters
+        with this model, so nothing is derived or generated again for it
+        :return: reversed view of this model
+        """
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view.__reversed = not self.__reversed
+        return view
+
+    def __cache_key(self, terms: tuple, mod: str):
+        if self.__inr_hash is None:
+            self.__symbolic()
+            self.__inr_hash = srepr(self.__inr_f)
+        return EvaluatorCache.key(self.__inr_hash, self.var_dims, terms, mod)
+
+    @staticmethod
+    def __syms(terms: tuple) -> list:
+        # the tensor (order, v) is symmetric along all its variable axes, the tensor (order, v, w) along the first
+        # order ones, unless w is v
+        return [t[0] + 1 if len(t) > 2 and t[2] == t[1] else t[0] for t in terms]
+
+    def __generate(self, terms: tuple, mod: str) -> dict:
+        entry = _generate_entry(self.__inr_x, [self.__derivative(*term) for term in terms], mod, self.__syms(terms))
+        if entry["src"] is not None:
+            self.__inr_counters["generations"] += 1
+        return entry
+
+    def __load(self, terms: tuple, mod: str):
+        # try the evaluators generated by previous runs before doing any symbolic work
+        if self.CACHE is None:
+            return None, None
+        key = self.__cache_key(terms, mod)
+        return key, self.CACHE.load(key)
 
-            if mod not in self.__inr_series[order] or v not in self.__inr_series[order][mod]:
-                if mod not in self.__inr_series:
-                    self.__inr_series[order][mod] = {}
-                d = self.__series(order, "sym", v)
-                ff = np.frompyfunc(lambda x: x.is_number, 1, 1)
-                xx = ff(d).astype(dtype=bool)
-                mask = xx == 0
-                if len(d[mask]) <= 0:
-                    if v not in self.__inr_series[order][mod]:
-                        self.__inr_series[order][mod][v] = [None, mask]
-                    # self.__inr_series[order][mod] = {v: [None, mask]}
+    def __register(self, terms: tuple, mod: str, entry: dict):
+        fn = None
+        if entry["src"] is not None:
+            fn = compile_source(entry["src"], mod, GENERATED_NAME)
+            self.__inr_counters["compilations"] += 1
+        layouts = [(nz, np.array(np.unravel_index(nz, shape), dtype=int).reshape((len(shape), -1)), const, shape, rep)
+                   for nz, const, shape, rep in entry["layouts"]]
+        self.__inr_evaluators[mod, terms] = fn, layouts
+        self.__inr_entries[mod, terms] = entry
+        self.__inr_nbytes = None
+        return self.__inr_evaluators[mod, terms]
+
+    def __evaluator(self, terms: tuple, mod: str):
+        if (mod, terms) in self.__inr_evaluators:
+            return self.__inr_evaluators[mod, terms]
+        key, entry = self.__load(terms, mod)
+        if entry is None:
+            entry = self.__generate(terms, mod)
+            if key is not None:
+                self.CACHE.store(key, entry)
+        return self.__register(terms, mod, entry)
+
+    def warmup(self, orders=(0, 1, 2, 3), workers: int = None, groups: list = None, mods=("numpy", "interval")):
+        """
+        derive the tensors and build the evaluators ahead of the reachability analysis, the rows of the dynamics are
+        differentiated and the evaluators are generated by a pool of processes, the generated evaluators are stored
+        in the on-disk cache as well, so later models of the same dynamics skip all the symbolic work
+        :param orders: orders of the tensors to derive w.r.t. every variable
+        :param workers: number of processes, None for the number of processors, 1 to do all the work in this process
+        :param groups: lists of terms evaluated together, as passed to evaluate_many, by default every tensor alone
+        and all the tensors of the same order together, e.g. [(2, 0), (2, 1)]
+        :param mods: modes the groups are evaluated in
+        :return:
+        """
+        assert workers is None or workers >= 1
+        num = len(self.var_dims)
+        if groups is None:
+            orders = sorted(set(int(order) for order in orders))
+            assert len(orders) > 0 and orders[0] >= 0
+            groups = [[(order, v)] for order in orders for v in range(num)]
+            groups += [[(order, v) for v in range(num)] for order in orders] if num > 1 else []
+        groups = [tuple(tuple(int(i) for i in term) for term in g) for g in groups]
+        # the mean value form evaluates the groups at the midpoints and their slopes over the boxes
+        evaluators = []
+        for mod in mods:
+            if mod == "interval_mv":
+                evaluators += [("numpy", terms) for terms in groups]
+                evaluators += [("interval", terms + self.__slopes(terms)) for terms in groups]
+            else:
+                evaluators += [(mod, terms) for terms in groups]
+        pool = None if workers == 1 else ProcessPoolExecutor(workers)
+        _map = map if pool is None else pool.map
+        try:
+            # evaluators neither built nor cached yet are generated, the others are only compiled
+            todo = []
+            for mod, terms in dict.fromkeys(evaluators):
+                if (mod, terms) in self.__inr_evaluators:
+                    continue
+                key, entry = self.__load(terms, mod)
+                if entry is None:
+                    todo.append((mod, terms, key))
                 else:
-                    sym_d = ImmutableDenseNDimArray(d[mask])
-                    vf = lambdify(self.__inr_x, sym_d, Interval.functional())
-                    if v not in self.__inr_series[order][mod]:
-                        self.__inr_series[order][mod][v] = [vf, mask]
-                    # self.__inr_series[order][mod] = {v: [vf, mask]}
-
-            vm = self.__series(order, mod, v)
-            d = self.__series(order, "sym", v)
-            lb = np.zeros_like(d, dtype=float)
-            ub = np.zeros_like(d, dtype=float)
-            # calculate interval expressions
-            if vm[0] is not None:
-                vx = np.asarray(
-                    vm[0](
-                        *[
-                            xs[i][j]
-                            for i in range(len(self.var_dims))
-                            for j in range(self.var_dims[i])
-                        ]
-                    )
-                )
-                inff = np.frompyfunc(lambda x: x.inf, 1, 1)
-                supf = np.frompyfunc(lambda x: x.sup, 1, 1)
-                lb[vm[1]] = inff(vx)
-                ub[vm[1]] = supf(vx)
-            # set remain constant values
-            inv_mask = np.logical_not(vm[1])
-            lb[inv_mask] = d[inv_mask].astype(dtype=float)
-            ub[inv_mask] = d[inv_mask].astype(dtype=float)
-            # finally, return the result as interval tensor
-            return Interval(lb.squeeze(-1), ub.squeeze(-1))
+                    self.__register(terms, mod, entry)
+
+            # the rows of the dynamics are differentiated independently, the tower of every variable at once
+            top = max([0] + [term[0] for _, terms, _ in todo for term in terms])
+            self.__symbolic()
+            xs = {v: self.__inr_x[self.__inr_idx[v][0]: self.__inr_idx[v][1]] for v in range(num)
+                  if (top, v) not in self.__inr_series}
+            if top > 0 and len(xs) > 0:
+                f = self.__inr_series[0, 0]
+                rows = list(_map(partial(_derive_rows, xs=xs, order=top), [f[i: i + 1] for i in range(self.dim)]))
+                for v in xs:
+                    for order in range(1, top + 1):
+                        if (order, v) not in self.__inr_series:
+                            self.__inr_series[order, v] = np.concatenate([r[order, v] for r in rows], axis=0)
+                            self.__inr_counters["derivations"] += 1
+                self.__inr_nbytes = None
+
+            tensors = [[self.__derivative(*term) for term in terms] for _, terms, _ in todo]
+            entries = _map(_generate_entry, [self.__inr_x] * len(todo), tensors, [mod for mod, _, _ in todo],
+                           [self.__syms(terms) for _, terms, _ in todo])
+            for (mod, terms, key), entry in zip(todo, entries):
+                if entry["src"] is not None:
+                    self.__inr_counters["generations"] += 1
+                if key is not None:
+                    self.CACHE.store(key, entry)
+                self.__register(terms, mod, entry)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def evaluate_many(self, xs: tuple, mod: str, terms: list, out: list = None, sparse=False) -> list:
+        """
+        evaluate several derivative tensors at once, the subexpressions they share are computed only once
+        :param xs: values of the variables, either one point per variable, or a batch of points stacked along the
+        leading axes, i.e. arrays or intervals of shape (N, var_dim), which are evaluated in one call
+        :param mod: "numpy" for point evaluation, "interval" for range enclosure over interval variables by the
+        natural interval extension, "interval_mv" for the enclosure by the mean value form, i.e. the value at the
+        midpoint of the boxes plus the range of the next order derivatives times the radii, intersected with the
+        natural one, which is tighter for small boxes at the cost of evaluating the next order tensors
+        :param terms: (order, v) of every requested tensor, e.g. [(2, 0), (2, 1)] for the hessians w.r.t. x and u,
+        or (order, v, w) for the derivative of the tensor (order, v) w.r.t. the variable w as its last axis
+        :param out: optional tensors the results are written into, as returned by a previous call of the same terms
+        and batch shape, C-contiguous arrays for "numpy", intervals with C-contiguous bounds for "interval"
+        :param sparse: if the tensors are returned as SparseTensor holding the values of their nonzero entries only,
+        either for all of them or a list of flags, one per term
+        :return: list of tensors of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        terms = tuple(tuple(int(i) for i in term) for term in terms)
+        assert all(len(t) in {2, 3} and t[0] >= 0 and all(0 <= v < len(self.__inr_vars) for v in t[1:]) for t in terms)
+        sparse = [bool(sp) for sp in sparse] if isinstance(sparse, (list, tuple)) else [bool(sparse)] * len(terms)
+        assert len(sparse) == len(terms)
+        if mod == "interval_mv":
+            return self.__evaluate_mv(xs, terms, out, sparse)
+        if mod not in ("numpy", "interval"):
+            raise NotImplementedError
+        fn, layouts = self.__evaluator(terms, mod)
+        assert out is None or len(out) == len(layouts)
 
         if mod == "numpy":
-            return _eval_numpy()
-        elif mod == "interval":
-            return _eval_interval()
+            vs = [np.asarray(x, dtype=float) for x in xs]
+            batch = np.broadcast_shapes(*[x.shape[:-1] for x in vs])
+            cols = [c for x in vs for c in np.broadcast_to(x, batch + x.shape[-1:]).reshape((-1, x.shape[-1])).T]
         else:
-            raise NotImplementedError
+            from pybdr.geometry import Interval
+
+            batch = np.broadcast_shapes(*[x.shape[:-1] for x in xs])
+
+            def _stack(bds):
+                # bounds of all the variable components stacked into one (dim, batch) array
+                bds = [np.broadcast_to(bd, batch + bd.shape[-1:]).reshape((-1, bd.shape[-1])) for bd in bds]
+                return np.concatenate(bds, axis=-1).astype(float).T
+
+            cols = [_stack([x.inf for x in xs]), _stack([x.sup for x in xs])]
+
+        m = int(np.prod(batch))
+
+        def _flat(a, size):
+            # 2-d view of a result, the generated code writes into these views directly
+            assert a.shape[: len(batch)] == batch and a.size == m * size and a.flags.c_contiguous
+            return a.reshape((m, size))
+
+        def _zeros(shape):
+            if mod == "numpy":
+                return np.zeros(batch + shape)
+            return Interval.unchecked(np.zeros(batch + shape), np.zeros(batch + shape))
+
+        def _bounds(a):
+            return [a] if mod == "numpy" else [a.inf, a.sup]
+
+        # values of the nonzero representatives, the constant ones are filled in here, the others by the generated code
+        given, out = out, [None] * len(terms) if out is None else out
+        vals = [o.values if sp and o is not None and rep is None else _zeros(const.shape)
+                for o, sp, (_, _, const, _, rep) in zip(out, sparse, layouts)]
+        bufs = []
+        for val, (_, _, const, _, _) in zip(vals, layouts):
+            bds = [_flat(bd, const.size) for bd in _bounds(val)]
+            for bd in bds:
+                bd[...] = const
+            bufs.append(bds[0] if mod == "numpy" else tuple(bds))
+        if fn is not None:
+            fn(*cols, *bufs)
+        if self.__reversed:
+            for val in vals:
+                if mod == "numpy":
+                    np.negative(val, out=val)
+                else:
+                    inf = -val.sup
+                    np.negative(val.inf, out=val.sup)
+                    val.inf[...] = inf
+
+        results = []
+        for o, sp, val, (nz, coords, _, shape, rep) in zip(out, sparse, vals, layouts):
+            if sp and o is None:
+                # values of all the nonzero entries, copied from their representatives
+                bds = [bd if rep is None else bd[..., rep] for bd in _bounds(val)]
+                o = SparseTensor(shape, coords, bds[0] if mod == "numpy" else Interval.unchecked(*bds))
+            elif sp:
+                for bd, v in zip(_bounds(o.values), _bounds(val)):
+                    if rep is not None:
+                        bd[...] = v[..., rep]
+            else:
+                o = _zeros(shape) if o is None else o
+                for bd, v in zip(_bounds(o), _bounds(val)):
+                    bd = _flat(bd, int(np.prod(shape)))
+                    bd[...] = 0
+                    bd[:, nz] = v.reshape((m, -1)) if rep is None else v.reshape((m, -1))[:, rep]
+            results.append(o)
+        return results if given is None else given
+
+    def __slopes(self, terms: tuple) -> tuple:
+        # derivatives of given tensors w.r.t. every variable, the ones w.r.t. their own variable are the next order
+        num = len(self.var_dims)
+        assert all(len(t) == 2 for t in terms)
+        return tuple((t[0] + 1, t[1]) if w == t[1] else (t[0], t[1], w) for t in terms for w in range(num))
+
+    def __evaluate_mv(self, xs: tuple, terms: tuple, out: list, sparse: list) -> list:
+        # mean value form, f(X) in f(c) + sum_w f_w(X) (X_w - c_w) with the derivatives f_w w.r.t. every variable
+        from pybdr.geometry import Interval
+
+        num = len(xs)
+        rs = self.evaluate_many(xs, "interval", terms + self.__slopes(terms))
+        cs = self.evaluate_many([x.c for x in xs], "numpy", terms)
+        # the layouts of the tensors are the leading ones of the evaluator of the slopes, so the natural enclosure of
+        # the tensors alone is neither built nor needed by warmup
+        _, layouts = self.__evaluator(terms + self.__slopes(terms), "interval")
+        results = []
+        for i, (r, c) in enumerate(zip(rs[: len(terms)], cs)):
+            gs = rs[len(terms) + i * num: len(terms) + (i + 1) * num]
+            r = mean_value_form(r, c, [(g, x.rad) for g, x in zip(gs, xs)])
+            if sparse[i]:
+                # same pattern as the natural enclosure
+                nz, coords, _, shape, _ = layouts[i]
+                batch = r.shape[: r.inf.ndim - len(shape)]
+                r = Interval.unchecked(r.inf.reshape(batch + (-1,))[..., nz], r.sup.reshape(batch + (-1,))[..., nz])
+                r = SparseTensor(shape, coords, r)
+            results.append(r)
+        if out is not None:
+            for o, r, sp in zip(out, results, sparse):
+                o, r = (o.values, r.values) if sp else (o, r)
+                o.inf[...], o.sup[...] = r.inf, r.sup
+            return out
+        return results
+
+    def taylor_at(self, xs: tuple, max_order: int, sparse: bool = False) -> list:
+        """
+        evaluate the dynamics and all its derivatives w.r.t. every variable up to given order at one point, by one
+        generated routine sharing the intermediate results
+        :param xs: values of the variables
+        :param max_order: highest order of the derivatives
+        :param sparse: if the tensors of order 2 and higher are returned as SparseTensor
+        :return: list of the tensors of every order, [[f], [f_x, f_u], [f_xx, f_uu], ...] for variables x and u
+        """
+        num = len(self.var_dims)
+        terms = [(0, 0)] + [(order, v) for order in range(1, max_order + 1) for v in range(num)]
+        ts = self.evaluate_many(xs, "numpy", terms, sparse=[sparse and order >= 2 for order, _ in terms])
+        return [ts[:1]] + [ts[1 + (order - 1) * num: 1 + order * num] for order in range(1, max_order + 1)]
+
+    def evaluate(self, xs: tuple, mod: str, order: int, v: int, sparse: bool = False):
+        """
+        evaluate the derivative tensor of given order w.r.t. given variable
+        :param xs: values of the variables, either one point per variable, or a batch of points stacked along the
+        leading axes, i.e. arrays or intervals of shape (N, var_dim), which are evaluated in one call
+        :param mod: "numpy" for point evaluation, "interval" or "interval_mv" for range enclosure over interval
+        variables, see evaluate_many
+        :param order: order of the derivative, 0 for the dynamics itself
+        :param v: index of the variable the derivative is taken w.r.t.
+        :param sparse: if the tensor is returned as SparseTensor holding the values of its nonzero entries only
+        :return: tensor of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        return self.evaluate_many(xs, mod, [(order, v)], sparse=sparse)[0]
@@ -0,0 +1,288 @@
+"""
+Model of dynamics given by a feed forward neural network, i.e. neural ODEs. The weights are kept as arrays, the
+derivative tensors are propagated through the network layer by layer by matrix calculus, and interval enclosures
+come from layer-wise bound propagation, so no symbolic expression of the network is ever built.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from pybdr.geometry import Interval
+from pybdr.geometry import interval_kernels as ik
+from pybdr.util.functional import SparseTensor
+from .model import Model, mean_value_form
+
+MAX_ORDER = 3
+
+# quantities are numpy arrays for point evaluation, (inf, sup) pairs of arrays for range enclosure
+
+
+def _add(a, b):
+    if a is None or b is None:
+        return b if a is None else a
+    return ik.add(*a, *b) if isinstance(a, tuple) else a + b
+
+
+def _mul(a, b):
+    return ik.mul(*a, *b) if isinstance(a, tuple) else a * b
+
+
+def _affine(a, c0: float, c1: float):
+    # c0 + c1 * a
+    if isinstance(a, tuple):
+        inf, sup = ik.scale(*a, c1)
+        return inf + c0, sup + c0
+    return c0 + c1 * a
+
+
+def _map(fn, a):
+    return tuple(fn(x) for x in a) if isinstance(a, tuple) else fn(a)
+
+
+def _expand(a, k: int):
+    # append k unit axes, so values of the units broadcast against their derivative tensors of order k
+    return _map(lambda x: x[(...,) + (None,) * k], a)
+
+
+def _outer(a, b):
+    return _mul(_map(lambda x: x[..., :, None], a), _map(lambda x: x[..., None, :], b))
+
+
+def _sym3(a, m):
+    # a_i m_jk + a_j m_ik + a_k m_ij for a vector a and a symmetric matrix m
+    t = _mul(_map(lambda x: x[..., :, None, None], a), _map(lambda x: x[..., None, :, :], m))
+    t1, t2 = _map(lambda x: np.swapaxes(x, -3, -2), t), _map(lambda x: np.swapaxes(x, -3, -1), t)
+    return _add(_add(t, t1), t2)
+
+
+def _linear(w: np.ndarray, a):
+    # w @ a along the unit axis, the axis 1 of a, for (inf, sup) pairs in midpoint radius form
+    def _mm(m, x):
+        return np.moveaxis(np.tensordot(m, x, axes=(1, 1)), 0, 1)
+
+    if isinstance(a, tuple):
+        c, r = _mm(w, (a[0] + a[1]) * 0.5), _mm(abs(w), (a[1] - a[0]) * 0.5)
+        return c - r, c + r
+    return _mm(w, a)
+
+
+def _activation(name: str, z, order: int) -> list:
+    # the activation and its derivatives up to given order at z, None for identically zero ones
+    if name == "sigmoid":
+        s = ik.sigmoid(*z) if isinstance(z, tuple) else 1 / (1 + np.exp(-z))
+        d1 = _mul(s, _affine(s, 1, -1))
+        d2 = _mul(d1, _affine(s, 1, -2)) if order >= 2 else None
+        d3 = _mul(d1, _add(_affine(s, 1, -6), _affine(_mul(s, s), 0, 6))) if order >= 3 else None
+    elif name == "tanh":
+        s = ik.tanh(*z) if isinstance(z, tuple) else np.tanh(z)
+        d1 = _affine(_mul(s, s), 1, -1)
+        d2 = _affine(_mul(s, d1), 0, -2) if order >= 2 else None
+        d3 = _affine(_mul(d1, _affine(_mul(s, s), 1, -3)), 0, -2) if order >= 3 else None
+    else:
+        raise NotImplementedError
+    return [s, d1, d2, d3]
+
+
+@dataclass
+class NeuralModel:
+    """
+    model of dynamics x' = W_L s_{L-1}(... s_1(W_1 y + b_1) ...) + b_L, where y are the leading components of the
+    variables stacked, i.e. the state only or the state and the input, depending on the width of the first layer.
+    it has the same evaluate contract as Model, so it works with the reachability algorithms as any other model.
+    """
+
+    weight: [np.ndarray] = None
+    bias: [np.ndarray] = None
+    func_list: [str] = None
+    var_dims: [int] = None
+    name: str = "NEURAL NETWORK"
+    dim: int = None
+    __reversed = False
+
+    def __validation(self):
+        assert len(self.weight) == len(self.bias) >= 1
+        # the output layer is linear if no activation is given for it
+        assert len(self.func_list) in {len(self.weight) - 1, len(self.weight)}
+        for i in range(1, len(self.weight)):
+            assert self.weight[i].shape[1] == self.weight[i - 1].shape[0]
+        assert all(w.shape[0] == b.shape[0] for w, b in zip(self.weight, self.bias))
+        assert self.weight[0].shape[1] in {self.var_dims[0], sum(self.var_dims)}
+        self.dim = self.weight[-1].shape[0]
+        assert self.dim == self.var_dims[0]
+
+    def __post_init__(self):
+        self.weight = [np.asarray(w, dtype=float) for w in self.weight]
+        self.bias = [np.asarray(b, dtype=float).reshape(-1) for b in self.bias]
+        self.func_list = list(self.func_list) + ["purelin"] * (len(self.weight) - len(self.func_list))
+        self.var_dims = [int(d) for d in self.var_dims]
+        self.__validation()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(w.nbytes for w in self.weight) + sum(b.nbytes for b in self.bias)
+
+    def reverse(self):
+        self.__reversed = not self.__reversed
+
+    def reversed_view(self) -> NeuralModel:
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view.__reversed = not self.__reversed
+        return view
+
+    def __input_cols(self, v: int) -> np.ndarray:
+        # columns of the first layer fed by given variable, empty if the network does not read it
+        offset = sum(self.var_dims[:v])
+        cols = np.arange(offset, offset + self.var_dims[v])
+        return cols[cols < self.weight[0].shape[1]]
+
+    def __propagate(self, y, v: int, order: int) -> list:
+        # value and derivative tensors w.r.t. the variable v of the output of the network at the inputs y, or w.r.t.
+        # all the variables stacked into one vector if v is None
+        if v is None:
+            n, offset, cols = sum(self.var_dims), 0, np.arange(self.weight[0].shape[1])
+        else:
+            n, offset, cols = self.var_dims[v], sum(self.var_dims[:v]), self.__input_cols(v)
+        w0 = np.zeros((self.weight[0].shape[0], n))
+        w0[:, cols - offset] = self.weight[0][:, cols]
+        m = (y[0] if isinstance(y, tuple) else y).shape[0]
+        # the first layer is affine in the variables, so its jacobian is the point matrix w0
+        z = _map(lambda x: x + self.bias[0], _linear(self.weight[0], y))
+        d = [z, np.broadcast_to(w0, (m,) + w0.shape) if order >= 1 and cols.size > 0 else None, None, None]
+        if isinstance(z, tuple) and d[1] is not None:
+            d[1] = d[1], d[1]
+        for i in range(len(self.weight)):
+            if i > 0:
+                z = _map(lambda x: x + self.bias[i], _linear(self.weight[i], d[0]))
+                d = [z] + [None if t is None else _linear(self.weight[i], t) for t in d[1:]]
+            if self.func_list[i] == "purelin":
+                continue
+            s = _activation(self.func_list[i], d[0], order)
+            e = [s[0], None, None, None]
+            if order >= 1 and d[1] is not None:
+                e[1] = _mul(_expand(s[1], 1), d[1])
+            if order >= 2:
+                e[2] = None if d[2] is None else _mul(_expand(s[1], 2), d[2])
+                if d[1] is not None:
+                    e[2] = _add(e[2], _mul(_expand(s[2], 2), _outer(d[1], d[1])))
+            if order >= 3:
+                e[3] = None if d[3] is None else _mul(_expand(s[1], 3), d[3])
+                if d[1] is not None and d[2] is not None:
+                    e[3] = _add(e[3], _mul(_expand(s[2], 3), _sym3(d[1], d[2])))
+                if d[1] is not None:
+                    t = _outer(d[1], d[1])
+                    t = _mul(_map(lambda x: x[..., :, None, None], d[1]), _map(lambda x: x[..., None, :, :], t))
+                    e[3] = _add(e[3], _mul(_expand(s[3], 3), t))
+            d = e
+        return d
+
+    def __evaluate(self, xs: tuple, mod: str, terms: list) -> list:
+        # dense tensors of given terms, v is None for the tensors w.r.t. all the variables stacked into one vector
+        if mod == "numpy":
+            bds = [np.asarray(x, dtype=float) for x in xs]
+        elif mod == "interval":
+            assert all(isinstance(x, Interval) for x in xs)
+            bds = [x.inf for x in xs] + [x.sup for x in xs]
+        else:
+            raise NotImplementedError
+        # the batch is flattened and the variables are stacked into the input of the network
+        batch = np.broadcast_shapes(*[x.shape[:-1] for x in bds])
+        m = int(np.prod(batch))
+        bds = [np.broadcast_to(x, batch + x.shape[-1:]).reshape((m, x.shape[-1])) for x in bds]
+        k = len(xs)
+        if mod == "numpy":
+            y = np.concatenate(bds, axis=1)[:, : self.weight[0].shape[1]]
+        else:
+            y = tuple(np.concatenate(bds[i: i + k], axis=1)[:, : self.weight[0].shape[1]] for i in [0, k])
+
+        ds = {}
+        for v in dict.fromkeys(v for _, v in terms):
+            ds[v] = self.__propagate(y, v, max(order for order, w in terms if w == v))
+
+        results = []
+        for order, v in terms:
+            n = sum(self.var_dims) if v is None else self.var_dims[v]
+            shape = batch + (self.dim,) + (n,) * order
+            t = ds[v][order]
+            if t is None:
+                t = np.zeros((m,) + shape[len(batch):])
+                t = t if mod == "numpy" else (t, t)
+            t = _map(lambda x: np.broadcast_to(x, (m,) + shape[len(batch):]).reshape(shape), t)
+            if self.__reversed:
+                t = _affine(t, 0, -1)
+            results.append(Interval(np.array(t[0]), np.array(t[1])) if mod == "interval" else np.array(t))
+        return results
+
+    def __evaluate_mv(self, xs: tuple, terms: list) -> list:
+        # mean value form, the slopes w.r.t. every variable are the next order tensor w.r.t. all the variables
+        # stacked, whose leading axes are cut to the variable of the term. the tensors of the highest order have no
+        # next order, they keep the natural enclosure
+        assert all(isinstance(x, Interval) for x in xs)
+        results = self.__evaluate(xs, "interval", terms)
+        mv = [i for i, (order, _) in enumerate(terms) if order < MAX_ORDER]
+        if len(mv) <= 0:
+            return results
+        cs = self.__evaluate([x.c for x in xs], "numpy", [terms[i] for i in mv])
+        top = max(terms[i][0] for i in mv)
+        gs = self.__evaluate(xs, "interval", [(order + 1, None) for order in range(top + 1)])
+        bounds = np.cumsum([0] + list(self.var_dims))
+        batch = np.broadcast_shapes(*[x.shape[:-1] for x in xs])
+        rad = np.concatenate([np.broadcast_to(x.rad, batch + x.shape[-1:]) for x in xs], axis=-1)
+        for i, c in zip(mv, cs):
+            order, v = terms[i]
+            cut = (Ellipsis, slice(None)) + (slice(bounds[v], bounds[v + 1]),) * order + (slice(None),)
+            g = Interval(gs[order].inf[cut], gs[order].sup[cut])
+            results[i] = mean_value_form(results[i], c, [(g, rad)])
+        return results
+
+    def evaluate_many(self, xs: tuple, mod: str, terms: list, out: list = None, sparse=False) -> list:
+        """
+        evaluate several derivative tensors at once, the network is run once per variable the tensors are taken
+        w.r.t., propagating derivatives up to the highest requested order
+        :param xs: values of the variables, either one point per variable, or a batch of points stacked along the
+        leading axes, i.e. arrays or intervals of shape (N, var_dim)
+        :param mod: "numpy" for point evaluation, "interval" for range enclosure over interval variables by bound
+        propagation, "interval_mv" for the enclosure by the mean value form as Model.evaluate_many, the tensors of
+        third order keep the enclosure by bound propagation
+        :param terms: (order, v) of every requested tensor
+        :param out: optional tensors the results are written into
+        :param sparse: if the tensors are returned as SparseTensor, either for all of them or a list of flags, one per
+        term
+        :return: list of tensors of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        terms = [(int(order), int(v)) for order, v in terms]
+        sparse = [bool(sp) for sp in sparse] if isinstance(sparse, (list, tuple)) else [bool(sparse)] * len(terms)
+        assert all(0 <= order <= MAX_ORDER and 0 <= v < len(self.var_dims) for order, v in terms)
+        if mod == "interval_mv":
+            results = self.__evaluate_mv(xs, terms)
+        else:
+            results = self.__evaluate(xs, mod, terms)
+        results = [SparseTensor.from_dense(r, len(r.shape) - 1 - order) if sp else r
+                   for r, sp, (order, _) in zip(results, sparse, terms)]
+        if out is not None:
+            for o, r, sp in zip(out, results, sparse):
+                if sp:
+                    o.values, o.coords = r.values, r.coords
+                elif mod == "numpy":
+                    o[...] = r
+                else:
+                    o.inf[...], o.sup[...] = r.inf, r.sup
+            return out
+        return results
+
+    taylor_at = Model.taylor_at
+
+    def evaluate(self, xs: tuple, mod: str, order: int, v: int, sparse: bool = False):
+        """
+        evaluate the derivative tensor of given order w.r.t. given variable
+        :param xs: values of the variables
+        :param mod: "numpy" for point evaluation, "interval" for range enclosure over interval variables
+        :param order: order of the derivative, at most 3
+        :param v: index of the variable the derivative is taken w.r.t.
+        :param sparse: if the tensor is returned as SparseTensor
+        :return: tensor of shape (dim, var_dim, ..., var_dim), prefixed by the batch shape if any
+        """
+        return self.evaluate_many(xs, mod, [(order, v)], sparse=sparse)[0]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from .ad_model import ADModel
+from .model import Model
+from .neural_model import NeuralModel
+
+
+class ModelRegistry:
+    """
+    process-wide cache of compiled models, keyed by the dynamics callable, the variable dimensions and the reversed
+    flag, so the derivative tensors and the evaluators of one model are shared across steps, reach calls and
+    algorithms. least recently used models are evicted once either the number of models or their estimated memory
+    exceeds the given limits.
+    """
+
+    MAX_MODELS = 32
+    MAX_BYTES = 512 * 1024 ** 2  # 512MB
+
+    def __init__(self, max_models: int = None, max_bytes: int = None):
+        self.max_models = self.MAX_MODELS if max_models is None else max_models
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+        assert self.max_models >= 1 and self.max_bytes > 0
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    @staticmethod
+    def key(f: Callable, var_dims, reversed: bool = False):
+        return f, tuple(int(d) for d in var_dims), bool(reversed)
+
+    @property
+    def nbytes(self) -> int:
+        # the forward and the reversed model of the same dynamics share their storage, so the pair is counted once,
+        # by the larger estimate as either of them may have grown it last
+        total = 0
+        for (f, var_dims, reversed), m in self._models.items():
+            other = self._models.get((f, var_dims, not reversed))
+            if other is None:
+                total += m.nbytes
+            elif not reversed:
+                total += max(m.nbytes, other.nbytes)
+        return total
+
+    def get(self, f: Callable, var_dims, reversed: bool = False) -> Model:
+        """
+        get the compiled model for given dynamics, build and register it if not exist yet
+        :param f: dynamics callable
+        :param var_dims: dimensions of the variables of the dynamics
+        :param reversed: if the model should describe the backward dynamics
+        :return: shared model instance
+        """
+        if isinstance(f, (Model, ADModel, NeuralModel)):
+            return f.reversed_view() if reversed else f
+        key = self.key(f, var_dims, reversed)
+        try:
+            hash(key)
+        except TypeError:
+            # unhashable dynamics can not be shared, build a private model instead
+            return self._build(f, var_dims, reversed)
+
+        with self._lock:
+            m = self._models.get(key)
+            if m is None:
+                # the backward model is a view of the forward one, sharing its tensors and evaluators, and a forward
+                # model evicted before its backward one is taken back from it
+                other = self._models.get(self.key(f, var_dims, not reversed))
+                if other is not None:
+                    m = other.reversed_view()
+                else:
+                    m = self.get(f, var_dims).reversed_view() if reversed else self._build(f, var_dims, False)
+                self._models[key] = m
+            self._models.move_to_end(key)
+            self._evict(keep=key)
+            return m
+
+    def remove(self, f: Callable, var_dims, reversed: bool = False):
+        with self._lock:
+            self._models.pop(self.key(f, var_dims, reversed), None)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    @staticmethod
+    def _build(f: Callable, var_dims, reversed: bool):
+        m = Model(f, list(var_dims))
+        return m.reversed_view() if reversed else m
+
+    def _evict(self, keep):
+        while len(self._models) > self.max_models:
+            self._pop_oldest(keep)
+        # models grow as higher order derivatives are taken, so memory is rechecked on every access
+        while len(self._models) > 1 and self.nbytes > self.max_bytes:
+            self._pop_oldest(keep)
+
+    def _pop_oldest(self, keep):
+        oldest = next(iter(self._models))
+        if oldest == keep:
+            # the requested model is always kept, evict the next least recently used one
+            self._models.move_to_end(keep)
+            oldest = next(iter(self._models))
+        self._models.pop(oldest)
+
+
+registry = ModelRegistry()
+
+
+def get_model(f: Callable, var_dims, reversed: bool = False) -> Model:
+    """
+    get the compiled model for given dynamics from the process-wide registry
+    :param f: dynamics callable
+    :param var_dims: dimensions of the variables of the dynamics
+    :param reversed: if the model should describe the backward dynamics
+    :return: shared model instance
+    """
+    return registry.get(f, var_dims, reversed)
@@ -3,6 +3,7 @@ from .solver import *
 from .kd_tree import *
 from .realpaver_wrapper import RealPaver
 from .simulator import Simulator
+from .sparse_tensor import SparseTensor
 
 __all__ = [
     "is_empty",
@@ -16,5 +17,6 @@ __all__ = [
     "performance_counter_start",
     "performance_counter",
     "RealPaver",
-    "Simulator"
+    "Simulator",
+    "SparseTensor",
 ]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def _is_interval(x) -> bool:
+    from pybdr.geometry import Interval
+
+    return isinstance(x, Interval)
+
+
+def _mul(a, b):
+    # interval operand first, numpy would otherwise broadcast over the interval object
+    return b * a if _is_interval(b) and not _is_interval(a) else a * b
+
+
+def _group_sum(values, inv: np.ndarray, n: int):
+    if _is_interval(values):
+        from pybdr.geometry import Interval
+
+        inf = np.bincount(inv, weights=values.inf, minlength=n)
+        sup = np.bincount(inv, weights=values.sup, minlength=n)
+        return Interval.unchecked(inf, sup)
+    return np.bincount(inv, weights=values, minlength=n)
+
+
+class SparseTensor:
+    """
+    coordinate (COO) representation of a tensor, storing only the entries of its nonzero pattern. the values are
+    either a numpy array or an interval of shape (..., nnz), where the leading axes index a batch of tensors sharing
+    the same pattern.
+    """
+
+    def __init__(self, shape, coords: np.ndarray, values):
+        self.shape = tuple(int(s) for s in shape)
+        self.coords = np.asarray(coords, dtype=int).reshape((len(self.shape), -1))
+        self.values = values
+        assert self.values.shape[-1] == self.nnz
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def nnz(self) -> int:
+        return self.coords.shape[1]
+
+    @property
+    def batch_shape(self) -> tuple:
+        return self.values.shape[:-1]
+
+    def __getitem__(self, item):
+        # index the batch only, the pattern is shared by all the tensors in the batch
+        return SparseTensor(self.shape, self.coords, self.values[item])
+
+    def __neg__(self):
+        return SparseTensor(self.shape, self.coords, -self.values)
+
+    def __mul__(self, other):
+        assert np.isscalar(other)
+        return SparseTensor(self.shape, self.coords, self.values * other)
+
+    def __rmul__(self, other):
+        return self * other
+
+    @classmethod
+    def from_dense(cls, arr, batch_ndim: int = 0) -> SparseTensor:
+        """
+        get the sparse representation of given dense tensors, the pattern is the union of their nonzero entries
+        :param arr: numpy array or interval
+        :param batch_ndim: number of leading axes indexing a batch of tensors
+        :return:
+        """
+        shape = arr.shape[batch_ndim:]
+        batch = arr.shape[:batch_ndim]
+        if _is_interval(arr):
+            nz = (arr.inf != 0) | (arr.sup != 0)
+        else:
+            nz = np.asarray(arr) != 0
+        nz = nz.reshape(batch + (-1,)).any(axis=tuple(range(batch_ndim)))
+        idx = np.flatnonzero(nz)
+        coords = np.array(np.unravel_index(idx, shape), dtype=int).reshape((len(shape), -1))
+        if _is_interval(arr):
+            from pybdr.geometry import Interval
+
+            inf = arr.inf.reshape(batch + (-1,))[..., idx]
+            sup = arr.sup.reshape(batch + (-1,))[..., idx]
+            return cls(shape, coords, Interval.unchecked(inf, sup))
+        return cls(shape, coords, np.asarray(arr).reshape(batch + (-1,))[..., idx])
+
+    def todense(self):
+        """
+        get the dense tensor of this sparse tensor
+        :return: numpy array or interval of shape batch_shape + shape
+        """
+        flat = np.ravel_multi_index(tuple(self.coords), self.shape) if self.ndim > 0 else np.zeros(0, dtype=int)
+
+        def _scatter(vals):
+            r = np.zeros(self.batch_shape + (int(np.prod(self.shape)),), dtype=float)
+            r[..., flat] = vals
+            return r.reshape(self.batch_shape + self.shape)
+
+        if _is_interval(self.values):
+            from pybdr.geometry import Interval
+
+            return Interval.unchecked(_scatter(self.values.inf), _scatter(self.values.sup))
+        return _scatter(self.values)
+
+    def dot(self, x, axis: int) -> SparseTensor:
+        """
+        contract given axis of this tensor with a vector, i.e. sum_j t[..., j, ...] * x[j], only the nonzero entries
+        are touched
+        :param x: numpy vector or interval vector
+        :param axis: the axis to contract
+        :return: sparse tensor without the contracted axis
+        """
+        assert len(self.batch_shape) == 0  # batches are not supported here
+        axis = axis % self.ndim
+        assert x.shape == (self.shape[axis],)
+        prod = _mul(x[self.coords[axis]], self.values)
+        shape = self.shape[:axis] + self.shape[axis + 1:]
+        coords = np.delete(self.coords, axis, axis=0)
+        if len(shape) == 0:
+            return SparseTensor(shape, coords[:, :0], _group_sum(prod, np.zeros(self.nnz, dtype=int), 1))
+        keys = np.ravel_multi_index(tuple(coords), shape)
+        keys, inv = np.unique(keys, return_inverse=True)
+        coords = np.array(np.unravel_index(keys, shape), dtype=int).reshape((len(shape), -1))
+        return SparseTensor(shape, coords, _group_sum(prod, inv.reshape(-1), keys.size))
+
+    @classmethod
+    def block_diag(cls, ts: [SparseTensor]) -> SparseTensor:
+        """
+        concatenate tensors of the same leading dimension block diagonally along all their other axes, e.g. the
+        hessians w.r.t. the state and the input into the hessian w.r.t. the stacked variable
+        :param ts: sparse tensors of shape (dim, n_i, ..., n_i)
+        :return: sparse tensor of shape (dim, sum n_i, ..., sum n_i)
+        """
+        assert len(ts) > 0 and all(t.ndim == ts[0].ndim and t.shape[0] == ts[0].shape[0] for t in ts)
+        offset, coords = 0, []
+        for t in ts:
+            c = t.coords.copy()
+            c[1:] += offset
+            coords.append(c)
+            offset += t.shape[1]
+        shape = (ts[0].shape[0],) + (offset,) * (ts[0].ndim - 1)
+        if any(_is_interval(t.values) for t in ts):
+            from pybdr.geometry import Interval
+
+            inf = np.concatenate([t.values.inf if _is_interval(t.values) else t.values for t in ts], axis=-1)
+            sup = np.concatenate([t.values.sup if _is_interval(t.values) else t.values for t in ts], axis=-1)
+            return cls(shape, np.concatenate(coords, axis=1), Interval.unchecked(inf, sup))
+        return cls(shape, np.concatenate(coords, axis=1), np.concatenate([t.values for t in ts], axis=-1))
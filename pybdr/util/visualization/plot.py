@@ -2,8 +2,9 @@ import itertools
 
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import PolyCollection
 from matplotlib.patches import Polygon
-from pybdr.geometry import Geometry, Interval, Zonotope, Polytope
+from pybdr.geometry import Geometry, Interval, IntervalSet, Zonotope, Polytope
 
 
 def __3d_plot(objs, dims: list, width: int, height: int):
@@ -30,6 +31,23 @@ def __2d_add_interval(ax, i: "Interval", dims, color, filled):
     )
 
 
+def __2d_add_interval_set(ax, s: "IntervalSet", dims, color, filled):
+    # all the boxes as one collection of rectangles instead of one patch per box
+    p = s.proj(dims)
+    xs = np.stack([p.inf[:, 0], p.sup[:, 0], p.sup[:, 0], p.inf[:, 0]], axis=1)
+    ys = np.stack([p.inf[:, 1], p.inf[:, 1], p.sup[:, 1], p.sup[:, 1]], axis=1)
+    ax.add_collection(
+        PolyCollection(
+            np.stack([xs, ys], axis=-1),
+            closed=True,
+            alpha=1,
+            linewidths=1,
+            edgecolors=color,
+            facecolors=color if filled else "none",
+        )
+    )
+
+
 def __2d_add_polytope(ax, p: "Polytope", dims, color, filled):
     ax.add_patch(
         Polygon(
@@ -82,6 +100,8 @@ def __2d_plot(
         for geo in geos:
             if isinstance(geo, np.ndarray):
                 __2d_add_pts(ax, dims, geo, this_color)
+            elif isinstance(geo, IntervalSet):
+                __2d_add_interval_set(ax, geo, dims, "black", filled)
             elif isinstance(geo, Geometry.Base):
                 if geo.type == Geometry.TYPE.INTERVAL:
                     __2d_add_interval(ax, geo, dims, "black", filled)
@@ -139,7 +159,9 @@ def __2d_plot_cmp(collections, dims, width, height, xlim, ylim, cs, filled, show
     for i in range(len(collections)):
         this_color = plt.cm.turbo(i / len(collections)) if cs is None else cs[i]
 
-        if isinstance(collections[i][0], list):
+        if isinstance(collections[i], IntervalSet):
+            geos = [collections[i]]
+        elif isinstance(collections[i][0], list):
             geos = list(itertools.chain.from_iterable(collections[i]))
         else:
             geos = collections[i]
@@ -150,6 +172,8 @@ def __2d_plot_cmp(collections, dims, width, height, xlim, ylim, cs, filled, show
         for geo in geos:
             if isinstance(geo, np.ndarray):
                 __2d_add_pts(ax, dims, geo, this_color)
+            elif isinstance(geo, IntervalSet):
+                __2d_add_interval_set(ax, geo, dims, "black", filled)
             elif isinstance(geo, Geometry.Base):
                 if geo.type == Geometry.TYPE.INTERVAL:
                     __2d_add_interval(ax, geo, dims, "black", filled)
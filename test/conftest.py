@@ -0,0 +1,16 @@
+import pytest
+
+from pybdr.model import EvaluatorCache, Model
+
+
+@pytest.fixture(scope="session")
+def evaluator_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("pybdr-cache")
+
+
+@pytest.fixture(autouse=True)
+def evaluator_cache(evaluator_cache_dir, monkeypatch):
+    # the generated evaluators go to a temporary cache shared by the tests instead of the cache of the user, the
+    # variable is read by the processes of reach_parallel
+    monkeypatch.setenv("PYBDR_CACHE_DIR", str(evaluator_cache_dir))
+    monkeypatch.setattr(Model, "CACHE", EvaluatorCache(str(evaluator_cache_dir)))
@@ -65,5 +65,22 @@ def test_zonotope2zonotope():
     plot([z, *bound_boxes], [0, 1])
 
 
+def test_boundary_chunks():
+    from pybdr.geometry import IntervalSet
+    from pybdr.geometry.operation import boundary_chunks, partition, partition_chunks
+
+    box = Interval.rand(3)
+    bound_boxes = boundary(box, 0.1, Geometry.TYPE.INTERVAL)
+    chunks = list(boundary_chunks(box, 0.1, Geometry.TYPE.INTERVAL, 10))
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert np.array_equal(IntervalSet.concatenate(chunks).inf, bound_boxes.inf)
+    assert np.array_equal(IntervalSet.concatenate(chunks).sup, bound_boxes.sup)
+    zonos = [z for chunk in boundary_chunks(box, 0.1, Geometry.TYPE.ZONOTOPE, 10) for z in chunk]
+    assert len(zonos) == len(bound_boxes)
+    parts = partition(box, 0.1, Geometry.TYPE.INTERVAL)
+    chunks = list(partition_chunks(box, 0.1, Geometry.TYPE.INTERVAL, 10))
+    assert np.array_equal(IntervalSet.concatenate(chunks).inf, parts.inf)
+
+
 if __name__ == '__main__':
     pass
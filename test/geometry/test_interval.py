@@ -322,6 +322,85 @@ def test_mm():
     print("DONE")
 
 
+def test_matmul_methods():
+    a, b = Interval.rand(2, 4, 5) - 0.5, Interval.rand(5, 3) - 0.5
+    inf, sup = a.inf.copy(), a.sup.copy()
+    c = a @ b
+    assert c.shape == (2, 4, 3)
+    # operands are left as they are
+    assert np.all(a.inf == inf) and np.all(a.sup == sup)
+    # every product of points of the operands is enclosed
+    for _ in range(100):
+        pa = a.inf + np.random.rand(*a.shape) * (a.sup - a.inf)
+        pb = b.inf + np.random.rand(*b.shape) * (b.sup - b.inf)
+        assert np.all(c.inf <= pa @ pb + 1e-12) and np.all(pa @ pb <= c.sup + 1e-12)
+
+    # blocking the contracted axis gives the same bounds
+    max_bytes = Interval.MATMUL_MAX_BYTES
+    Interval.MATMUL_MAX_BYTES = 1
+    try:
+        cb = a @ b
+    finally:
+        Interval.MATMUL_MAX_BYTES = max_bytes
+    assert np.allclose(c.inf, cb.inf) and np.allclose(c.sup, cb.sup)
+
+    # midpoint radius form encloses the exact bounds, at most 1.5 times wider
+    cm = a.matmul(b, Interval.METHOD.MATMUL.MIDRAD)
+    assert np.all(cm.inf <= c.inf + 1e-12) and np.all(c.sup <= cm.sup + 1e-12)
+    assert np.all(cm.rad <= 1.5 * c.rad + 1e-12)
+
+    # point matrices on either side are not modified
+    m = np.random.rand(3, 2) - 0.5
+    mc = m.copy()
+    d = b @ m
+    e = m.T @ b.T
+    assert np.all(m == mc)
+    assert np.allclose(d.inf, e.T.inf) and np.allclose(d.sup, e.T.sup)
+
+
+def test_inplace():
+    a, b = Interval.rand(3, 4) - 0.5, Interval.rand(3, 4) - 0.5
+    inf, sup = a.inf, a.sup
+    for op in ["__add__", "__sub__", "__mul__"]:
+        r = getattr(a, op)(b)
+        c = Interval(a.inf.copy(), a.sup.copy())
+        c = getattr(c, op.replace("__", "__i", 1))(b)
+        assert np.allclose(c.inf, r.inf) and np.allclose(c.sup, r.sup)
+    # in-place operators keep the bounds of the interval
+    a += b
+    a -= 0.5
+    a *= b
+    a /= 2
+    assert a.inf is inf and a.sup is sup
+    # x - x needs the bounds it overwrites
+    c = Interval(b.inf.copy(), b.sup.copy())
+    c -= c
+    r = b - b
+    assert np.allclose(c.inf, r.inf) and np.allclose(c.sup, r.sup)
+    # results not fitting into the bounds give new intervals
+    c = Interval.rand(4)
+    c += Interval.rand(3, 4)
+    assert c.shape == (3, 4)
+
+    # elementary functions and arithmetic write into given buffers
+    out = Interval.zeros((3, 4))
+    for name, fn in Interval.functional().items():
+        x = Interval.rand(3, 4) + 1.5 if name in {"log", "sqrt", "arccosh"} else Interval.rand(3, 4) * 0.5
+        r = fn(x)
+        assert fn(x, out=out) is out
+        assert np.allclose(out.inf, r.inf, equal_nan=True) and np.allclose(out.sup, r.sup, equal_nan=True)
+        # out may be the argument itself
+        assert fn(x, out=x) is x
+        assert np.allclose(x.inf, r.inf, equal_nan=True) and np.allclose(x.sup, r.sup, equal_nan=True)
+    assert Interval.mul(a, b, out=out) is out
+    r = a * b
+    assert np.allclose(out.inf, r.inf) and np.allclose(out.sup, r.sup)
+
+    # construction without validation takes the arrays as they are
+    inf = np.zeros(3)
+    assert Interval.unchecked(inf, inf + 1).inf is inf
+
+
 def test_partition():
     a = Interval.rand(2)
     from pybdr.util.visualization import plot
@@ -448,5 +527,62 @@ def test_contains():
     print(b.contains(np.array([0, 3])))
 
 
+def test_interval_set(tmp_path):
+    from pybdr.geometry import IntervalSet
+    from pybdr.geometry.operation import cvt2
+
+    s = IntervalSet([[0, 0], [1, -1], [2, 3]], [[1, 1], [3, 0], [2.5, 4]])
+    assert len(s) == 3 and s.dim == 2
+    h = s.hull()
+    assert np.allclose(h.inf, [0, -1]) and np.allclose(h.sup, [3, 4])
+    assert np.all(s.contains([0.5, 0.5]) == [True, False, False])
+    assert s.contains([[0.5, 0.5], [2, 3.5]]).shape == (2, 3)
+    assert np.all(s.intersects(Interval([0.8, -0.5], [1.2, 0.5])) == [True, True, False])
+    parts = s.split()
+    assert len(parts) == 6
+    assert np.allclose(parts.sup[0], [0.5, 1]) and np.allclose(parts.inf[3], [0.5, 0])
+    assert len(s.filter(s.c[:, 0] > 1)) == 2
+    assert isinstance(s[0], Interval) and isinstance(s[1:], IntervalSet)
+    assert s.vertices.shape == (3, 4, 2)
+    s.save(tmp_path / "boxes.npz")
+    t = IntervalSet.load(tmp_path / "boxes.npz")
+    assert np.allclose(t.inf, s.inf) and np.allclose(t.sup, s.sup)
+    zonos = cvt2(s, Geometry.TYPE.ZONOTOPE)
+    r = IntervalSet.from_zonotopes(zonos)
+    assert np.allclose(r.inf, s.inf) and np.allclose(r.sup, s.sup)
+    for box, poly in zip(s, cvt2(s, Geometry.TYPE.POLYTOPE)):
+        assert np.all(poly.a @ box.c <= poly.b)
+
+
+def test_grid_chunks():
+    a = Interval([-0.3, 0, 0.1], [0.7, 1.4, 2.1])
+    g = a.grid(0.25)
+    chunks = list(a.grid_chunks(0.25, 7))
+    assert all(chunk.shape[0] <= 7 for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks), g)
+    # every cell lies in the interval and the cells cover its volume
+    assert np.all(g[..., 0] >= a.inf) and np.all(g[..., 1] <= a.sup)
+    assert np.isclose(np.prod(g[..., 1] - g[..., 0], axis=-1).sum(), np.prod(a.sup - a.inf))
+
+
+def test_elementary_special_cases():
+    from pybdr.geometry import interval_kernels as ik
+
+    rinf, rsup = ik.inv(np.array([0.0, 0, -1, -1, 2]), np.array([0.0, 1, 0, 1, 3]))
+    assert np.allclose(rinf, [np.nan, 1, -np.inf, -np.inf, 1 / 3], equal_nan=True)
+    assert np.allclose(rsup, [np.nan, np.inf, -1, np.inf, 0.5], equal_nan=True)
+    # the range of sin over intervals passing pi / 2, 3 pi / 2, both and none of them, same for cos and cosh
+    a = Interval([1, 4, 1, -0.5], [2, 5, 5, 0.5])
+    for name, x in [("sin", a), ("cos", a + 0.5 * np.pi), ("cosh", a - 1)]:
+        samples = x.inf + (x.sup - x.inf) * np.linspace(0, 1, 10001)[:, None]
+        values = getattr(np, name)(samples)
+        r = getattr(Interval, name)(x)
+        assert np.allclose(r.inf, values.min(axis=0), atol=1e-6)
+        assert np.allclose(r.sup, values.max(axis=0), atol=1e-6)
+        # the bounds of the result may be written into the ones of the argument
+        getattr(Interval, name)(x, out=x)
+        assert np.allclose(x.inf, r.inf) and np.allclose(x.sup, r.sup)
+
+
 if __name__ == '__main__':
     pass
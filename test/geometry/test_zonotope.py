@@ -1,6 +1,6 @@
 import numpy as np
 
-from pybdr.geometry import Geometry, Zonotope, Interval
+from pybdr.geometry import Geometry, Zonotope, Interval, ZonotopeAccumulator, ZonotopeBatch
 from pybdr.geometry.operation import cvt2, boundary
 from pybdr.util.visualization import plot
 
@@ -226,5 +226,116 @@ def test_proj():
     plot([p, z00, z01, z02], [0, 1])
 
 
+def test_quad_map():
+    z = Zonotope(np.random.rand(4), np.random.rand(4, 6))
+    # the quadratic form of a matrix is the one of its symmetric part
+    q = np.random.rand(3, 4, 4)
+    r0 = z.quad_map([q])
+    r1 = z.quad_map([0.5 * (q + np.transpose(q, (0, 2, 1)))])
+    assert np.allclose(r0.c, r1.c) and np.allclose(r0.gen, r1.gen)
+
+    # every point of the zonotope maps into the result
+    for _ in range(20):
+        beta = np.random.uniform(-1, 1, z.gen_num)
+        x = z.c + z.gen @ beta
+        assert np.all(abs(np.einsum("i,kij,j->k", x, q, x) - r0.c) <= np.sum(abs(r0.gen), axis=1) + 1e-9)
+
+
+def test_reduce_methods():
+    z = Zonotope(np.random.rand(3), np.random.randn(3, 3) @ np.random.randn(3, 30))
+    directions = np.random.randn(1000, 3)
+    support = abs(directions @ z.gen).sum(axis=1)
+    for method in Zonotope.METHOD.REDUCE:
+        for order in [1, 2, 5]:
+            r = z.reduce(method, order)
+            assert r.gen_num <= 3 * order
+            assert np.allclose(r.c, z.c)
+            # the reduced zonotope encloses the original one
+            assert np.all(abs(directions @ r.gen).sum(axis=1) >= support - 1e-9)
+
+
+def test_accumulator():
+    zs = [Zonotope.rand(3, gen_num) for gen_num in [2, 5, 20, 1, 40]]
+    b = Interval.rand(3)
+    acc = ZonotopeAccumulator(zs[0], capacity=4)
+    for z in zs[1:]:
+        acc += z
+    acc += 1.5
+    acc += b
+    z = zs[0] + zs[1] + zs[2] + zs[3] + zs[4] + 1.5
+    assert acc.gen_num == z.gen_num + 3 and acc.capacity >= acc.gen_num
+    frozen = acc.freeze()
+    assert np.allclose(frozen.c, z.c + b.c)
+    assert np.allclose(frozen.gen[:, : z.gen_num], z.gen)
+    assert np.allclose(frozen.gen[:, z.gen_num:], np.diag(b.rad))
+    # the frozen zonotope does not change with further sums
+    acc += zs[2]
+    assert frozen.gen_num == z.gen_num + 3 and np.allclose(frozen.c, z.c + b.c)
+    # the initial zonotope is never modified
+    assert zs[0].gen_num == 2
+    # the buffer grows from no capacity at all
+    acc = ZonotopeAccumulator.zero(3, capacity=0)
+    acc += zs[1]
+    acc += zs[2]
+    assert acc.gen_num == 25 and np.allclose(acc.freeze().gen, np.hstack([zs[1].gen, zs[2].gen]))
+
+
+def test_zonotope_batch():
+    zs = [Zonotope.rand(3, gen_num) for gen_num in [2, 7, 30, 12]]
+    ws = [Zonotope.rand(3, gen_num) for gen_num in [5, 7, 1, 40]]
+    b, w = ZonotopeBatch.from_zonotopes(zs), ZonotopeBatch.from_zonotopes(ws)
+    assert len(b) == 4 and b.max_gen_num == 30 and np.all(b.gen_nums == [2, 7, 30, 12])
+
+    def __same(lhs: Zonotope, rhs: Zonotope):
+        return lhs.gen.shape == rhs.gen.shape and np.allclose(lhs.c, rhs.c) and np.allclose(lhs.gen, rhs.gen)
+
+    m = np.random.rand(2, 3)
+    assert all(__same(x, y + v) for x, y, v in zip(b + w, zs, ws))
+    assert all(__same(x, y.enclose(v)) for x, y, v in zip(b.enclose(w), zs, ws))
+    assert all(__same(x, m @ y) for x, y in zip(m @ b, zs))
+    hull = cvt2(b, Geometry.TYPE.INTERVAL)
+    assert all(np.allclose(hull.sup[i], cvt2(z, Geometry.TYPE.INTERVAL).sup) for i, z in enumerate(zs))
+    directions = np.random.randn(5, 3)
+    support = [[z.support_func(d[None])[0][0] for d in directions] for z in zs]
+    assert np.allclose(b.support_func(directions), support)
+
+    # orders other than the class-wide one, and zonotopes with zero generators
+    zs[1].gen[:, 3] = 0
+    b = ZonotopeBatch.from_zonotopes(zs + [Zonotope.zero(3, 4), Zonotope.zero(3, 1)])
+    for order in [2, 3]:
+        for x, z in zip(b.reduce(Zonotope.METHOD.REDUCE.GIRARD, order), b):
+            assert __same(x, z.reduce(Zonotope.METHOD.REDUCE.GIRARD, order))
+
+    # small integer generators, whose scores tie often, the same tied generators are boxed
+    zs = [Zonotope(np.zeros(3), np.random.randint(-2, 3, (3, gen_num))) for gen_num in [8, 12, 20, 30]]
+    b = ZonotopeBatch.from_zonotopes(zs)
+    for order in [2, 3]:
+        for x, z in zip(b.reduce(Zonotope.METHOD.REDUCE.GIRARD, order), b):
+            assert __same(x, z.reduce(Zonotope.METHOD.REDUCE.GIRARD, order))
+
+
+def test_support_func():
+    z = Zonotope.rand(3, 10)
+    directions = np.random.randn(20, 3)
+    upper, fac = z.support_func(directions, "u")
+    lower, _ = z.support_func(directions, "l")
+    assert upper.shape == lower.shape == (20,) and fac.shape == (20, 10)
+    for i, d in enumerate(directions):
+        u, f = z.support_func(d, "u")
+        assert np.isclose(u, upper[i]) and np.allclose(f, fac[i])
+        # the bounds are reached at the points given by the factors
+        assert np.isclose(d @ (z.c + z.gen @ f), u)
+        assert np.isclose(d @ (z.c - z.gen @ f), lower[i])
+
+    # the template polytope encloses the zonotope and is tight along every direction
+    p = z.to_template_polytope(directions)
+    assert z in p
+    assert Zonotope(z.c, z.gen * 1.01) not in p
+    b = ZonotopeBatch.from_zonotopes([z, z + 1])
+    _, offsets = b.template_polytopes(directions)
+    assert np.allclose(offsets[0], p.b) and np.allclose(offsets[1], p.b + directions.sum(axis=1))
+    assert cvt2(z, Geometry.TYPE.INTERVAL) not in p
+
+
 if __name__ == '__main__':
     pass
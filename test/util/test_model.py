@@ -50,3 +50,540 @@ def test_case_00():
     print(temp1.shape)
     print(temp2.shape)
     print(temp3.shape)
+
+
+def test_registry():
+    from pybdr.model import ModelRegistry, vanderpol, brusselator
+
+    reg = ModelRegistry(max_models=2)
+    m = reg.get(vanderpol, [2, 1])
+    assert reg.get(vanderpol, (2, 1)) is m
+    assert reg.get(vanderpol, [2, 1], reversed=True) is not m
+
+    x, u = np.random.rand(2), np.random.rand(1)
+    f = m.evaluate((x, u), "numpy", 0, 0)
+    rf = reg.get(vanderpol, [2, 1], reversed=True).evaluate((x, u), "numpy", 0, 0)
+    assert np.allclose(f, -rf)
+
+    # least recently used model is evicted first
+    reg.get(vanderpol, [2, 1])
+    reg.get(brusselator, [2, 1])
+    assert len(reg) == 2
+    assert reg.key(vanderpol, [2, 1]) in reg
+    assert reg.key(vanderpol, [2, 1], True) not in reg
+
+    # memory cap keeps at least the requested model
+    reg = ModelRegistry(max_bytes=1)
+    m = reg.get(vanderpol, [2, 1])
+    m.evaluate((x, u), "numpy", 2, 0)
+    assert m.nbytes > 0
+    reg.get(brusselator, [2, 1])
+    assert len(reg) == 1
+
+    # the reversed view shares the memory of the forward model, which is counted once
+    reg = ModelRegistry()
+    m = reg.get(vanderpol, [2, 1])
+    m.evaluate((x, u), "numpy", 2, 0)
+    reg.get(vanderpol, [2, 1], reversed=True)
+    assert reg.nbytes == m.nbytes
+    reg = ModelRegistry(max_bytes=m.nbytes + 1)
+    reg.get(vanderpol, [2, 1]).evaluate((x, u), "numpy", 2, 0)
+    reg.get(vanderpol, [2, 1], reversed=True)
+    assert len(reg) == 2
+
+    # a forward model evicted before its reversed view is rebuilt from the view
+    reg.remove(vanderpol, [2, 1])
+    f = reg.get(vanderpol, [2, 1])
+    assert f is not m and f.nbytes == m.nbytes
+    assert np.allclose(f.evaluate((x, u), "numpy", 2, 0), m.evaluate((x, u), "numpy", 2, 0))
+    assert reg.nbytes == m.nbytes
+
+
+def test_evaluator_cache(tmp_path):
+    from pybdr.model import EvaluatorCache, vanderpol
+    from pybdr.geometry import Interval
+
+    cache = Model.CACHE
+    Model.CACHE = EvaluatorCache(str(tmp_path))
+    try:
+        x, u = np.random.rand(2), np.random.rand(1)
+        ix, iu = Interval(x, x + 0.1), Interval(u, u)
+
+        m = Model(vanderpol, [2, 1])
+        h = m.evaluate((x, u), "numpy", 2, 0)
+        ih = m.evaluate((ix, iu), "interval", 2, 0)
+        assert len(list(tmp_path.glob("*/*.pkl"))) == 2
+
+        # a fresh model loads the generated evaluators instead of deriving them again
+        m = Model(vanderpol, [2, 1])
+        assert np.allclose(h, m.evaluate((x, u), "numpy", 2, 0))
+        cih = m.evaluate((ix, iu), "interval", 2, 0)
+        assert np.allclose(ih.inf, cih.inf) and np.allclose(ih.sup, cih.sup)
+        assert len(list(tmp_path.glob("*/*.pkl"))) == 2
+
+        # reversed dynamics negate the results of the forward evaluators
+        m.reverse()
+        assert np.allclose(-h, m.evaluate((x, u), "numpy", 2, 0))
+        assert len(list(tmp_path.glob("*/*.pkl"))) == 2
+    finally:
+        Model.CACHE = cache
+
+
+def test_evaluator_cache_prune(tmp_path):
+    import os
+
+    from pybdr.model import EvaluatorCache
+
+    cache = EvaluatorCache(str(tmp_path))
+    keys = [EvaluatorCache.key(i) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.store(key, {"src": "x" * 1000})
+        path = tmp_path / key[:2] / (key + ".pkl")
+        os.utime(path, (i, i))
+    assert (tmp_path / "VERSION").read_text() == str(EvaluatorCache.VERSION)
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 4
+
+    # loading marks an entry as recently used, so the oldest other entries go first
+    assert cache.load(keys[0]) is not None
+    size = (tmp_path / keys[0][:2] / (keys[0] + ".pkl")).stat().st_size
+    cache.prune(2 * size)
+    assert [cache.load(key) is not None for key in keys] == [True, False, False, True]
+
+    # entries of another version of the cache are dropped as a whole
+    (tmp_path / "VERSION").write_text("0")
+    cache.prune()
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 0
+    assert (tmp_path / "VERSION").read_text() == str(EvaluatorCache.VERSION)
+
+    cache.store(keys[0], {"src": ""})
+    cache.clear()
+    assert cache.load(keys[0]) is None
+
+    # the entries are listed by the first store only, and again once the stored ones may exceed the bound
+    cache = EvaluatorCache(str(tmp_path))
+    calls = []
+    prune = cache.prune
+    cache.prune = lambda: calls.append(1) or prune()
+    for key in keys:
+        cache.store(key, {"src": "x" * 1000})
+    assert len(calls) == 1
+    cache.MAX_BYTES = 2 * size
+    cache.store(keys[0], {"src": "x" * 1000})
+    assert len(calls) == 2 and len(list(tmp_path.glob("*/*.pkl"))) <= 3
+
+
+def test_batch_evaluate():
+    from pybdr.model import laubloomis
+    from pybdr.geometry import Interval
+
+    m = Model(laubloomis, [7, 1])
+    xs, us = np.random.rand(5, 7), np.random.rand(5, 1)
+
+    for order in range(4):
+        r = m.evaluate((xs, us), "numpy", order, 0)
+        assert r.shape == (5, 7) + (7,) * order
+        for i in range(5):
+            assert np.allclose(r[i], m.evaluate((xs[i], us[i]), "numpy", order, 0))
+
+    # inputs broadcast against the batch of states
+    assert np.allclose(m.evaluate((xs, us[0]), "numpy", 1, 1), m.evaluate((xs, np.tile(us[0], (5, 1))), "numpy", 1, 1))
+
+    ixs = Interval(xs, xs + 0.1)
+    ius = Interval(us, us + 0.1)
+    for order in range(4):
+        r = m.evaluate((ixs, ius), "interval", order, 0)
+        assert r.shape == (5, 7) + (7,) * order
+        for i in range(5):
+            ri = m.evaluate((ixs[i], ius[i]), "interval", order, 0)
+            assert np.allclose(r.inf[i], ri.inf) and np.allclose(r.sup[i], ri.sup)
+
+
+def test_evaluate_many():
+    from pybdr.model import tank6eq
+    from pybdr.geometry import Interval
+
+    m = Model(tank6eq, [6, 1])
+    x, u = np.random.rand(6), np.random.rand(1)
+    terms = [(0, 0), (1, 0), (1, 1), (2, 0), (3, 0)]
+
+    rs = m.evaluate_many((x, u), "numpy", terms)
+    for (order, v), r in zip(terms, rs):
+        assert np.allclose(r, m.evaluate((x, u), "numpy", order, v))
+
+    # results are written into preallocated outputs, reused over calls
+    out = [np.full(r.shape, np.nan) for r in rs]
+    assert m.evaluate_many((x, u), "numpy", terms, out=out) is out
+    assert all(np.allclose(o, r) for o, r in zip(out, rs))
+
+    ix, iu = Interval(x, x + 0.1), Interval(u, u)
+    inf = ix.inf.copy()
+    irs = m.evaluate_many((ix, iu), "interval", terms)
+    for (order, v), r in zip(terms, irs):
+        ri = m.evaluate((ix, iu), "interval", order, v)
+        assert np.allclose(r.inf, ri.inf) and np.allclose(r.sup, ri.sup)
+    assert np.all(ix.inf == inf)
+
+
+def test_sparse_evaluate():
+    from pybdr.model import tank6eq
+    from pybdr.geometry import Interval, Zonotope
+
+    m = Model(tank6eq, [6, 1])
+    x, u = np.random.rand(6) + 1, np.random.rand(1)
+    ix, iu = Interval(x - 0.1, x + 0.1), Interval(u, u + 0.01)
+
+    h = m.evaluate_many((x, u), "numpy", [(2, 0), (2, 1)])
+    hs = m.evaluate_many((x, u), "numpy", [(2, 0), (2, 1)], sparse=True)
+    assert hs[0].nnz < h[0].size
+    assert all(np.allclose(d, s.todense()) for d, s in zip(h, hs))
+
+    t = m.evaluate((ix, iu), "interval", 3, 0)
+    ts = m.evaluate((ix, iu), "interval", 3, 0, sparse=True)
+    assert np.allclose(t.inf, ts.todense().inf) and np.allclose(t.sup, ts.todense().sup)
+
+    # contractions touch the nonzero entries only
+    d = np.random.rand(6)
+    assert np.allclose(((t.sup @ d) @ d) @ d, ts.dot(d, 3).dot(d, 2).dot(d, 1).todense().sup)
+
+    z = Zonotope(np.random.rand(7), np.random.rand(7, 4))
+    z0, z1 = z.quad_map(h), z.quad_map(hs)
+    assert np.allclose(z0.c, z1.c) and np.allclose(z0.gen, z1.gen)
+
+
+def test_interval_codegen():
+    from sympy import sin, cos, exp, sqrt
+    from pybdr.geometry import Interval
+
+    def f(x, u):
+        return Matrix([sin(x[0]) * x[1] ** 2 - 2 * x[0] / x[1], sqrt(x[1]) + exp(-x[0]) * cos(x[1] + u[0]) + 3])
+
+    m = Model(f, [2, 1])
+    ix, iu = Interval([0.1, 1.2], [0.3, 1.5]), Interval([0.0], [0.2])
+    r = m.evaluate((ix, iu), "interval", 0, 0)
+
+    x0, x1 = ix[0], ix[1]
+    ref = [
+        Interval.sin(x0) * x1 ** 2 + (-2) * x0 * (1 / x1),
+        Interval.sqrt(x1) + Interval.exp(-x0) * Interval.cos(x1 + iu) + 3,
+    ]
+    assert np.allclose(r.inf, [e.inf[0] for e in ref]) and np.allclose(r.sup, [e.sup[0] for e in ref])
+
+    # batches of boxes give the same enclosures as single boxes
+    ixs = Interval(np.stack([ix.inf, ix.inf - 0.1]), np.stack([ix.sup, ix.sup]))
+    rs = m.evaluate((ixs, iu), "interval", 1, 0)
+    ri = m.evaluate((ixs[1], iu), "interval", 1, 0)
+    assert np.allclose(rs.inf[1], ri.inf) and np.allclose(rs.sup[1], ri.sup)
+
+
+def test_derivative_tower():
+    from pybdr.model import vanderpol
+
+    cache = Model.CACHE
+    Model.CACHE = None
+    try:
+        m = Model(vanderpol, [2, 1])
+        x, u = np.random.rand(2), np.random.rand(1)
+        for _ in range(3):
+            m.evaluate((x, u), "numpy", 2, 0)
+            m.evaluate((x, u), "numpy", 2, 1)
+        # the hessian w.r.t. u is constant, so it needs no generated code
+        assert m.counters == {"derivations": 4, "generations": 1, "compilations": 1}
+
+        # higher orders build on the lower ones already derived
+        m.evaluate((x, u), "numpy", 3, 0)
+        assert m.counters["derivations"] == 5
+        m.evaluate((x, u), "numpy", 1, 0)
+        assert m.counters["derivations"] == 5
+    finally:
+        Model.CACHE = cache
+
+
+def test_ad_model():
+    from pybdr.geometry import Interval
+    from pybdr.model import ADModel, tank6eq, get_model
+
+    m, a = Model(tank6eq, [6, 1]), ADModel(tank6eq, [6, 1])
+    assert get_model(a, [6, 1]) is a
+    x, u = np.random.rand(4, 6) + 0.5, np.random.rand(4, 1)
+    for order in range(4):
+        for v in range(2):
+            assert np.allclose(m.evaluate((x, u), "numpy", order, v), a.evaluate((x, u), "numpy", order, v))
+
+    # interval derivatives enclose the point ones
+    ix, iu = Interval(x[0] - 0.01, x[0] + 0.01), Interval(u[0] - 0.01, u[0] + 0.01)
+    for order in range(4):
+        r, p = a.evaluate((ix, iu), "interval", order, 0), a.evaluate((x[0], u[0]), "numpy", order, 0)
+        assert np.all(r.inf <= p + 1e-12) and np.all(r.sup >= p - 1e-12)
+
+    # the dynamics is generated once, derivatives of all orders come from the same code
+    assert a.counters["generations"] == 1
+    s = a.evaluate((x, u), "numpy", 2, 0, sparse=True)
+    assert np.allclose(s.todense(), m.evaluate((x, u), "numpy", 2, 0))
+
+    # dynamics with functions the jets do not support are rejected when the model is built
+    for fn in [asin, acos, Abs, sign, asinh, acosh, atanh]:
+        try:
+            ADModel(lambda x, u: Matrix([fn(x[0]) + u[0], x[1]]), [2, 1])
+            assert False
+        except NotImplementedError:
+            pass
+
+
+def test_neural_model():
+    from pybdr.geometry import Interval
+    from pybdr.model import NeuralModel, neural_ode_spiral1, get_model
+    from pybdr.model.neural_ode_spiral1 import get_param
+
+    m, nn = Model(neural_ode_spiral1, [2, 1]), NeuralModel(*get_param(), var_dims=[2, 1])
+    assert get_model(nn, [2, 1]) is nn
+    x, u = np.random.rand(4, 2), np.random.rand(4, 1)
+    ix, iu = Interval(x - 0.05, x + 0.05), Interval(u, u + 0.1)
+    for order in range(4):
+        for v in range(2):
+            p = nn.evaluate((x, u), "numpy", order, v)
+            assert np.allclose(m.evaluate((x, u), "numpy", order, v), p)
+            # layer-wise bounds enclose the point values
+            r = nn.evaluate((ix, iu), "interval", order, v)
+            assert np.all(r.inf <= p + 1e-12) and np.all(r.sup >= p - 1e-12)
+
+    # wide networks need no symbolic expansion
+    w = [np.random.randn(300, 3), np.random.randn(300, 300) / 30, np.random.randn(2, 300) / 30]
+    b = [np.zeros(300), np.zeros(300), np.zeros(2)]
+    nn = NeuralModel(w, b, ["tanh", "sigmoid"], var_dims=[2, 1])
+    hx, hu = nn.evaluate_many((x, u), "numpy", [(2, 0), (2, 1)])
+    assert hx.shape == (4, 2, 2, 2) and hu.shape == (4, 2, 1, 1)
+
+
+def test_interval_mv():
+    from pybdr.geometry import Interval
+    from pybdr.model import brusselator
+
+    m = Model(brusselator, [2, 1])
+    x, u = np.random.rand(2) + 0.5, np.random.rand(1)
+    ix, iu = Interval(x - 0.05, x + 0.05), Interval(u - 0.02, u + 0.02)
+    for order in range(3):
+        nat, mv = m.evaluate((ix, iu), "interval", order, 0), m.evaluate((ix, iu), "interval_mv", order, 0)
+        # never wider than the natural enclosure, and still enclosing the values inside the boxes
+        assert np.all(mv.inf >= nat.inf) and np.all(mv.sup <= nat.sup)
+        for _ in range(10):
+            px, pu = ix.inf + np.random.rand(2) * 0.1, iu.inf + np.random.rand(1) * 0.04
+            p = m.evaluate((px, pu), "numpy", order, 0)
+            assert np.all(mv.inf <= p + 1e-12) and np.all(mv.sup >= p - 1e-12)
+    # f depends on x through several occurrences, the mean value form is tighter
+    nat, mv = m.evaluate((ix, iu), "interval", 0, 0), m.evaluate((ix, iu), "interval_mv", 0, 0)
+    assert np.sum(mv.sup - mv.inf) < np.sum(nat.sup - nat.inf)
+
+    # sparse tensors keep the pattern of the natural enclosure
+    s = m.evaluate((ix, iu), "interval_mv", 2, 0, sparse=True)
+    t = m.evaluate((ix, iu), "interval", 2, 0, sparse=True)
+    assert np.array_equal(s.coords, t.coords)
+
+
+def test_interval_mv_backends():
+    from pybdr.algorithm import ASB2008CDC
+    from pybdr.geometry import Interval, Zonotope, Geometry
+    from pybdr.geometry.operation import cvt2
+    from pybdr.model import ADModel, NeuralModel, brusselator, vanderpol
+    from pybdr.model.neural_ode_spiral1 import get_param
+
+    x, u = np.random.rand(2) + 0.5, np.random.rand(1)
+    ix, iu = Interval(x - 0.05, x + 0.05), Interval(u - 0.02, u + 0.02)
+    terms = [(0, 0), (1, 0), (1, 1), (2, 0), (2, 1), (3, 0)]
+    # the automatic differentiation backend gives the same enclosures as the symbolic one
+    ms = Model(brusselator, [2, 1]).evaluate_many((ix, iu), "interval_mv", terms[:-1])
+    ma = ADModel(brusselator, [2, 1]).evaluate_many((ix, iu), "interval_mv", terms[:-1])
+    assert all(np.allclose(s.inf, a.inf) and np.allclose(s.sup, a.sup) for s, a in zip(ms, ma))
+
+    nn = NeuralModel(*get_param(), var_dims=[2, 1])
+    nat, mv = nn.evaluate_many((ix, iu), "interval", terms), nn.evaluate_many((ix, iu), "interval_mv", terms)
+    for (order, v), n, r in zip(terms, nat, mv):
+        assert np.all(r.inf >= n.inf) and np.all(r.sup <= n.sup)
+        for _ in range(10):
+            px, pu = ix.inf + np.random.rand(2) * 0.1, iu.inf + np.random.rand(1) * 0.04
+            p = nn.evaluate((px, pu), "numpy", order, v)
+            assert np.all(r.inf <= p + 1e-12) and np.all(r.sup >= p - 1e-12)
+    # the mean value form is tighter than bound propagation for the tensors of lower order
+    assert np.sum(mv[1].sup - mv[1].inf) < np.sum(nat[1].sup - nat[1].inf)
+
+    for m, box in [(ADModel(vanderpol, [2, 1]), Interval([1.23, 2.34], [1.57, 2.46])),
+                   (nn, Interval([0.1, 0.1], [0.2, 0.2]))]:
+        for tensor_order in [2, 3]:
+            options = ASB2008CDC.Options()
+            options.t_end = 0.05
+            options.step = 0.01
+            options.tensor_order = tensor_order
+            options.taylor_terms = 4
+            options.range_bound = "interval_mv"
+            options.u = Zonotope([0], np.diag([0]))
+            options.u_trans = options.u.c
+            _, rp = ASB2008CDC.reach(m, [2, 1], options, cvt2(box, Geometry.TYPE.ZONOTOPE))
+            assert len(rp) > 0
+
+
+def test_warmup(tmp_path):
+    from pybdr.model import EvaluatorCache, lotka_volterra_5d
+
+    cache = Model.CACHE
+    Model.CACHE = EvaluatorCache(str(tmp_path))
+    try:
+        x, u = np.random.rand(5), np.random.rand(1)
+        m = Model(lotka_volterra_5d, [5, 1])
+        m.warmup(orders=[0, 1, 2, 3], workers=2)
+        counters = m.counters
+        assert counters["derivations"] == 6
+
+        # the warm groups need no further symbolic work
+        ref = Model(lotka_volterra_5d, [5, 1])
+        Model.CACHE = None
+        for order in range(4):
+            rs = m.evaluate_many((x, u), "numpy", [(order, 0), (order, 1)])
+            assert np.allclose(rs[0], ref.evaluate((x, u), "numpy", order, 0))
+            assert np.allclose(rs[1], ref.evaluate((x, u), "numpy", order, 1))
+        assert m.counters == counters
+
+        # and the on-disk cache is seeded, fresh models only compile
+        Model.CACHE = EvaluatorCache(str(tmp_path))
+        m = Model(lotka_volterra_5d, [5, 1])
+        m.warmup(orders=[0, 1, 2, 3], workers=1)
+        assert m.counters == {"derivations": 0, "generations": 0, "compilations": counters["compilations"]}
+    finally:
+        Model.CACHE = cache
+
+
+def test_pickle_warm_model():
+    import pickle
+
+    from pybdr.geometry import Interval
+    from pybdr.model import vanderpol
+
+    cache = Model.CACHE
+    Model.CACHE = None
+    try:
+        m = Model(vanderpol, [2, 1])
+        m.warmup(groups=[[(2, 0), (2, 1)]], workers=1)
+        x, u = np.random.rand(2), np.random.rand(1)
+        ix, iu = Interval(x, x + 0.1), Interval(u, u)
+
+        # the unpickled model brings its evaluators along and needs no symbolic work for them
+        w = pickle.loads(pickle.dumps(m))
+        counters = w.counters
+        h = w.evaluate_many((x, u), "numpy", [(2, 0), (2, 1)])[0]
+        assert np.allclose(h, m.evaluate((x, u), "numpy", 2, 0))
+        ih = w.evaluate_many((ix, iu), "interval", [(2, 0), (2, 1)])[0]
+        assert np.allclose(ih.inf, m.evaluate((ix, iu), "interval", 2, 0).inf)
+        assert w.counters == counters
+
+        # other tensors are derived on demand
+        assert np.allclose(w.evaluate((x, u), "numpy", 1, 0), m.evaluate((x, u), "numpy", 1, 0))
+        assert w.counters["derivations"] == counters["derivations"] + 1
+    finally:
+        Model.CACHE = cache
+
+
+def test_pickle_warm_model_mv():
+    import pickle
+
+    from pybdr.algorithm import ASB2008CDC
+    from pybdr.geometry import Interval
+    from pybdr.model import vanderpol
+
+    cache = Model.CACHE
+    Model.CACHE = None
+    try:
+        ix, iu = Interval(np.zeros(2), np.full(2, 0.1)), Interval(np.zeros(1), np.zeros(1))
+        for order in [2, 3]:
+            opts = ASB2008CDC.Options()
+            opts.tensor_order = order
+            opts.range_bound = "interval_mv"
+            m = ASB2008CDC.warm_model(vanderpol, [2, 1], opts)
+
+            # the workers of reach_parallel evaluate the mean value form without any symbolic work
+            w = pickle.loads(pickle.dumps(m))
+            counters = w.counters
+            r = w.evaluate_many((ix, iu), "interval_mv", [(order, 0), (order, 1)], sparse=order == 3)
+            assert len(r) == 2
+            assert w.counters == counters
+    finally:
+        Model.CACHE = cache
+
+
+def test_symmetric_tensors():
+    from pybdr.geometry import Interval
+    from pybdr.model import ADModel, neural_ode_spiral1
+
+    m, a = Model(neural_ode_spiral1, [2, 1]), ADModel(neural_ode_spiral1, [2, 1])
+    x, u = np.random.rand(3, 2), np.random.rand(3, 1)
+    for order in [2, 3]:
+        t = m.evaluate((x, u), "numpy", order, 0)
+        assert np.allclose(t, a.evaluate((x, u), "numpy", order, 0))
+        # entries differing by a permutation of their indices are the same
+        assert np.array_equal(t, np.swapaxes(t, -1, -2))
+        s = m.evaluate((x, u), "numpy", order, 0, sparse=True)
+        assert np.array_equal(s.todense(), t)
+
+    # the interval enclosures of permuted entries are the same too
+    ix, iu = Interval(x[0], x[0] + 0.1), Interval(u[0], u[0])
+    h = m.evaluate((ix, iu), "interval", 3, 0)
+    assert np.array_equal(h.inf, np.transpose(h.inf, (0, 2, 3, 1)))
+
+
+def test_taylor_at():
+    from pybdr.model import tank6eq, ADModel
+    from pybdr.util.functional import SparseTensor
+
+    x, u = np.random.rand(6), np.random.rand(1)
+    for m in [Model(tank6eq, [6, 1]), ADModel(tank6eq, [6, 1])]:
+        ts = m.taylor_at((x, u), 2, sparse=True)
+        assert [len(t) for t in ts] == [1, 2, 2]
+        assert np.allclose(ts[0][0], m.evaluate((x, u), "numpy", 0, 0))
+        assert np.allclose(ts[1][0], m.evaluate((x, u), "numpy", 1, 0))
+        assert np.allclose(ts[1][1], m.evaluate((x, u), "numpy", 1, 1))
+        # only the tensors of order two and above are sparse
+        assert isinstance(ts[1][0], np.ndarray) and isinstance(ts[2][0], SparseTensor)
+        assert np.allclose(ts[2][0].todense(), m.evaluate((x, u), "numpy", 2, 0))
+
+
+def test_reversed_view():
+    from pybdr.model import ModelRegistry, ADModel, NeuralModel, vanderpol
+    from pybdr.geometry import Interval
+    from pybdr.util.functional import SparseTensor
+
+    x, u = np.random.rand(2), np.random.rand(1)
+    ix, iu = Interval(x, x + 0.1), Interval(u, u)
+    terms = [(0, 0), (1, 0), (1, 1), (2, 0)]
+    for m in [Model(vanderpol, [2, 1]), ADModel(vanderpol, [2, 1])]:
+        fs = m.evaluate_many((x, u), "numpy", terms)
+        ifs = m.evaluate_many((ix, iu), "interval", terms)
+        counters = m.counters
+        rm = m.reversed_view()
+        rs = rm.evaluate_many((x, u), "numpy", terms)
+        irs = rm.evaluate_many((ix, iu), "interval", terms)
+        assert all(np.allclose(f, -r) for f, r in zip(fs, rs))
+        assert all(np.allclose(f.inf, -r.sup) and np.allclose(f.sup, -r.inf) for f, r in zip(ifs, irs))
+        # nothing is derived or generated for the view of a model
+        assert isinstance(m, ADModel) or rm.counters == counters
+        # the forward model is left as it is
+        assert np.allclose(fs[0], m.evaluate((x, u), "numpy", 0, 0))
+        assert np.allclose(rm.reversed_view().evaluate((x, u), "numpy", 0, 0), fs[0])
+
+    # sparse outputs and the mean value form are negated as well
+    m = Model(vanderpol, [2, 1])
+    h = m.evaluate((ix, iu), "interval_mv", 2, 0)
+    rh = m.reversed_view().evaluate((ix, iu), "interval_mv", 2, 0, sparse=True)
+    assert isinstance(rh, SparseTensor)
+    assert np.allclose(h.inf, -rh.todense().sup) and np.allclose(h.sup, -rh.todense().inf)
+
+    nm = NeuralModel([np.random.rand(4, 2), np.random.rand(2, 4)], [np.zeros(4), np.zeros(2)], ["tanh"], [2, 1])
+    assert np.allclose(nm.evaluate((x, u), "numpy", 1, 0), -nm.reversed_view().evaluate((x, u), "numpy", 1, 0))
+
+    # the registry shares the forward model with the backward one
+    reg = ModelRegistry()
+    m = reg.get(vanderpol, [2, 1])
+    m.evaluate((x, u), "numpy", 2, 0)
+    counters = m.counters
+    rm = reg.get(vanderpol, [2, 1], reversed=True)
+    assert reg.get(vanderpol, [2, 1], reversed=True) is rm
+    assert np.allclose(m.evaluate((x, u), "numpy", 2, 0), -rm.evaluate((x, u), "numpy", 2, 0))
+    assert m.counters == counters
+    rf = reg.get(m, [2, 1], reversed=True).evaluate((x, u), "numpy", 0, 0)
+    assert np.allclose(rf, -m.evaluate((x, u), "numpy", 0, 0))